@@ -5,12 +5,21 @@ from __future__ import annotations
 
 import argparse
 import sys
-from dataclasses import dataclass
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
 from src import run_advanced_discovery, run_basic_discovery, system_check
+from src.memory_profile import MemoryProfiler
+from src.metrics import ERRORS, LAST_RUN, REGISTRY, RUNS, StageMetrics, record_anomalies
+from src.telemetry import StageProfiler, add_listener, stage
+from src.tracing import current_recorder, start_tracing, stop_tracing
+
+if TYPE_CHECKING:
+    from src.cassette import Cassette
 
 __all__ = [
     "main",
@@ -21,6 +30,14 @@ __version__ = "2.0.2"
 
 DEFAULT_RESULTS_DIR = "discoveries"
 TOP_ANOMALIES_TO_SHOW = 3
+DEFAULT_WATCH_INTERVAL = 300
+DEFAULT_BACKFILL_CONNECTIONS = 4
+DEFAULT_BACKFILL_DELAY = 0.5
+METRICS_FILENAME = "metrics.prom"
+TRACE_FILENAME = "trace.json"
+
+# Stage latencies feed the Prometheus metrics for every run in this process
+_STAGE_METRICS = StageMetrics()
 
 
 @dataclass
@@ -29,7 +46,14 @@ class RunArtifacts:
 
     report: Optional[Path] = None
     catalog: Optional[Path] = None
+    results: Optional[Path] = None
     summary: Optional[Path] = None
+    plans: Optional[Path] = None
+    profile: Optional[Path] = None
+    trace: Optional[Path] = None
+    memory: Optional[Path] = None
+    metrics: Optional[Path] = None
+    store: Optional[Path] = None
 
 
 def _prepare_output_dir(output: str, mode: str) -> Path:
@@ -87,6 +111,8 @@ def _render_summary(results: dict, mode: str) -> str:
 def _write_results(results: dict, output_dir: Path, mode: str) -> RunArtifacts:
     """Persist discovery artifacts to disk."""
 
+    from src.results_io import RESULTS_FILENAME, write_results
+
     artifacts = RunArtifacts()
 
     report_text = results.get("report")
@@ -101,6 +127,12 @@ def _write_results(results: dict, output_dir: Path, mode: str) -> RunArtifacts:
         transients.to_csv(catalog_path, index=False)
         artifacts.catalog = catalog_path
 
+    anomalies = results.get("anomalies")
+    if anomalies is not None:
+        artifacts.results = write_results(
+            anomalies, output_dir / RESULTS_FILENAME, transients=transients
+        )
+
     summary_path = output_dir / "summary.txt"
     summary_path.write_text(_render_summary(results, mode), encoding="utf-8")
     artifacts.summary = summary_path
@@ -117,6 +149,107 @@ def _write_results(results: dict, output_dir: Path, mode: str) -> RunArtifacts:
     return artifacts
 
 
+def _write_store(results: dict, store: str) -> Optional[Path]:
+    """Append the run's catalog to the date-partitioned Parquet store."""
+
+    from src.catalog_store import INSTALL_HINT, PYARROW_AVAILABLE, write_catalog
+
+    transients = results.get("transients")
+    if transients is None:
+        return None
+    if not PYARROW_AVAILABLE:
+        print(f"   ⚠️ pyarrow is not installed; skipping the Parquet store ({INSTALL_HINT})")
+        return None
+    return write_catalog(transients, store, anomalies=results.get("anomalies"))
+
+
+def _write_plans(results: dict, output_dir: Path) -> Optional[Path]:
+    """Render observation plans for the run's anomalies that have coordinates."""
+
+    from src.observation_planner import ObservationPlanner, load_plan_targets
+
+    targets = load_plan_targets(results.get("anomalies") or [])
+    if not targets:
+        return None
+
+    plans_dir = output_dir / "plans"
+    ObservationPlanner().generate_plans(targets, plans_dir)
+    return plans_dir
+
+
+def _read_plan_catalog(args: argparse.Namespace):
+    """The plan command's catalog: a file path, or a filtered read of a catalog store."""
+
+    catalog = Path(args.catalog).expanduser()
+    filters = {
+        "start": args.since,
+        "end": args.until,
+        "types": args.types,
+        "max_mag": args.max_mag,
+    }
+    if not catalog.is_dir():
+        if any(value is not None for value in filters.values()):
+            raise ValueError("--since/--until/--type/--max-mag need a catalog store directory")
+        return catalog
+
+    from src.catalog_store import load_catalog
+
+    return load_catalog(catalog, columns=["id", "date", "type", "mag", "ra", "dec"], **filters)
+
+
+def _run_plan_command(args: argparse.Namespace) -> int:
+    """Render observation plans for every target in a catalog."""
+
+    from src.observation_planner import ObservationPlanner, load_plan_targets
+
+    try:
+        targets = load_plan_targets(_read_plan_catalog(args))
+    except (ImportError, OSError, ValueError) as exc:
+        print(f"❌ Unable to read catalog {args.catalog}: {exc}")
+        return 1
+
+    if not targets:
+        print("❌ No targets with coordinates found in catalog")
+        return 1
+
+    paths = ObservationPlanner().generate_plans(
+        targets, args.plan_output, workers=args.workers, force=args.force
+    )
+    print(f"📁 {len(paths)} observation plans in {Path(args.plan_output).expanduser()}")
+    return 0 if len(paths) == len(targets) else 1
+
+
+def _run_backfill_command(args: argparse.Namespace) -> int:
+    """Load the Rochester year archives into a Parquet catalog store."""
+
+    from src.archive_backfill import backfill_archive, parse_years
+    from src.catalog_store import INSTALL_HINT, PYARROW_AVAILABLE
+
+    if not PYARROW_AVAILABLE:
+        print(f"❌ The backfill writes a Parquet store and needs pyarrow ({INSTALL_HINT})")
+        return 1
+    try:
+        years = parse_years(args.years)
+    except ValueError as exc:
+        print(f"❌ {exc}")
+        return 1
+
+    result = backfill_archive(
+        years,
+        args.store,
+        workers=args.workers,
+        max_connections=args.max_connections,
+        delay=args.delay,
+        force=args.force,
+    )
+    print(
+        f"📁 Loaded {result.rows} rows from {result.pages} archive pages "
+        f"({result.skipped} unchanged, {len(result.failed)} failed) into "
+        f"{Path(args.store).expanduser()}"
+    )
+    return 1 if result.failed else 0
+
+
 def _print_run_header(mode: str) -> None:
     print("🚀 ASTRA Discovery System")
     print("========================")
@@ -170,12 +303,207 @@ def _run_quick_test(verbose: bool = False) -> int:
     return 0
 
 
-def _execute_pipeline(mode: str) -> Optional[dict]:
-    """Run the requested discovery pipeline."""
+def _store_alias_index(store: Optional[str]):
+    """The catalog store's alias index, so runs merge aliases it already knows."""
+
+    if not store:
+        return None
 
+    from src.identity import ALIAS_INDEX_NAME, AliasIndex
+
+    return AliasIndex(Path(store).expanduser() / ALIAS_INDEX_NAME)
+
+
+def _execute_pipeline(
+    mode: str, html: Optional[str] = None, store: Optional[str] = None
+) -> Optional[dict]:
+    """Run the requested discovery pipeline (on ``html`` if already fetched)."""
+
+    alias_index = _store_alias_index(store)
     if mode == "advanced":
-        return run_advanced_discovery()
-    return run_basic_discovery()
+        return run_advanced_discovery(html=html, alias_index=alias_index)
+    return run_basic_discovery(html=html, alias_index=alias_index)
+
+
+def _run_once(mode: str, args: argparse.Namespace, html: Optional[str] = None) -> int:
+    """Run one discovery cycle, profiling its stages if requested."""
+
+    profiler = None
+    if args.profile or args.cprofile:
+        profiler = StageProfiler(cprofile=args.cprofile)
+    memory = MemoryProfiler() if args.memory else None
+
+    add_listener(_STAGE_METRICS)
+    if args.trace:
+        start_tracing()
+    try:
+        with profiler or nullcontext(), memory or nullcontext():
+            status = _run_stages(mode, args, html, profiler, memory)
+    finally:
+        stop_tracing()
+
+    RUNS.inc(mode=mode, status="success" if status == 0 else "failure")
+    if args.metrics_file:
+        REGISTRY.write_textfile(args.metrics_file)
+    return status
+
+
+def _write_run_outputs(
+    results: dict, output_dir: Path, mode: str, args: argparse.Namespace
+) -> RunArtifacts:
+    """Write the report, catalogs, store and plans for one run."""
+
+    with stage("write"):
+        artifacts = _write_results(results, output_dir, mode)
+        if args.catalog_store:
+            artifacts.store = _write_store(results, args.catalog_store)
+    if not args.no_plans:
+        with stage("plan"):
+            artifacts.plans = _write_plans(results, output_dir)
+    return artifacts
+
+
+def _write_diagnostics(
+    artifacts: RunArtifacts,
+    output_dir: Path,
+    profiler: Optional[StageProfiler] = None,
+    memory: Optional[MemoryProfiler] = None,
+) -> None:
+    """Print and write the stage profile, memory report and trace if enabled."""
+
+    if profiler is not None:
+        print("⏱️ Stage profile")
+        print(profiler.summary_table())
+        print("")
+        artifacts.profile = profiler.write(output_dir)
+
+    if memory is not None:
+        print("🧠 Stage memory")
+        print(memory.summary_table())
+        print("")
+        artifacts.memory = memory.write(output_dir)
+
+    recorder = current_recorder()
+    if recorder is not None:
+        artifacts.trace = recorder.write(output_dir / TRACE_FILENAME)
+
+
+def _print_artifacts(artifacts: RunArtifacts) -> None:
+    """List the files a run wrote, in field order."""
+
+    print("📁 Artifacts saved to:")
+    for item in fields(artifacts):
+        path = getattr(artifacts, item.name)
+        if path:
+            print(f"  • {item.name.capitalize() + ':':<8} {path}")
+    print("")
+
+
+def _run_stages(
+    mode: str,
+    args: argparse.Namespace,
+    html: Optional[str] = None,
+    profiler: Optional[StageProfiler] = None,
+    memory: Optional[MemoryProfiler] = None,
+) -> int:
+    """Run one discovery cycle and write its artifacts."""
+
+    _print_run_header(mode)
+
+    try:
+        results = _execute_pipeline(mode, html=html, store=args.catalog_store)
+    except KeyboardInterrupt:
+        print("\n⚠️ Discovery interrupted by user")
+        return 1
+    except Exception as exc:  # pragma: no cover - defensive
+        print(f"\n❌ Discovery pipeline failed: {exc}")
+        return 1
+
+    if not results:
+        print("❌ No results returned. Check logs above.")
+        return 1
+
+    _print_run_summary(results)
+    record_anomalies(results.get("anomalies") or [])
+
+    output_dir = _prepare_output_dir(args.output, mode)
+    artifacts = _write_run_outputs(results, output_dir, mode, args)
+    _write_diagnostics(artifacts, output_dir, profiler, memory)
+
+    LAST_RUN.set(time.time(), mode=mode)
+    artifacts.metrics = REGISTRY.write_textfile(output_dir / METRICS_FILENAME)
+
+    _print_artifacts(artifacts)
+    print("Next steps: review the report and plan follow-up observations.")
+    return 0
+
+
+def _open_cassette(args: argparse.Namespace) -> Optional[Cassette]:
+    """Cassette for --record/--replay, or None to talk to the network."""
+
+    if not (args.record or args.replay):
+        return None
+
+    from src.cassette import Cassette
+
+    if args.record:
+        print(f"📼 Recording upstream responses into {args.record}")
+        return Cassette(args.record, mode="record")
+    print(f"📼 Replaying upstream responses from {args.replay} ({args.replay_latency} latency)")
+    return Cassette(args.replay, mode="replay", latency=args.replay_latency)
+
+
+def _run_watch(mode: str, args: argparse.Namespace) -> int:
+    """Poll the source page and re-run the pipeline whenever it changes."""
+
+    import requests
+
+    from src.http_client import ROCHESTER_URL, ConditionalFetcher
+    from src.metrics import serve_metrics
+
+    fetcher = ConditionalFetcher()
+    print(f"👀 Watching {ROCHESTER_URL} every {args.interval:g}s (Ctrl+C to stop)")
+
+    server = None
+    if args.metrics_port is not None:
+        try:
+            server = serve_metrics(args.metrics_port)
+        except OSError as exc:
+            print(f"   ⚠️ Metrics endpoint unavailable on port {args.metrics_port}: {exc}")
+        else:
+            host, port = server.server_address[:2]
+            print(f"📈 Serving metrics at http://{host}:{port}/metrics")
+
+    status = 0
+    cycle = 0
+    try:
+        while True:
+            cycle += 1
+            try:
+                page = fetcher.fetch(ROCHESTER_URL)
+            except requests.RequestException as exc:
+                ERRORS.inc(component="poll")
+                print(f"   ⚠️ Poll failed: {exc}")
+                status = 1
+            else:
+                if page.changed:
+                    status = _run_once(mode, args, html=page.text)
+                else:
+                    stamp = datetime.now().strftime("%H:%M:%S")
+                    print(f"   ⏸️ {stamp} no changes (HTTP {page.status_code})")
+
+            if args.max_cycles and cycle >= args.max_cycles:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 Watch mode stopped")
+        status = 0
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    return status
 
 
 def main(argv: Optional[Iterable[str]] = None) -> int:
@@ -190,6 +518,11 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
             "  astra-discover --basic --output results/\n"
             "  astra-discover --test\n"
             "  astra-discover --check\n"
+            "  astra-discover --watch --interval 600\n"
+            "  astra-discover --record cassettes/today\n"
+            "  astra-discover --replay cassettes/today --profile\n"
+            "  astra-discover plan latest_discovery/advanced_transients_catalog.csv\n"
+            "  astra-discover backfill catalog/ --years 2015-2025\n"
         ),
     )
     parser.add_argument(
@@ -225,8 +558,184 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         action="store_true",
         help="Show extra logging (reserved for future use)",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay resident and re-run whenever the source page changes",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help=f"Seconds between polls in watch mode (default: {DEFAULT_WATCH_INTERVAL})",
+    )
+    parser.add_argument(
+        "--max-cycles",
+        type=int,
+        default=0,
+        help="Stop watch mode after this many polls (default: run until interrupted)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record wall/CPU time per pipeline stage into the run directory",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="Like --profile, and also dump cProfile stats for each stage",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Record a Chrome trace (chrome://tracing, Perfetto) of the run as trace.json",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Record peak/retained memory and top allocation sites per stage (slow)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=None,
+        help="Also write Prometheus metrics here after each run (textfile collector)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this local port while in watch mode",
+    )
+    parser.add_argument(
+        "--catalog-store",
+        type=str,
+        default=None,
+        help="Also append the catalog to this date-partitioned Parquet store (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--no-plans",
+        action="store_true",
+        help="Skip rendering observation plans for anomalies with coordinates",
+    )
+
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        metavar="DIR",
+        default=None,
+        help="Save every upstream response (Rochester, SIMBAD, Gaia, NED, VizieR) into DIR",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        metavar="DIR",
+        default=None,
+        help="Answer upstream requests from a cassette recorded with --record (no network)",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        choices=("zero", "recorded"),
+        default="zero",
+        help="Serve replayed responses instantly or after their recorded latency (default: zero)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", title="commands")
+    plan_parser = subparsers.add_parser(
+        "plan",
+        help="Render observation plans for every target in a catalog",
+        description=(
+            "Render observation plans for every target in an anomalies/catalog file, "
+            "or for the matching objects in a Parquet catalog store"
+        ),
+    )
+    plan_parser.add_argument(
+        "catalog", help="Catalog or anomalies file (CSV or JSON), or a Parquet catalog store"
+    )
+    plan_parser.add_argument(
+        "--since", default=None, help="Catalog store only: earliest discovery date (YYYY-MM-DD)"
+    )
+    plan_parser.add_argument(
+        "--until", default=None, help="Catalog store only: latest discovery date (YYYY-MM-DD)"
+    )
+    plan_parser.add_argument(
+        "--type",
+        dest="types",
+        action="append",
+        default=None,
+        help="Catalog store only: object type to plan (repeatable)",
+    )
+    plan_parser.add_argument(
+        "--max-mag",
+        type=float,
+        default=None,
+        help="Catalog store only: faintest magnitude to plan",
+    )
+    plan_parser.add_argument(
+        "--output",
+        "-o",
+        dest="plan_output",
+        default="observation_plans",
+        help="Directory for rendered plans (default: observation_plans/)",
+    )
+    plan_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per CPU)",
+    )
+    plan_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render plans even if their inputs are unchanged",
+    )
+
+    backfill_parser = subparsers.add_parser(
+        "backfill",
+        help="Load the Rochester year archives into a Parquet catalog store",
+        description=(
+            "Download the Rochester year index pages and the per-object pages they link to, "
+            "parse them in parallel and append the transients to a Parquet catalog store. "
+            "Pages already loaded are skipped, so an interrupted backfill resumes."
+        ),
+    )
+    backfill_parser.add_argument("store", help="Catalog store directory (needs pyarrow)")
+    backfill_parser.add_argument(
+        "--years",
+        required=True,
+        help="Archive years, e.g. 2025, 2015-2025 or 2010,2015-2020",
+    )
+    backfill_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parser processes (default: one per CPU)",
+    )
+    backfill_parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=DEFAULT_BACKFILL_CONNECTIONS,
+        help=f"Concurrent downloads (default: {DEFAULT_BACKFILL_CONNECTIONS})",
+    )
+    backfill_parser.add_argument(
+        "--delay",
+        type=float,
+        default=DEFAULT_BACKFILL_DELAY,
+        help=f"Minimum seconds between request starts (default: {DEFAULT_BACKFILL_DELAY})",
+    )
+    backfill_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Fetch and load pages again even if they were loaded before",
+    )
 
     args = parser.parse_args(list(argv) if argv is not None else None)
+    if args.metrics_port is not None and not args.watch:
+        parser.error("--metrics-port needs --watch; use --metrics-file for single runs")
+
+    if args.command == "plan":
+        return _run_plan_command(args)
+    if args.command == "backfill":
+        return _run_backfill_command(args)
 
     if args.check:
         ok = system_check()
@@ -239,36 +748,16 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     if args.basic and not args.advanced:
         mode = "basic"
 
-    _print_run_header(mode)
-
     try:
-        results = _execute_pipeline(mode)
-    except KeyboardInterrupt:
-        print("\n⚠️ Discovery interrupted by user")
-        return 1
-    except Exception as exc:  # pragma: no cover - defensive
-        print(f"\n❌ Discovery pipeline failed: {exc}")
-        return 1
-
-    if not results:
-        print("❌ No results returned. Check logs above.")
+        cassette = _open_cassette(args)
+    except (OSError, ValueError) as exc:
+        print(f"❌ Unable to open cassette: {exc}")
         return 1
 
-    _print_run_summary(results)
-
-    output_dir = _prepare_output_dir(args.output, mode)
-    artifacts = _write_results(results, output_dir, mode)
-
-    print("📁 Artifacts saved to:")
-    if artifacts.report:
-        print(f"  • Report:  {artifacts.report}")
-    if artifacts.catalog:
-        print(f"  • Catalog: {artifacts.catalog}")
-    if artifacts.summary:
-        print(f"  • Summary: {artifacts.summary}")
-    print("")
-    print("Next steps: review the report and plan follow-up observations.")
-    return 0
+    with cassette or nullcontext():
+        if args.watch:
+            return _run_watch(mode, args)
+        return _run_once(mode, args)
 
 
 if __name__ == "__main__":  # pragma: no cover
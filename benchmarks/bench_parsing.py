@@ -0,0 +1,41 @@
+"""Benchmarks for the Rochester page parsers and coordinate parsing."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from conftest import SIZES, rochester_page
+
+from src.coordinates import parse_ra_dec
+from src.enhanced_discovery_v2 import EnhancedDiscoveryEngineV2
+
+
+@pytest.fixture(scope="module")
+def engine() -> EnhancedDiscoveryEngineV2:
+    return EnhancedDiscoveryEngineV2()
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_parse_table_rows(benchmark, engine, size, capsys) -> None:
+    """Table parser: one <tr> per transient"""
+    html = rochester_page(n_rows=size)
+    rows = benchmark(engine._parse_rochester_html, html)
+    assert len(rows) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_parse_discovered_entries(benchmark, engine, size, capsys) -> None:
+    """Entry parser: free-text "discovered" paragraphs (capped at 100 by the parser)"""
+    html = rochester_page(n_entries=size)
+    rows = benchmark(engine._parse_rochester_html, html)
+    assert len(rows) == min(size, 100)
+
+
+@pytest.mark.parametrize("size", (1_000, 100_000))
+def test_parse_ra_dec(benchmark, size) -> None:
+    """Vectorized sexagesimal parsing"""
+    i = np.arange(size)
+    ra = [f"{h:02d}h{m:02d}m{s:05.2f}s" for h, m, s in zip(i % 24, i % 60, (i * 7) % 60)]
+    dec = [f"+{d:02d} {m:02d} {s:02d}" for d, m, s in zip(i % 90, i % 60, (i * 3) % 60)]
+    ra_deg, dec_deg = benchmark(parse_ra_dec, ra, dec)
+    assert not np.isnan(ra_deg).any() and not np.isnan(dec_deg).any()
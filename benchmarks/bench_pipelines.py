@@ -0,0 +1,29 @@
+"""End-to-end benchmarks: both pipelines on generated pages, network stubbed."""
+
+from __future__ import annotations
+
+import tracemalloc
+
+import pytest
+from conftest import SIZES
+from rochester_generator import rochester_page
+from scaling import PIPELINES, run_pipeline
+
+
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("pipeline", PIPELINES)
+def test_pipeline(benchmark, pipeline, size) -> None:
+    """Scrape-to-report run; throughput and traced peak go into extra_info"""
+    html = rochester_page(n_rows=size, n_entries=size // 10, noise=0.05)
+    run_pipeline(pipeline, html)  # warm up imports and caches
+
+    tracemalloc.start()
+    run_pipeline(pipeline, html)
+    benchmark.extra_info["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    results = benchmark.pedantic(run_pipeline, args=(pipeline, html), rounds=3, iterations=1)
+    # --benchmark-disable runs the function once without collecting stats
+    if benchmark.stats is not None:
+        benchmark.extra_info["objects_per_s"] = size / benchmark.stats.stats.median
+    assert results is not None and len(results["transients"]) > 0
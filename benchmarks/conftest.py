@@ -0,0 +1,14 @@
+"""Shared fixtures for the ASTRA micro-benchmarks."""
+
+from __future__ import annotations
+
+from rochester_generator import TYPES, rochester_page  # noqa: F401
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    # The suite needs the optional plugin: pip install -e '.[bench]'
+    collect_ignore_glob = ["bench_*.py"]
+
+# Input sizes every scaling benchmark is run at
+SIZES = (100, 1_000, 10_000)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Load test the remote-query stages against local stand-ins.
+
+Starts the SIMBAD, Gaia, NED and VizieR stand-ins from ``standins.py``,
+points ASTRA at them through the ``ASTRA_*_URL`` overrides, then drives
+name resolution, the Gaia cross-match and classification at several
+concurrency levels. It reports throughput, client-side latency percentiles,
+calls that raised, and the 503s and 429s the stand-ins handed out.
+
+    python benchmarks/load_test.py --requests 200 --concurrency 1 4 16 --median-ms 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from rochester_generator import designation  # noqa: E402
+from standins import (  # noqa: E402
+    SERVICES,
+    StandInCluster,
+    pointed_at,
+    profile_arguments,
+    profile_from,
+)
+
+STAGES = ("resolve", "crossmatch", "classify")
+DEFAULT_CONCURRENCY = (1, 4, 16)
+
+# Stand-in each stage mostly talks to, for the server-side counters
+_SERVICES = {"resolve": ("simbad",), "crossmatch": ("gaia",), "classify": ("ned", "vizier")}
+
+
+@dataclass
+class LoadPoint:
+    """One stage at one concurrency level"""
+
+    stage: str
+    concurrency: int
+    requests: int
+    wall_s: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    failed: int
+    server_requests: int
+    server_errors: int
+    server_throttled: int
+
+    @property
+    def requests_per_s(self) -> float:
+        return self.requests / self.wall_s if self.wall_s else 0.0
+
+    def as_dict(self) -> Dict:
+        return {**asdict(self), "requests_per_s": self.requests_per_s}
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _position(index: int):
+    """Deterministic sky position per object, spread over the sky"""
+    ra = (index * 137.50776) % 360.0
+    dec = ((index * 61.8034) % 170.0) - 85.0
+    return ra, dec
+
+
+def stage_call(stage: str) -> Callable[[int], object]:
+    """One unit of work for ``stage``; clients are per thread, as in a worker pool"""
+    import pandas as pd
+    from astropy.coordinates import SkyCoord
+
+    from src.astra_discovery_engine import AstraDiscoveryEngine
+    from src.classification_engine import ClassificationEngine
+    from src.simbad_resolver import SimbadResolver
+
+    local = threading.local()
+
+    def client(factory):
+        if not hasattr(local, "client"):
+            local.client = factory()
+        return local.client
+
+    def resolve(index: int):
+        return client(SimbadResolver).resolve_name(designation(index, 2025, "AT"))
+
+    def crossmatch(index: int):
+        coord = SkyCoord(*_position(index), unit="deg")
+        frame = pd.DataFrame(
+            [
+                {
+                    "id": designation(index, 2025, "AT"),
+                    "ra": coord.ra.to_string(unit="hourangle", sep="hms", precision=2),
+                    "dec": coord.dec.to_string(sep=" ", precision=1, alwayssign=True),
+                }
+            ]
+        )
+        return client(AstraDiscoveryEngine).cross_match_with_gaia(frame)
+
+    def classify(index: int):
+        ra, dec = _position(index)
+        return client(ClassificationEngine).classify_transient(
+            designation(index, 2025, "AT"), {"ra": ra, "dec": dec}
+        )
+
+    return {"resolve": resolve, "crossmatch": crossmatch, "classify": classify}[stage]
+
+
+def run_level(cluster: StandInCluster, stage: str, concurrency: int, n_requests: int) -> LoadPoint:
+    """Run ``n_requests`` calls of ``stage`` with ``concurrency`` workers"""
+    call = stage_call(stage)
+    stand_ins = [cluster.stand_ins[service] for service in _SERVICES[stage]]
+    before = [(s.stats.requests, s.stats.errors, s.stats.throttled) for s in stand_ins]
+    latencies: List[float] = []
+    failures: List[BaseException] = []
+
+    def timed(index: int) -> None:
+        started = time.perf_counter()
+        try:
+            call(index)
+        except Exception as exc:  # the stages catch most errors themselves
+            failures.append(exc)
+        latencies.append(time.perf_counter() - started)
+
+    # The clients narrate every query; keep the report readable
+    with redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(timed, range(n_requests)))
+        wall = time.perf_counter() - started
+
+    deltas = [
+        [now - then for now, then in zip((s.stats.requests, s.stats.errors, s.stats.throttled), b)]
+        for s, b in zip(stand_ins, before)
+    ]
+    return LoadPoint(
+        stage=stage,
+        concurrency=concurrency,
+        requests=n_requests,
+        wall_s=wall,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        max_ms=max(latencies, default=0.0) * 1000,
+        failed=len(failures),
+        server_requests=sum(d[0] for d in deltas),
+        server_errors=sum(d[1] for d in deltas),
+        server_throttled=sum(d[2] for d in deltas),
+    )
+
+
+def summary_table(points: Sequence[LoadPoint]) -> str:
+    header = (
+        f"{'Stage':<11} {'Workers':>7} {'Calls':>6} {'Calls/s':>8} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'Max ms':>8} {'Failed':>6} {'HTTP':>6} {'503':>5} {'429':>5}"
+    )
+    lines = [header, "-" * len(header)]
+    for p in points:
+        lines.append(
+            f"{p.stage:<11} {p.concurrency:>7} {p.requests:>6} {p.requests_per_s:>8.1f} "
+            f"{p.p50_ms:>8.1f} {p.p95_ms:>8.1f} {p.p99_ms:>8.1f} {p.max_ms:>8.1f} {p.failed:>6} "
+            f"{p.server_requests:>6} {p.server_errors:>5} {p.server_throttled:>5}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("--requests", type=int, default=100, help="Calls per stage and level")
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    profile = profile_from(args)
+    points: List[LoadPoint] = []
+    with StandInCluster({service: profile for service in SERVICES}, args.seed) as cluster:
+        with pointed_at(cluster):
+            for stage in args.stages:
+                for concurrency in args.concurrency:
+                    print(f"⏱️  {stage} × {concurrency} workers...", flush=True)
+                    points.append(run_level(cluster, stage, concurrency, args.requests))
+
+    print()
+    print(summary_table(points))
+    if args.output:
+        payload = {"profile": asdict(profile), "points": [p.as_dict() for p in points]}
+        Path(args.output).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"\n💾 Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Synthetic Rochester supernova pages for offline benchmarks.
+
+Pages mimic the markup both engines parse: free-text "discovered" entries
+(with aliases and coordinates) followed by a ``Name / Mag / Type`` table.
+``noise`` is the fraction of records that get one of the defects found on
+the live page: missing or qualified magnitudes, uncertain types, padded
+names, short rows, non-transient designations and repeated sightings.
+
+    python benchmarks/rochester_generator.py --objects 1000000 --noise 0.05 -o page.html
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+TYPES = ("LRN", "unknown", "Ia", "II", "IIn", "Ibn", "CV", "SLSN-I", "TDE", "Ia-91T")
+
+HEADER = (
+    "<html><head><title>Latest Supernovae</title></head><body>\n"
+    "<h1>Rochester Astronomy Supernova Page</h1>\n"
+)
+FOOTER = "</body></html>\n"
+
+# Rows are written in blocks so huge pages never sit in memory as a list
+_CHUNK_ROWS = 5_000
+
+
+def designation(index: int, year: int = 2025, prefix: str = "AT") -> str:
+    """TNS-style name: a..z, aa..zz, aaa.. for index 0, 1, 2, ..."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = string.ascii_lowercase[remainder] + letters
+    return f"{prefix}{year}{letters}"
+
+
+def _magnitude(index: int) -> float:
+    return 13.5 + (index * 37 % 90) / 10
+
+
+def _table_row(index: int, year: int, rng: Optional[random.Random]) -> str:
+    name = designation(index, year)
+    mag = f"{_magnitude(index):.1f}"
+    obj_type = TYPES[index % len(TYPES)]
+    if rng is None:
+        return f"<tr><td>{name}</td><td>{mag}</td><td>{obj_type}</td></tr>\n"
+
+    defect = rng.randrange(8)
+    if defect == 0:
+        mag = rng.choice(("-", "", "&nbsp;"))
+    elif defect == 1:
+        mag = rng.choice((f"{mag}V", f"~{mag}", f"{mag}:", f"&lt;{mag}"))
+    elif defect == 2:
+        obj_type = rng.choice(("?", "", f"{obj_type}?", "SN"))
+    elif defect == 3:
+        name = f" {name}&nbsp;"
+    elif defect == 4:
+        # Too few columns; parsers skip it
+        return f"<tr><td>{name}</td><td>{mag}</td></tr>\n"
+    elif defect == 5:
+        # Not an AT/SN designation; parsers skip it
+        name = rng.choice((f"PSN J{index:08d}+{index % 9_000_000:07d}", f"Gaia{year % 100}{index}"))
+    elif defect == 6:
+        # Classified objects are listed under their SN name, with a host column
+        name = designation(index, year, prefix="SN")
+        return (
+            f"<tr><td>{name}</td><td>{mag}</td><td>{obj_type}</td>"
+            f"<td>NGC {index % 7840}</td></tr>\n"
+        )
+    else:
+        # A later sighting of an earlier object at another magnitude
+        earlier = rng.randrange(index + 1)
+        name = designation(earlier, year)
+        mag = f"{_magnitude(earlier) + rng.uniform(-1, 1):.1f}"
+    return f"<tr><td>{name}</td><td>{mag}</td><td>{obj_type}</td></tr>\n"
+
+
+def _entry(index: int, year: int, rng: Optional[random.Random]) -> str:
+    name = designation(index, year)
+    month, day = 1 + index % 12, 1 + index % 28
+    alias = f" = {_ztf_alias(index, year)}"
+    ra = f"{index % 24:02d}h{index % 60:02d}m{(index * 7) % 60:05.2f}s"
+    dec = f"{'+' if index % 2 else '-'}{index % 90:02d} {index % 60:02d} {(index * 3) % 60:02d}"
+    mag = f"Mag {_magnitude(index):.1f}"
+    obj_type = f"Type {TYPES[index % len(TYPES)]}"
+    if rng is not None:
+        defect = rng.randrange(5)
+        if defect == 0:
+            alias = ""
+        elif defect == 1:
+            ra = dec = ""
+        elif defect == 2:
+            mag = ""
+        elif defect == 3:
+            obj_type = "Type ?"
+        else:
+            name = f"{name}&nbsp;"
+    position = f" R.A. = {ra} Decl. = {dec}" if ra else ""
+    return (
+        f"<p><b>{name}</b>{alias} discovered {year}/{month:02d}/{day:02d} "
+        f"in {_host(index)} {mag} {obj_type}{position}</p>\n"
+    )
+
+
+def _ztf_alias(index: int, year: int) -> str:
+    suffix = designation(index, year, prefix="")[4:]
+    return f"ZTF{year % 100:02d}{suffix:a>7}"
+
+
+def _host(index: int) -> str:
+    return ("UGC", "NGC", "IC", "PGC", "anonymous galaxy")[index % 5] + f" {index % 9973}"
+
+
+def iter_page(
+    n_rows: int = 0,
+    n_entries: int = 0,
+    noise: float = 0.0,
+    seed: int = 0,
+    year: int = 2025,
+) -> Iterator[str]:
+    """Yield a page with ``n_entries`` entries and ``n_rows`` table rows, in chunks
+
+    Entries describe the first ``n_entries`` objects of the table, so both
+    sources overlap the way they do on the live page.
+    """
+    rng = random.Random(seed)
+
+    def record_rng() -> Optional[random.Random]:
+        return rng if noise and rng.random() < noise else None
+
+    yield HEADER
+    for start in range(0, n_entries, _CHUNK_ROWS):
+        stop = min(start + _CHUNK_ROWS, n_entries)
+        yield "".join(_entry(i, year, record_rng()) for i in range(start, stop))
+
+    yield "<table>\n<tr><th>Name</th><th>Mag</th><th>Type</th></tr>\n"
+    for start in range(0, n_rows, _CHUNK_ROWS):
+        stop = min(start + _CHUNK_ROWS, n_rows)
+        yield "".join(_table_row(i, year, record_rng()) for i in range(start, stop))
+    yield "</table>\n" + FOOTER
+
+
+def rochester_page(n_rows: int = 0, n_entries: int = 0, noise: float = 0.0, seed: int = 0) -> str:
+    """Whole page as one string"""
+    return "".join(iter_page(n_rows, n_entries, noise, seed))
+
+
+def page_for(objects: int, noise: float = 0.0, seed: int = 0, entry_fraction: float = 0.1):
+    """Chunks of a page listing ``objects`` transients, a fraction with entries"""
+    return iter_page(objects, int(objects * entry_fraction), noise, seed)
+
+
+def write_page(path, objects: int, noise: float = 0.0, seed: int = 0, entry_fraction=0.1) -> Path:
+    """Stream a generated page to ``path``"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        for chunk in page_for(objects, noise, seed, entry_fraction):
+            handle.write(chunk)
+    return path
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Rochester supernova page")
+    parser.add_argument("--objects", "-n", type=int, default=10_000, help="Table rows")
+    parser.add_argument(
+        "--entries",
+        type=float,
+        default=0.1,
+        help="Fraction of objects that also get a 'discovered' entry (default 0.1)",
+    )
+    parser.add_argument("--noise", type=float, default=0.0, help="Fraction of defective records")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        path = write_page(args.output, args.objects, args.noise, args.seed, args.entries)
+        print(f"📄 Wrote {args.objects:,} objects to {path} ({path.stat().st_size:,} bytes)")
+    else:
+        for chunk in page_for(args.objects, args.noise, args.seed, args.entries):
+            sys.stdout.write(chunk)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
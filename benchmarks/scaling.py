@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""End-to-end scaling curve for both discovery pipelines.
+
+Each (pipeline, size) point runs in a fresh interpreter against a generated
+page, with the Rochester download and Gaia cone searches stubbed out, and
+reports wall time, throughput and peak memory. Runs that time out, hit the
+memory limit or get killed are recorded as such, which is the point: the
+curve shows how large a page (or archive backfill) a worker can take.
+
+    python benchmarks/scaling.py --sizes 100 10000 1000000 --noise 0.05 -o scaling.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from rochester_generator import write_page  # noqa: E402
+
+PIPELINES = ("basic", "advanced")
+DEFAULT_SIZES = (100, 10_000, 1_000_000)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class ScalingPoint:
+    """One measurement on the curve"""
+
+    pipeline: str
+    objects: int
+    page_bytes: int
+    status: str = "ok"
+    wall_s: Optional[float] = None
+    cpu_s: Optional[float] = None
+    transients: Optional[int] = None
+    anomalies: Optional[int] = None
+    baseline_rss_bytes: Optional[int] = None
+    peak_rss_bytes: Optional[int] = None
+    tracemalloc_peak_bytes: Optional[int] = None
+    stages: Dict[str, float] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def objects_per_s(self) -> Optional[float]:
+        return self.objects / self.wall_s if self.wall_s else None
+
+    def as_dict(self) -> Dict:
+        return {**asdict(self), "objects_per_s": self.objects_per_s}
+
+
+class _EmptyGaiaJob:
+    def get_results(self):
+        return []
+
+
+@contextmanager
+def offline() -> Iterator[None]:
+    """Stub the network: no Rochester downloads, no Gaia matches"""
+
+    def no_download(*args, **kwargs):
+        raise RuntimeError("benchmarks run offline; pass the page as html")
+
+    with patch("src.astra_discovery_engine.requests.get", side_effect=no_download), patch(
+        "src.enhanced_discovery_v2.requests.get", side_effect=no_download
+    ), patch("astroquery.gaia.Gaia.cone_search_async", return_value=_EmptyGaiaJob()):
+        yield
+
+
+def run_pipeline(pipeline: str, html: str) -> Optional[Dict]:
+    """Run one pipeline on an already generated page, quietly and offline"""
+    from src.astra_discovery_engine import AstraDiscoveryEngine
+    from src.enhanced_discovery_v2 import EnhancedDiscoveryEngineV2
+
+    with offline(), redirect_stdout(io.StringIO()):
+        if pipeline == "basic":
+            return AstraDiscoveryEngine().run_discovery_pipeline(html=html)
+        return EnhancedDiscoveryEngineV2().run_advanced_pipeline(html=html)
+
+
+def measure(
+    pipeline: str, page: Path, objects: int, trace_allocations: bool = False
+) -> ScalingPoint:
+    """Time one run in this process; call it in a fresh interpreter"""
+    from src.memory_profile import peak_rss_bytes, rss_bytes
+    from src.telemetry import StageProfiler
+
+    html = page.read_text(encoding="utf-8")
+    point = ScalingPoint(pipeline, objects, page.stat().st_size)
+
+    # Load the engines first so the baseline excludes import-time memory
+    run_pipeline(pipeline, "<html></html>")
+    point.baseline_rss_bytes = rss_bytes()
+    if trace_allocations:
+        tracemalloc.start()
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        with StageProfiler() as profiler:
+            results = run_pipeline(pipeline, html)
+    except MemoryError:
+        point.status = "memory"
+        return point
+    point.wall_s = time.perf_counter() - wall
+    point.cpu_s = time.process_time() - cpu
+
+    if trace_allocations:
+        point.tracemalloc_peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    point.peak_rss_bytes = peak_rss_bytes()
+    point.stages = {name: stats.wall_s for name, stats in profiler.stats.items()}
+    if results is not None:
+        point.transients = len(results["transients"])
+        point.anomalies = len(results["anomalies"])
+    return point
+
+
+def measure_in_subprocess(
+    pipeline: str,
+    page: Path,
+    objects: int,
+    timeout: float,
+    memory_limit_mb: Optional[int] = None,
+    trace_allocations: bool = False,
+) -> ScalingPoint:
+    """Measure in a fresh interpreter, so peak RSS belongs to this point alone"""
+    command = [sys.executable, __file__, "--measure", pipeline, str(page), str(objects)]
+    if memory_limit_mb:
+        command += ["--memory-limit", str(memory_limit_mb)]
+    if trace_allocations:
+        command.append("--tracemalloc")
+
+    failed = ScalingPoint(pipeline, objects, page.stat().st_size)
+    try:
+        completed = subprocess.run(
+            command, capture_output=True, text=True, timeout=timeout, cwd=PROJECT_ROOT
+        )
+    except subprocess.TimeoutExpired:
+        failed.status = "timeout"
+        return failed
+    if completed.returncode != 0:
+        # SIGKILL is what the kernel OOM killer sends
+        failed.status = "killed" if completed.returncode == -9 else "crashed"
+        failed.error = (completed.stderr.strip().splitlines() or [""])[-1]
+        return failed
+
+    data = json.loads(completed.stdout.strip().splitlines()[-1])
+    data.pop("objects_per_s", None)
+    return ScalingPoint(**data)
+
+
+def scaling_curve(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    pipelines: Sequence[str] = PIPELINES,
+    noise: float = 0.0,
+    seed: int = 0,
+    timeout: float = 1800,
+    memory_limit_mb: Optional[int] = None,
+    trace_allocations: bool = False,
+    work_dir=None,
+) -> List[ScalingPoint]:
+    """Measure every pipeline at every size, smallest first"""
+    points = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        for size in sorted(sizes):
+            page = write_page(Path(tmp) / f"rochester_{size}.html", size, noise, seed)
+            for pipeline in pipelines:
+                print(f"   ⏱️  {pipeline} @ {size:,} objects...", file=sys.stderr)
+                points.append(
+                    measure_in_subprocess(
+                        pipeline, page, size, timeout, memory_limit_mb, trace_allocations
+                    )
+                )
+            page.unlink()
+    return points
+
+
+def _mib(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"{value / 2**20:.1f}"
+
+
+def summary_table(points: Sequence[ScalingPoint]) -> str:
+    """Plain-text scaling table"""
+    lines = [
+        f"{'Pipeline':<9} {'Objects':>10} {'Page MiB':>9} {'Wall (s)':>9} "
+        f"{'Objects/s':>10} {'Peak RSS MiB':>13} {'Growth MiB':>11} {'Status':>8}"
+    ]
+    lines.append("-" * len(lines[0]))
+    for point in points:
+        wall = "n/a" if point.wall_s is None else f"{point.wall_s:.2f}"
+        rate = "n/a" if point.objects_per_s is None else f"{point.objects_per_s:,.0f}"
+        growth = None
+        if point.peak_rss_bytes is not None and point.baseline_rss_bytes is not None:
+            growth = point.peak_rss_bytes - point.baseline_rss_bytes
+        lines.append(
+            f"{point.pipeline:<9} {point.objects:>10,} {_mib(point.page_bytes):>9} {wall:>9} "
+            f"{rate:>10} {_mib(point.peak_rss_bytes):>13} {_mib(growth):>11} {point.status:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling curve for the ASTRA pipelines")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--pipelines", nargs="+", choices=PIPELINES, default=list(PIPELINES))
+    parser.add_argument("--noise", type=float, default=0.0, help="Fraction of defective records")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=1800, help="Seconds per run")
+    parser.add_argument(
+        "--memory-limit", type=int, metavar="MB", help="Address-space limit per run (small workers)"
+    )
+    parser.add_argument(
+        "--tracemalloc", action="store_true", help="Also record the traced Python heap peak (slow)"
+    )
+    parser.add_argument("--output", "-o", help="Write the curve as JSON")
+    parser.add_argument("--measure", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        if args.memory_limit and resource is not None:
+            limit = args.memory_limit * 2**20
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        pipeline, page, objects = args.measure
+        point = measure(pipeline, Path(page), int(objects), args.tracemalloc)
+        print(json.dumps(point.as_dict()))
+        return 0
+
+    points = scaling_curve(
+        args.sizes,
+        args.pipelines,
+        args.noise,
+        args.seed,
+        args.timeout,
+        args.memory_limit,
+        args.tracemalloc,
+    )
+    print(summary_table(points))
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps([point.as_dict() for point in points], indent=2), encoding="utf-8"
+        )
+        print(f"\n📊 Scaling curve saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
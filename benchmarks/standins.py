@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""Local stand-ins for SIMBAD, Gaia TAP, NED and VizieR.
+
+Each service listens on its own local port and speaks just enough of the
+real protocol for ASTRA's clients: SIMBAD TAP sync queries, Gaia TAP async
+jobs, NED JSON position searches and VizieR VOTable cone searches.
+Every request waits for a sampled latency (lognormal around a median).
+A configurable fraction fails with 503, and traffic above the rate limit
+gets 429 with Retry-After. Point ASTRA at them through the ``ASTRA_*_URL``
+variables in ``environment()``.
+
+    python benchmarks/standins.py --median-ms 150 --error-rate 0.02 --rate-limit 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+SERVICES = ("simbad", "gaia", "ned", "vizier")
+
+# Environment variable and path each service is reached at
+_ENDPOINTS = {
+    "simbad": ("ASTRA_SIMBAD_URL", "/simbad/sim-tap"),
+    "gaia": ("ASTRA_GAIA_URL", "/"),
+    "ned": ("ASTRA_NED_URL", "/cgi-bin/objsearch"),
+    "vizier": ("ASTRA_VIZIER_URL", "/viz-bin/votable"),
+}
+
+
+@dataclass
+class ServiceProfile:
+    """How a stand-in behaves under load"""
+
+    median_ms: float = 50.0
+    sigma: float = 0.5  # lognormal shape; 0 gives a fixed latency
+    error_rate: float = 0.0  # fraction of requests answered with 503
+    rate_limit: float = 0.0  # sustained requests/s before 429s; 0 is unlimited
+    burst: int = 5
+    match_rate: float = 0.5  # fraction of queries that find an object
+
+    def sample_latency(self, rng: random.Random) -> float:
+        if self.sigma <= 0:
+            return self.median_ms / 1000
+        return rng.lognormvariate(math.log(self.median_ms / 1000), self.sigma)
+
+
+@dataclass
+class ServiceStats:
+    """Request outcomes seen by one stand-in"""
+
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def _matches(query: str, rate: float) -> bool:
+    """Deterministic per-query coin flip, so repeated runs see the same sky"""
+    digest = hashlib.sha256(query.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") / 2**32 < rate
+
+
+def _position(query: str) -> Tuple[float, float]:
+    digest = hashlib.sha256(query.encode("utf-8")).digest()
+    ra = int.from_bytes(digest[:4], "big") / 2**32 * 360
+    dec = int.from_bytes(digest[4:8], "big") / 2**32 * 180 - 90
+    return ra, dec
+
+
+def _cone_centre(query: str) -> Optional[Tuple[float, float]]:
+    """Centre of an ADQL cone search, from its first numeric POINT"""
+    match = re.search(r"POINT\('ICRS',\s*([-+\d.eE]+),\s*([-+\d.eE]+)\)", query)
+    return (float(match.group(1)), float(match.group(2))) if match else None
+
+
+def votable(fields: Sequence[Tuple[str, str]], rows: Sequence[Sequence]) -> str:
+    """Minimal VOTable 1.4 document with one TABLEDATA table"""
+    declared = "".join(
+        f'<FIELD name="{name}" datatype="{datatype}"'
+        + (' arraysize="*"' if datatype == "char" else "")
+        + "/>"
+        for name, datatype in fields
+    )
+    data = "".join("<TR>" + "".join(f"<TD>{value}</TD>" for value in row) + "</TR>" for row in rows)
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<VOTABLE version="1.4" xmlns="http://www.ivoa.net/xml/VOTable/v1.3">'
+        '<RESOURCE type="results"><INFO name="QUERY_STATUS" value="OK"/>'
+        f"<TABLE>{declared}<DATA><TABLEDATA>{data}</TABLEDATA></DATA></TABLE>"
+        "</RESOURCE></VOTABLE>"
+    )
+
+
+_CAPABILITIES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<vosi:capabilities xmlns:vosi="http://www.ivoa.net/xml/VOSICapabilities/v1.0"'
+    ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+    ' xmlns:tr="http://www.ivoa.net/xml/TAPRegExt/v1.0">'
+    '<capability standardID="ivo://ivoa.net/std/TAP" xsi:type="tr:TableAccess">'
+    '<language><name>ADQL</name><version ivo-id="ivo://ivoa.net/std/ADQL#v2.0">2.0</version>'
+    "</language><outputFormat><mime>application/x-votable+xml</mime></outputFormat>"
+    '<outputLimit><default unit="row">100000</default><hard unit="row">100000</hard>'
+    "</outputLimit></capability></vosi:capabilities>"
+)
+
+
+_SCHEMA_FIELDS = ("table_name", "column_name", "datatype", "description", "unit", "ucd")
+_BASIC_COLUMNS = ("main_id", "ra", "dec", "otype")
+
+
+class StandIn:
+    """One stand-in service on its own local port"""
+
+    def __init__(self, service: str, profile: Optional[ServiceProfile] = None, seed: int = 0):
+        if service not in SERVICES:
+            raise ValueError(f"Unknown service {service!r}; expected one of {SERVICES}")
+        self.service = service
+        self.profile = profile or ServiceProfile()
+        self.stats = ServiceStats()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._bucket = (
+            _TokenBucket(self.profile.rate_limit, self.profile.burst)
+            if self.profile.rate_limit
+            else None
+        )
+        self._jobs = itertools.count(1)
+        # Gaia jobs in flight: query text until its result is fetched
+        self._queries: Dict[int, str] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{_ENDPOINTS[self.service][1]}"
+
+    def start(self) -> "StandIn":
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                stand_in._handle(self, b"")
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                stand_in._handle(self, self.rfile.read(length))
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _handle(self, handler: BaseHTTPRequestHandler, body: bytes) -> None:
+        with self._rng_lock:
+            self.stats.requests += 1
+            latency = self.profile.sample_latency(self._rng)
+            failed = self._rng.random() < self.profile.error_rate
+        self.stats.latencies.append(latency)
+
+        if self._bucket is not None and not self._bucket.take():
+            self.stats.throttled += 1
+            self._send(handler, 429, "text/plain", b"Too many requests", {"Retry-After": "1"})
+            return
+        time.sleep(latency)
+        if failed:
+            self.stats.errors += 1
+            self._send(handler, 503, "text/plain", b"Service temporarily unavailable")
+            return
+
+        parts = urlsplit(handler.path)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        if body:
+            params.update(
+                {key: values[-1] for key, values in parse_qs(body.decode("utf-8")).items()}
+            )
+        status, content_type, payload, headers = getattr(self, f"_{self.service}")(
+            handler.command, parts.path, params
+        )
+        self._send(handler, status, content_type, payload, headers)
+
+    @staticmethod
+    def _send(handler, status, content_type, payload: bytes, headers=None) -> None:
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    # Service protocols: each returns (status, content type, body, headers)
+
+    def _simbad(self, method: str, path: str, params: Dict):
+        if path.endswith("/capabilities"):
+            return 200, "text/xml", _CAPABILITIES.encode("utf-8"), None
+        query = params.get("QUERY", "")
+        # Metadata astroquery reads before adding output columns
+        if "TAP_SCHEMA.columns" in query:
+            fields = [(name, "char") for name in _SCHEMA_FIELDS]
+            rows = [("basic", column, "char", column, "", "") for column in _BASIC_COLUMNS]
+            return 200, "application/x-votable+xml", votable(fields, rows).encode("utf-8"), None
+        if "TAP_SCHEMA.keys" in query or "FROM filter" in query:
+            fields = [("name", "char"), ("description", "char")]
+            return 200, "application/x-votable+xml", votable(fields, []).encode("utf-8"), None
+
+        name = re.search(r"id = '([^']*)'", query)
+        name = name.group(1) if name else query
+        rows = []
+        if _matches(name, self.profile.match_rate):
+            ra, dec = _position(name)
+            rows.append((name, f"{ra:.6f}", f"{dec:.6f}", "SN", name))
+        fields = [
+            ("main_id", "char"),
+            ("ra", "double"),
+            ("dec", "double"),
+            ("otype", "char"),
+            ("matched_id", "char"),
+        ]
+        return 200, "application/x-votable+xml", votable(fields, rows).encode("utf-8"), None
+
+    def _gaia(self, method: str, path: str, params: Dict):
+        base = "/tap-server/tap/async"
+        if method == "POST" and path.rstrip("/") == base:
+            job = next(self._jobs)
+            self._queries[job] = params.get("QUERY", "")
+            location = f"http://{self._server.server_address[0]}:{self._server.server_address[1]}"
+            return 303, "text/plain", b"", {"Location": f"{location}{base}/{job}"}
+
+        match = re.match(rf"{base}/(\d+)(/.*)?$", path)
+        if not match:
+            return 404, "text/plain", b"Not found", None
+        job, rest = int(match.group(1)), match.group(2) or ""
+        if rest == "/phase":
+            return 200, "text/plain", b"COMPLETED", None
+        if rest == "/results/result":
+            query = self._queries.pop(job, "")
+            rows = []
+            if _matches(query, self.profile.match_rate):
+                ra, dec = _cone_centre(query) or _position(query)
+                dec += 1 / 3600  # a star one arcsecond north of the transient
+                rows.append((job, f"{ra:.6f}", f"{dec:.6f}", "-3.2", "1.4", "6.5", "14.2", "0.0"))
+            fields = [
+                ("source_id", "long"),
+                ("ra", "double"),
+                ("dec", "double"),
+                ("pmra", "double"),
+                ("pmdec", "double"),
+                ("parallax", "double"),
+                ("phot_g_mean_mag", "double"),
+                ("dist", "double"),
+            ]
+            payload = gzip.compress(votable(fields, rows).encode("utf-8"))
+            return 200, "application/x-votable+xml", payload, {"Content-Encoding": "gzip"}
+        return 200, "text/xml", f"<uws:job><uws:jobId>{job}</uws:jobId></uws:job>".encode(), None
+
+    def _ned(self, method: str, path: str, params: Dict):
+        position = f"{params.get('lon')} {params.get('lat')}"
+        preferred = []
+        if _matches(position, self.profile.match_rate):
+            kind = "G" if _matches(position + "type", 0.8) else "*"
+            preferred.append({"Type": kind, "Distance": 0.2})
+        payload = json.dumps({"Preferred": preferred}).encode("utf-8")
+        return 200, "application/json", payload, None
+
+    def _vizier(self, method: str, path: str, params: Dict):
+        rows = []
+        if _matches(params.get("-c", ""), self.profile.match_rate):
+            rows.append(("V0001", "RR Lyr"))
+        payload = votable([("Name", "char"), ("Type", "char")], rows).encode("utf-8")
+        return 200, "application/x-votable+xml", payload, None
+
+
+class StandInCluster:
+    """All four stand-ins, started together"""
+
+    def __init__(self, profiles: Optional[Dict[str, ServiceProfile]] = None, seed: int = 0):
+        profiles = profiles or {}
+        self.stand_ins = {
+            service: StandIn(service, profiles.get(service), seed + index)
+            for index, service in enumerate(SERVICES)
+        }
+
+    def __enter__(self) -> "StandInCluster":
+        for stand_in in self.stand_ins.values():
+            stand_in.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for stand_in in self.stand_ins.values():
+            stand_in.stop()
+
+    def environment(self) -> Dict[str, str]:
+        """``ASTRA_*_URL`` overrides pointing every service at its stand-in"""
+        return {_ENDPOINTS[name][0]: s.url for name, s in self.stand_ins.items()}
+
+
+@contextmanager
+def pointed_at(cluster: StandInCluster) -> Iterator[None]:
+    """Set the endpoint overrides for the duration of the block"""
+    previous = {name: os.environ.get(name) for name in cluster.environment()}
+    os.environ.update(cluster.environment())
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by the stand-in launcher and the load test"""
+    parser.add_argument("--median-ms", type=float, default=50.0, help="Median latency")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Lognormal latency spread")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/s before 429s")
+    parser.add_argument("--burst", type=int, default=5, help="Requests allowed above the rate")
+    parser.add_argument("--match-rate", type=float, default=0.5, help="Fraction of hits")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def profile_from(args: argparse.Namespace) -> ServiceProfile:
+    return ServiceProfile(
+        args.median_ms, args.sigma, args.error_rate, args.rate_limit, args.burst, args.match_rate
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run local SIMBAD/Gaia/NED/VizieR stand-ins")
+    profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    profile = profile_from(args)
+    with StandInCluster({service: profile for service in SERVICES}, args.seed) as cluster:
+        print("🧪 Stand-ins running; point ASTRA at them with:")
+        for name, url in cluster.environment().items():
+            print(f"export {name}={url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print("\n👋 Stand-ins stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ Creates a complete, publication-ready discovery package from ASTRA output.
 
 Usage:
     python scripts/package_discovery.py --object AT2025abao --score 8.0 --mag 15.1 --type LRN
+    python scripts/package_discovery.py --results latest_discovery  # every anomaly of a run
 
 This creates:
     discoveries/2025-11-06_AT2025abao/
@@ -19,10 +20,19 @@ import datetime
 import os
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+# Add the project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.render_cache import RenderManifest, input_digest  # noqa: E402
+from src.results_io import read_results, resolve_results_path  # noqa: E402
+
+# Bump when the package templates change so existing packages are re-rendered
+PACKAGE_FORMAT_VERSION = 1
+PACKAGE_MANIFEST_NAME = ".package_manifest.json"
+DEFAULT_BATCH_OUTPUT = "discoveries/packages"
 
 # Template for discovery report
 DISCOVERY_TEMPLATE = """---
@@ -129,17 +139,13 @@ Use classification "{obj_type}" depending on spectroscopy.
 """
 
 
-def create_discovery_package(object_id, score, mag=None, obj_type=None, ra=None, dec=None):
-    """Create a complete discovery package."""
+def render_discovery_package(object_id, score, mag=None, obj_type=None, ra=None, dec=None):
+    """Render the files of a discovery package; returns {file name: content}."""
 
     # Get current date
     date = datetime.datetime.utcnow().strftime("%Y-%m-%d")
     timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
 
-    # Create discovery directory
-    discovery_dir = Path(f"discoveries/{date}_{object_id}")
-    discovery_dir.mkdir(parents=True, exist_ok=True)
-
     # Determine priority
     score_float = float(score)
     if score_float >= 7.0:
@@ -203,67 +209,94 @@ This could be a rare type of supernova, an unusual CV outburst, or a new phenome
         significance=significance,
     )
 
-    # Write discovery report
-    index_path = discovery_dir / "index.md"
-    with open(index_path, "w") as f:
-        f.write(content)
+    files = {"index.md": content}
 
     # Create data stub
-    data_path = discovery_dir / "data.csv"
-    with open(data_path, "w") as f:
-        f.write("date,magnitude,source,notes\n")
-        f.write(f"{date},{mag or 'Unknown'},ASTRA,Discovery\n")
+    files["data.csv"] = (
+        "date,magnitude,source,notes\n" + f"{date},{mag or 'Unknown'},ASTRA,Discovery\n"
+    )
 
     # Create observation plan stub
-    plan_path = discovery_dir / "observation_plan.md"
-    with open(plan_path, "w") as f:
-        f.write(f"# Observation Plan for {object_id}\n\n")
-        f.write(f"**Priority**: {priority_text}\n")
-        f.write(f"**Magnitude**: {mag or 'Unknown'}\n")
-        f.write(f"**Type**: {obj_type or 'Unknown'}\n\n")
-        f.write("## Immediate Actions\n\n")
-        f.write("1. **Spectroscopy**: Obtain classification spectrum\n")
-        f.write("2. **Photometry**: Start multi-band monitoring\n")
-        f.write("3. **Astrometry**: Confirm position\n\n")
-        f.write("## Telescope Requirements\n\n")
-        f.write("- **Aperture**: 2-4m for spectroscopy\n")
-        f.write("- **Instruments**: Low-res spectrograph, BVRI filters\n")
-        f.write("- **Exposure**: 300-600s for S/N>20\n\n")
-        f.write("## Timeline\n\n")
-        f.write(f"- **Discovery**: {timestamp}\n")
-        f.write("- **First Spectrum**: Within 24-48 hours\n")
-        f.write("- **Classification**: Within 1 week\n")
-        f.write("- **Monitoring**: Daily for 2 weeks\n")
+    files["observation_plan.md"] = "".join(
+        [
+            f"# Observation Plan for {object_id}\n\n",
+            f"**Priority**: {priority_text}\n",
+            f"**Magnitude**: {mag or 'Unknown'}\n",
+            f"**Type**: {obj_type or 'Unknown'}\n\n",
+            "## Immediate Actions\n\n",
+            "1. **Spectroscopy**: Obtain classification spectrum\n",
+            "2. **Photometry**: Start multi-band monitoring\n",
+            "3. **Astrometry**: Confirm position\n\n",
+            "## Telescope Requirements\n\n",
+            "- **Aperture**: 2-4m for spectroscopy\n",
+            "- **Instruments**: Low-res spectrograph, BVRI filters\n",
+            "- **Exposure**: 300-600s for S/N>20\n\n",
+            "## Timeline\n\n",
+            f"- **Discovery**: {timestamp}\n",
+            "- **First Spectrum**: Within 24-48 hours\n",
+            "- **Classification**: Within 1 week\n",
+            "- **Monitoring**: Daily for 2 weeks\n",
+        ]
+    )
 
     # Create discovery log
-    log_path = discovery_dir / "discovery.log"
-    with open(log_path, "w") as f:
-        f.write(f"ASTRA Discovery Log for {object_id}\n")
-        f.write(f"Generated: {timestamp}\n")
-        f.write(f"Score: {score}/10\n")
-        f.write(f"Magnitude: {mag}\n")
-        f.write(f"Type: {obj_type}\n")
-        f.write("\nSystem: ASTRA Advanced v1.0.0\n")
-        f.write("Status: Discovery packaged successfully\n")
+    files["discovery.log"] = "".join(
+        [
+            f"ASTRA Discovery Log for {object_id}\n",
+            f"Generated: {timestamp}\n",
+            f"Score: {score}/10\n",
+            f"Magnitude: {mag}\n",
+            f"Type: {obj_type}\n",
+            "\nSystem: ASTRA Advanced v1.0.0\n",
+            "Status: Discovery packaged successfully\n",
+        ]
+    )
 
     # Create README for the discovery directory
-    readme_path = discovery_dir / "README.md"
-    with open(readme_path, "w") as f:
-        f.write(f"# Discovery Package: {object_id}\n\n")
-        f.write(f"**Date**: {date}\n")
-        f.write(f"**Score**: {score}/10\n")
-        f.write(f"**Magnitude**: {mag or 'Unknown'}\n")
-        f.write(f"**Type**: {obj_type or 'Unknown'}\n\n")
-        f.write("## Files\n\n")
-        f.write("- `index.md` - Main discovery report\n")
-        f.write("- `data.csv` - Photometric data\n")
-        f.write("- `observation_plan.md` - ATel/TNS-ready plan\n")
-        f.write("- `discovery.log` - System logs\n")
-        f.write("- `README.md` - This file\n\n")
-        f.write("## Usage\n\n")
-        f.write("1. Review `index.md` for full details\n")
-        f.write("2. Use `observation_plan.md` for telescope proposals\n")
-        f.write("3. Submit `index.md` to TNS/ATel after follow-up\n")
+    files["README.md"] = "".join(
+        [
+            f"# Discovery Package: {object_id}\n\n",
+            f"**Date**: {date}\n",
+            f"**Score**: {score}/10\n",
+            f"**Magnitude**: {mag or 'Unknown'}\n",
+            f"**Type**: {obj_type or 'Unknown'}\n\n",
+            "## Files\n\n",
+            "- `index.md` - Main discovery report\n",
+            "- `data.csv` - Photometric data\n",
+            "- `observation_plan.md` - ATel/TNS-ready plan\n",
+            "- `discovery.log` - System logs\n",
+            "- `README.md` - This file\n\n",
+            "## Usage\n\n",
+            "1. Review `index.md` for full details\n",
+            "2. Use `observation_plan.md` for telescope proposals\n",
+            "3. Submit `index.md` to TNS/ATel after follow-up\n",
+        ]
+    )
+
+    return files
+
+
+def write_discovery_package(discovery_dir, files):
+    """Write rendered package files; returns their paths."""
+
+    discovery_dir = Path(discovery_dir)
+    discovery_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, text in files.items():
+        path = discovery_dir / name
+        with open(path, "w") as f:
+            f.write(text)
+        paths.append(path)
+    return paths
+
+
+def create_discovery_package(object_id, score, mag=None, obj_type=None, ra=None, dec=None):
+    """Create a complete discovery package."""
+
+    date = datetime.datetime.utcnow().strftime("%Y-%m-%d")
+    discovery_dir = Path(f"discoveries/{date}_{object_id}")
+    files = render_discovery_package(object_id, score, mag, obj_type, ra, dec)
+    write_discovery_package(discovery_dir, files)
 
     print(f"✅ Packaged discovery at {discovery_dir}")
     print(f"📂 Ready for git add/commit")
@@ -275,6 +308,75 @@ This could be a rare type of supernova, an unusual CV outburst, or a new phenome
     return str(discovery_dir)
 
 
+def _package_inputs(record):
+    """The record fields a package is rendered from."""
+
+    return {
+        "object_id": record["id"],
+        "score": record["score"],
+        "mag": record.get("mag"),
+        "obj_type": record.get("type"),
+        "ra": record.get("ra"),
+        "dec": record.get("dec"),
+    }
+
+
+def _render_record(inputs):
+    """Process-pool worker: render one package from its inputs."""
+
+    return render_discovery_package(**inputs)
+
+
+def package_anomalies(records, output_dir=DEFAULT_BATCH_OUTPUT, workers=None, force=False):
+    """Package every anomaly record in a process pool, skipping unchanged ones.
+
+    Packages go to ``output_dir/<object id>/``. A manifest of input digests
+    lets re-runs skip objects whose score, magnitude, type and position are
+    unchanged, unless ``force`` is set. Returns the package directory for
+    every record.
+    """
+
+    output_dir = Path(output_dir).expanduser()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = RenderManifest(output_dir / PACKAGE_MANIFEST_NAME)
+
+    directories = {}
+    pending = []
+    for record in records:
+        inputs = _package_inputs(record)
+        directories[record["id"]] = output_dir / record["id"]
+        digest = input_digest({"format": PACKAGE_FORMAT_VERSION, "inputs": inputs})
+        if not force and manifest.is_current(record["id"], digest):
+            continue
+        pending.append((record["id"], digest, inputs))
+
+    print(
+        f"📦 Packaging {len(pending)} discoveries "
+        f"({len(directories) - len(pending)} unchanged) into {output_dir}"
+    )
+
+    if pending:
+        all_inputs = [inputs for _, _, inputs in pending]
+        if workers == 1 or len(pending) == 1:
+            rendered = map(_render_record, all_inputs)
+            _write_packages(pending, rendered, directories, manifest)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rendered = pool.map(_render_record, all_inputs, chunksize=8)
+                _write_packages(pending, rendered, directories, manifest)
+        manifest.save()
+
+    return directories
+
+
+def _write_packages(pending, rendered, directories, manifest):
+    """Write rendered packages and record each object in the manifest."""
+
+    for (object_id, digest, _), files in zip(pending, rendered):
+        paths = write_discovery_package(directories[object_id], files)
+        manifest.record(object_id, digest, paths)
+
+
 def main():
     """Command line interface."""
     parser = argparse.ArgumentParser(
@@ -290,18 +392,47 @@ Examples:
   
   # Package with coordinates
   python scripts/package_discovery.py --object AT2025test --score 7.0 --mag 16.0 --type CV --ra "21:42:15.42" --dec "+53:17:43.1"
+
+  # Package every anomaly of a run (unchanged objects are skipped)
+  python scripts/package_discovery.py --results latest_discovery
         """,
     )
 
-    parser.add_argument("--object", required=True, help="Object ID (e.g., AT2025abao)")
-    parser.add_argument("--score", required=True, type=float, help="ASTRA anomaly score (0-10)")
+    parser.add_argument("--object", help="Object ID (e.g., AT2025abao)")
+    parser.add_argument("--score", type=float, help="ASTRA anomaly score (0-10)")
     parser.add_argument("--mag", type=float, help="Discovery magnitude")
     parser.add_argument("--type", help="Object type (e.g., LRN, CV, unknown)")
     parser.add_argument("--ra", help="Right Ascension (optional)")
     parser.add_argument("--dec", help="Declination (optional)")
+    parser.add_argument(
+        "--results",
+        help="Package every anomaly in this run directory or anomalies.jsonl",
+    )
+    parser.add_argument(
+        "--output",
+        default=DEFAULT_BATCH_OUTPUT,
+        help=f"Directory for batch packages (default: {DEFAULT_BATCH_OUTPUT})",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --results")
+    parser.add_argument(
+        "--force", action="store_true", help="Re-render packages even if inputs are unchanged"
+    )
 
     args = parser.parse_args()
 
+    if args.results:
+        results_file = resolve_results_path(args.results)
+        if not results_file.exists():
+            print(f"❌ Results file not found: {results_file}")
+            return 1
+        package_anomalies(
+            read_results(results_file), args.output, workers=args.workers, force=args.force
+        )
+        return 0
+
+    if not args.object or args.score is None:
+        parser.error("--object and --score are required unless --results is given")
+
     # Create the discovery package
     create_discovery_package(
         object_id=args.object,
@@ -311,7 +442,8 @@ Examples:
         ra=args.ra,
         dec=args.dec,
     )
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
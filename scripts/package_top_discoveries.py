@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Package Top Discoveries Script
-Takes ASTRA report and packages the top discoveries into detailed reports
+Takes an ASTRA run's anomalies.jsonl and packages the top discoveries into detailed reports
 """
 
 import argparse
@@ -11,59 +11,27 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+# Add the project root to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from src.results_io import read_results, resolve_results_path  # noqa: E402
 
-def extract_top_discoveries(report_file, max_discoveries=3):
-    """Extract top discoveries from report file"""
 
-    discoveries = []
+def extract_top_discoveries(results_path, max_discoveries=3):
+    """Read the best-ranked anomalies from a run's results file"""
 
-    if not os.path.exists(report_file):
-        print(f"❌ Report file not found: {report_file}")
-        return discoveries
+    results_file = resolve_results_path(results_path)
+    if not results_file.exists():
+        print(f"❌ Results file not found: {results_file}")
+        return []
 
-    with open(report_file, "r") as f:
-        content = f.read()
+    return read_results(results_file, limit=max_discoveries)
 
-    # Parse the report to extract high-priority discoveries
-    lines = content.split("\n")
-    in_anomaly_section = False
 
-    for line in lines:
-        line = line.strip()
-
-        # Look for anomaly section
-        if "HIGH-PRIORITY ANOMALIES" in line:
-            in_anomaly_section = True
-            continue
-
-        if "IMMEDIATE FOLLOW-UP" in line:
-            break
-
-        # Extract discovery lines
-        if in_anomaly_section and line and (line[0].isdigit() or "AT2025" in line):
-            # Parse discovery information
-            if "AT2025" in line and ("Score:" in line or "LRN" in line or "CV" in line):
-                discoveries.append(line)
-
-                if len(discoveries) >= max_discoveries:
-                    break
-
-    return discoveries
-
-
-def create_discovery_package(discovery_text, output_dir):
-    """Create a detailed package for a single discovery"""
-
-    # Extract object ID from the discovery text
-    object_id = None
-    for token in discovery_text.split():
-        if token.startswith("AT2025"):
-            object_id = token
-            break
+def create_discovery_package(discovery, output_dir):
+    """Create a detailed package for a single discovery record"""
 
+    object_id = discovery.get("id")
     if not object_id:
         return None
 
@@ -71,8 +39,7 @@ def create_discovery_package(discovery_text, output_dir):
     discovery_dir = os.path.join(output_dir, object_id)
     os.makedirs(discovery_dir, exist_ok=True)
 
-    # Parse discovery details
-    details = parse_discovery_details(discovery_text, object_id)
+    details = parse_discovery_details(discovery)
 
     # Create reports
     create_atea_report(details, discovery_dir)
@@ -82,40 +49,26 @@ def create_discovery_package(discovery_text, output_dir):
     return discovery_dir
 
 
-def parse_discovery_details(text, object_id):
-    """Parse discovery details from text"""
+def parse_discovery_details(discovery):
+    """Map a results record onto the fields used by the package templates"""
 
     details = {
-        "object_id": object_id,
+        "object_id": discovery["id"],
         "discovery_date": datetime.now().strftime("%Y-%m-%d"),
         "discovery_time": datetime.now().strftime("%H:%M:%S UTC"),
-        "raw_text": text,
+        "record": discovery,
     }
 
-    # Extract score
-    if "Score:" in text:
-        score_text = text.split("Score:")[1].split()[0]
-        details["score"] = float(score_text.replace("(", "").replace(")", ""))
-
-    # Extract magnitude
-    if "m=" in text:
-        for part in text.split():
-            if part.startswith("m="):
-                details["magnitude"] = float(part[2:])
-                break
-
-    # Extract type
-    if ")" in text and "(" in text:
-        type_start = text.find("(") + 1
-        type_end = text.find(")")
-        if type_start > 0 and type_end > type_start:
-            obj_type = text[type_start:type_end]
-            details["type"] = obj_type
-
-    # Extract classification reason
-    if "-" in text:
-        reason_part = text.split("-", 1)[-1].strip()
-        details["classification_reason"] = reason_part
+    if discovery.get("score") is not None:
+        details["score"] = discovery["score"]
+    if discovery.get("mag") is not None:
+        details["magnitude"] = discovery["mag"]
+    if discovery.get("type"):
+        details["type"] = discovery["type"]
+    if discovery.get("reasons"):
+        details["classification_reason"] = ", ".join(discovery["reasons"])
+    if discovery.get("ra") and discovery.get("dec"):
+        details["coordinates"] = f"{discovery['ra']} {discovery['dec']}"
 
     return details
 
@@ -148,7 +101,7 @@ characteristics in the ASTRA multi-factor scoring system.
 Follow-up observations are strongly encouraged, particularly spectroscopic
 classification to confirm the object type.
 
-Coordinates: [Insert from catalog cross-match when available]
+Coordinates: {details.get('coordinates', '[Insert from catalog cross-match when available]')}
 Host Galaxy: [Determine from cross-matching]
 
 For more information about this discovery, contact the ASTRA team at
@@ -318,7 +271,10 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
-    parser.add_argument("report_file", help="Path to ASTRA discovery report file")
+    parser.add_argument(
+        "results",
+        help="ASTRA run directory or its anomalies.jsonl (a report path inside the run also works)",
+    )
     parser.add_argument(
         "--output",
         "-o",
@@ -336,26 +292,26 @@ def main():
 
     print("📦 Packaging Top Discoveries")
     print("==========================")
-    print(f"Reading report: {args.report_file}")
+    print(f"Reading results: {resolve_results_path(args.results)}")
     print(f"Output directory: {args.output}")
     print()
 
     # Extract top discoveries
-    discoveries = extract_top_discoveries(args.report_file, args.max)
+    discoveries = extract_top_discoveries(args.results, args.max)
 
     if not discoveries:
-        print("❌ No high-priority discoveries found in report")
+        print("❌ No high-priority discoveries found in results")
         return 1
 
     print(f"Found {len(discoveries)} top discoveries:")
-    for i, disc in enumerate(discoveries, 1):
-        print(f"  {i}. {disc}")
+    for disc in discoveries:
+        print(f"  {disc['rank']}. {disc['id']} (Score: {disc['score']:.1f}) {disc.get('type', '')}")
     print()
 
     # Package each discovery
     packaged = []
     for disc in discoveries:
-        print(f"Packaging: {disc.split()[1] if 'AT2025' in disc else 'Unknown'}")
+        print(f"Packaging: {disc.get('id', 'Unknown')}")
 
         discovery_dir = create_discovery_package(disc, args.output)
         if discovery_dir:
@@ -372,7 +328,7 @@ def main():
     summary = {
         "packaging_date": datetime.now().isoformat(),
         "total_discoveries": len(packaged),
-        "source_report": args.report_file,
+        "source_results": str(resolve_results_path(args.results)),
         "packages": [os.path.basename(p) for p in packaged],
     }
 
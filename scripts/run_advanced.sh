@@ -59,14 +59,12 @@ echo ""
 
 # Step 2: Run advanced discovery pipeline
 echo "🔬 Step 2: Running advanced discovery pipeline..."
-python src/advanced_discovery.py > "$OUTPUT_DIR/advanced_discovery.log" 2>&1
+python -m astra_discoveries --advanced --output "$OUTPUT_DIR" > "$OUTPUT_DIR/advanced_discovery.log" 2>&1 || true
 
-if [ -f "astra_advanced_report.txt" ]; then
-    cp astra_advanced_report.txt "$OUTPUT_DIR/"
-    cp advanced_transients_catalog.csv "$OUTPUT_DIR/"
-    
-    # Count anomalies
-    ANOMALY_COUNT=$(grep -c "Score:" astra_advanced_report.txt || echo "0")
+RESULTS_FILE="$OUTPUT_DIR/anomalies.jsonl"
+if [ -f "$RESULTS_FILE" ]; then
+    # Count anomalies from the structured results sidecar
+    ANOMALY_COUNT=$(python -m src.results_io "$RESULTS_FILE" --count)
     echo -e "${GREEN}✓${NC} Found $ANOMALY_COUNT high-priority anomalies"
 else
     echo -e "${RED}❌${NC} Advanced discovery pipeline failed"
@@ -76,9 +74,11 @@ echo ""
 
 # Step 3: Package top discoveries
 echo "📦 Step 3: Packaging top discoveries..."
-if [ -f "astra_advanced_report.txt" ]; then
-    # Extract top 3 anomalies and package them
-    python scripts/package_top_discoveries.py "$OUTPUT_DIR/astra_advanced_report.txt" > "$OUTPUT_DIR/packaging.log" 2>&1
+if [ -f "$RESULTS_FILE" ]; then
+    # Package the top 3 anomalies
+    python scripts/package_top_discoveries.py "$RESULTS_FILE" > "$OUTPUT_DIR/packaging.log" 2>&1
+    # Package every anomaly; objects unchanged since the last run are skipped
+    python scripts/package_discovery.py --results "$RESULTS_FILE" --output discoveries/packages >> "$OUTPUT_DIR/packaging.log" 2>&1
     echo -e "${GREEN}✓${NC} Packaged discoveries"
 fi
 echo ""
@@ -99,10 +99,10 @@ echo "📊 Step 4: Generating summary..."
         echo ""
     fi
     
-    if [ -f "$OUTPUT_DIR/astra_advanced_report.txt" ]; then
+    if [ -f "$RESULTS_FILE" ]; then
         echo "Top Anomalies:"
         echo "--------------"
-        head -20 "$OUTPUT_DIR/astra_advanced_report.txt"
+        python -m src.results_io "$RESULTS_FILE" --top 10
         echo ""
     fi
     
@@ -126,10 +126,8 @@ echo ""
 # Step 6: Show top discoveries
 echo "🎯 Step 6: Top discoveries this run:"
 echo "-----------------------------------"
-if [ -f "astra_advanced_report.txt" ]; then
-    # Extract top 3 anomalies
-    awk '/HIGH-PRIORITY ANOMALIES/,/IMMEDIATE FOLLOW-UP/' astra_advanced_report.txt | \
-    grep -E "^[0-9]+\." | head -3
+if [ -s "$RESULTS_FILE" ]; then
+    python -m src.results_io "$RESULTS_FILE" --top 3
 else
     echo -e "${YELLOW}⚠️${NC} No anomalies found"
 fi
@@ -149,6 +147,8 @@ echo "  cat latest_discovery/summary.txt"
 echo "  cat advanced_report"
 echo "  ls -lh latest_discovery/"
 echo ""
+echo "Continuous monitoring: astra-discover --watch --interval 600"
+echo ""
 echo "Next run: Add to crontab for automation"
 echo "  crontab -e"
 echo "  # Run daily at 2 AM"
@@ -52,6 +52,12 @@ setup(
         'lxml>=4.6.0',
     ],
     extras_require={
+        'parquet': [
+            'pyarrow>=10.0',
+        ],
+        'bench': [
+            'pytest-benchmark>=4.0',
+        ],
         'dev': [
             'pytest>=6.0',
             'pytest-cov>=2.0',
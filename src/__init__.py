@@ -23,9 +23,22 @@ __version__ = "2.0.2"
 __author__ = "ASTRA Collaboration"
 __email__ = "astra@shannonlabs.io"
 
-from .astra_discovery_engine import AstraDiscoveryEngine
-from .enhanced_discovery_v2 import EnhancedDiscoveryEngineV2
-from .transient_scraper import TransientScraper, get_recent_transients
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .astra_discovery_engine import AstraDiscoveryEngine
+    from .enhanced_discovery_v2 import EnhancedDiscoveryEngineV2
+    from .transient_scraper import TransientScraper, get_recent_transients
+
+# The engines pull in pandas, astropy and bs4, so they are imported on first
+# use; ``astra-discover --help``/``--check`` never pay for them
+_LAZY_ATTRIBUTES = {
+    "AstraDiscoveryEngine": ".astra_discovery_engine",
+    "EnhancedDiscoveryEngineV2": ".enhanced_discovery_v2",
+    "TransientScraper": ".transient_scraper",
+    "get_recent_transients": ".transient_scraper",
+}
 
 __all__ = [
     "TransientScraper",
@@ -37,30 +50,65 @@ __all__ = [
 ]
 
 
-def run_basic_discovery():
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+def _resolve(name):
+    """Look up a lazy attribute, preferring an already bound (or patched) value"""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+def run_basic_discovery(html=None, alias_index=None):
     """
     Run a basic ASTRA discovery cycle.
 
+    Parameters
+    ----------
+    html : str, optional
+        Already fetched Rochester page; downloaded when omitted.
+    alias_index : AliasIndex, optional
+        Alias index to merge designations with, e.g. a catalog store's.
+
     Returns
     -------
     results : dict
         Dictionary containing transients and anomalies found.
     """
-    engine = AstraDiscoveryEngine()
-    return engine.run_discovery_pipeline()
+    engine = _resolve("AstraDiscoveryEngine")(alias_index=alias_index)
+    return engine.run_discovery_pipeline(html=html)
 
 
-def run_advanced_discovery():
+def run_advanced_discovery(html=None, alias_index=None):
     """
     Run an advanced ASTRA discovery cycle with enhanced scoring.
 
+    Parameters
+    ----------
+    html : str, optional
+        Already fetched Rochester page; downloaded when omitted.
+    alias_index : AliasIndex, optional
+        Alias index to merge designations with, e.g. a catalog store's.
+
     Returns
     -------
     results : dict
         Dictionary containing transients and anomalies found.
     """
-    engine = EnhancedDiscoveryEngineV2()
-    return engine.run_advanced_pipeline()
+    engine = _resolve("EnhancedDiscoveryEngineV2")(alias_index=alias_index)
+    return engine.run_advanced_pipeline(html=html)
 
 
 def system_check():
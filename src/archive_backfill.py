@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Archive Backfill
+Concurrent, resumable loading of the Rochester year archives into the catalog store
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urldefrag, urljoin
+
+import lxml.html
+import pandas as pd
+import requests
+
+from .catalog_store import write_catalog
+from .http_client import endpoint, get_session, iter_body
+from .render_cache import RenderManifest
+from .rochester_stream import CHUNK_SIZE, RochesterStreamParser, iter_rochester_records
+from .tracing import span
+from .transient_schema import FRAME_BATCH_SIZE, transient_frame
+
+BACKFILL_MANIFEST_NAME = ".backfill_manifest.json"
+PAGE_CACHE_NAME = ".backfill_pages"
+
+# Politeness defaults: at most this many requests in flight, and at least
+# this many seconds between the start of two requests
+DEFAULT_CONNECTIONS = 4
+DEFAULT_DELAY = 0.5
+
+# Year index pages, e.g. snimages/sn2025.html
+YEAR_PAGE = "sn{year}.html"
+YEAR_PAGE_PATTERN = re.compile(r"sn\d{4}\.html$")
+
+
+def parse_years(spec: str) -> List[int]:
+    """Years from "2025", "2015-2025" or a comma-separated mix of both"""
+    years = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        try:
+            start, end = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(f"Invalid year range: {part!r}") from None
+        if start > end:
+            raise ValueError(f"Invalid year range: {part!r}")
+        years.update(range(start, end + 1))
+    if not years:
+        raise ValueError("No years given")
+    return sorted(years)
+
+
+def year_urls(years: Sequence[int], base_url: Optional[str] = None) -> List[str]:
+    """Index page URL for every year"""
+    base_url = base_url or endpoint("rochester_archive")
+    return [urljoin(base_url, YEAR_PAGE.format(year=year)) for year in years]
+
+
+def archive_links(html: str, page_url: str, base_url: Optional[str] = None) -> List[str]:
+    """Per-object archive pages linked from a year index page
+
+    Only HTML pages below the archive root are followed; other year index
+    pages are left to their own year.
+    """
+    base_url = base_url or endpoint("rochester_archive")
+    if not html.strip():
+        return []
+    links = []
+    for _, _, link, _ in lxml.html.iterlinks(html):
+        url = urldefrag(urljoin(page_url, link))[0]
+        if not url.startswith(base_url) or not url.endswith((".html", ".htm")):
+            continue
+        if url == page_url or YEAR_PAGE_PATTERN.fullmatch(url[len(base_url) :]):
+            continue
+        links.append(url)
+    return list(dict.fromkeys(links))
+
+
+def parse_archive_page(path: str) -> pd.DataFrame:
+    """Normalized transients on a downloaded archive page (runs in a worker process)"""
+    parser = RochesterStreamParser(max_entries=None)
+    with open(path, encoding="utf-8") as page:
+        chunks = iter(lambda: page.read(CHUNK_SIZE), "")
+        return transient_frame(iter_rochester_records(chunks, parser))
+
+
+class PolitenessLimiter:
+    """Cap concurrent requests and space out their starts"""
+
+    def __init__(self, max_connections: int = DEFAULT_CONNECTIONS, delay: float = DEFAULT_DELAY):
+        self.delay = delay
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one connection slot, waiting for the next free start time"""
+        with self._slots:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+@dataclass
+class BackfillResult:
+    """Pages and rows handled by one backfill run"""
+
+    pages: int = 0
+    skipped: int = 0
+    rows: int = 0
+    failed: List[str] = field(default_factory=list)
+
+
+class _Loader:
+    """Batch parsed pages into catalog writes, then mark them done"""
+
+    def __init__(self, store: Path, manifest: RenderManifest, batch_rows: int):
+        self.store = store
+        self.manifest = manifest
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._pages: List[tuple] = []
+        self._frames: List[pd.DataFrame] = []
+        self._pending_rows = 0
+
+    def add(self, url: str, digest: str, path: Path, frame: pd.DataFrame) -> None:
+        self._pages.append((url, digest, path))
+        if not frame.empty:
+            self._frames.append(frame)
+            self._pending_rows += len(frame)
+        if self._pending_rows >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the batch in one go; its pages count as done only afterwards"""
+        if self._frames:
+            write_catalog(pd.concat(self._frames, ignore_index=True), self.store)
+            self.rows += self._pending_rows
+        for url, digest, path in self._pages:
+            self.manifest.record(url, digest)
+            path.unlink(missing_ok=True)
+        if self._pages:
+            self.manifest.save()
+        self._pages, self._frames, self._pending_rows = [], [], 0
+
+
+def _completed(function, *args) -> Future:
+    """Run ``function`` now and wrap the outcome like an executor would"""
+    future: Future = Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+class ArchiveBackfill:
+    """Download, parse and load the Rochester archive for a range of years
+
+    Year index pages are always fetched, because they link to the
+    per-object pages and keep growing; they are loaded again only when
+    their content changed. Per-object pages already in the manifest are not
+    fetched at all unless ``force`` is set. Downloads share a politeness
+    limit, parsing runs in a process pool, and rows are written to the
+    store in batches of about ``batch_rows``.
+    """
+
+    def __init__(
+        self,
+        store,
+        workers: Optional[int] = None,
+        max_connections: int = DEFAULT_CONNECTIONS,
+        delay: float = DEFAULT_DELAY,
+        force: bool = False,
+        session: Optional[requests.Session] = None,
+        batch_rows: int = FRAME_BATCH_SIZE,
+        timeout: float = 60,
+    ):
+        self.store = Path(store).expanduser()
+        self.workers = workers
+        self.max_connections = max_connections
+        self.limiter = PolitenessLimiter(max_connections, delay)
+        self.force = force
+        self.session = session or get_session()
+        self.batch_rows = batch_rows
+        self.timeout = timeout
+        self.cache_dir = self.store / PAGE_CACHE_NAME
+        self.manifest = RenderManifest(self.store / BACKFILL_MANIFEST_NAME)
+
+    def download(self, url: str):
+        """Stream ``url`` into the page cache; returns the file and a content digest"""
+        path = self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]}.html"
+        partial = path.with_suffix(".part")
+        digest = hashlib.sha256()
+        with self.limiter.slot(), span("http.get", "remote", url=url):
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                with open(partial, "w", encoding="utf-8") as page:
+                    for chunk in iter_body(response, url):
+                        page.write(chunk)
+                        digest.update(chunk.encode("utf-8"))
+        os.replace(partial, path)
+        return path, digest.hexdigest()
+
+    def run(self, years: Sequence[int]) -> BackfillResult:
+        """Backfill every archive page reachable from the given years"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        result = BackfillResult()
+        loader = _Loader(self.store, self.manifest, self.batch_rows)
+        seen = set()
+        pending: Dict[Future, tuple] = {}
+
+        print(f"🗄️  Backfilling {len(years)} archive years into {self.store}")
+        downloads = ThreadPoolExecutor(max_workers=self.max_connections)
+        parsers = ProcessPoolExecutor(max_workers=self.workers) if self.workers != 1 else None
+        try:
+
+            def fetch(url: str, kind: str) -> None:
+                seen.add(url)
+                pending[downloads.submit(self.download, url)] = ("download", kind, url, None)
+
+            for url in year_urls(years):
+                fetch(url, "index")
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step, kind, url, downloaded = pending.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as exc:  # one bad page must not stop the backfill
+                        print(f"   ⚠️ Failed to {step} {url}: {exc}")
+                        result.failed.append(url)
+                        continue
+
+                    if step == "parse":
+                        path, digest = downloaded
+                        loader.add(url, digest, path, outcome)
+                        result.pages += 1
+                        continue
+
+                    path, digest = outcome
+                    if kind == "index":
+                        html = path.read_text(encoding="utf-8")
+                        for link in archive_links(html, url):
+                            if link in seen:
+                                continue
+                            if not self.force and link in self.manifest.entries:
+                                seen.add(link)
+                                result.skipped += 1
+                                continue
+                            fetch(link, "page")
+                        if not self.force and self.manifest.is_current(url, digest):
+                            path.unlink(missing_ok=True)
+                            result.skipped += 1
+                            continue
+
+                    submit = parsers.submit if parsers else _completed
+                    pending[submit(parse_archive_page, str(path))] = ("parse", kind, url, outcome)
+        finally:
+            downloads.shutdown(cancel_futures=True)
+            if parsers:
+                parsers.shutdown(cancel_futures=True)
+            loader.flush()
+
+        result.rows = loader.rows
+        return result
+
+
+def backfill_archive(years: Sequence[int], store, **options) -> BackfillResult:
+    """Load the Rochester archive pages for ``years`` into the Parquet store at ``store``"""
+    return ArchiveBackfill(store, **options).run(years)
@@ -4,134 +4,85 @@ ASTRA: Autonomous System for Theoretical & Research Astronomy
 TNS-LESS Discovery Engine v1.1 (Fixed)
 """
 
-import re
 from datetime import datetime
 
-import astropy.units as u
 import numpy as np
 import pandas as pd
 import requests
-from astropy.coordinates import SkyCoord
-from bs4 import BeautifulSoup
+
+from .cassette import recorded_table
+from .http_client import ROCHESTER_URL, endpoint, endpoint_overridden, iter_body
+from .identity import merge_transients
+from .metrics import ERRORS, REMOTE_QUERIES, record_rows
+from .rochester_stream import RochesterStreamParser, iter_rochester_records, text_chunks
+from .telemetry import stage
+from .tracing import span
+from .transient_schema import transient_frame
+
+# Entries must read "AT2025abc = ... discovered"; declinations stop at a quote
+ENTRY_PATTERN = r"(AT\d{4}[\w]+)\s*=.*?\s+discovered\s+(\d{4}/\d{2}/\d{2})"
+DEC_PATTERN = r"Decl\.\s*=\s*([\+\-\d\s\.]+)"
+
+
+def _gaia_client():
+    """astroquery Gaia client, pointed at ASTRA_GAIA_URL when that is set"""
+    if not endpoint_overridden("gaia"):
+        from astroquery.gaia import Gaia
+
+        return Gaia
+
+    from astroquery.gaia import GaiaClass
+
+    url = endpoint("gaia")
+    return GaiaClass(gaia_tap_server=url, gaia_data_server=url, show_server_messages=False)
 
 
 class AstraDiscoveryEngine:
     """Main discovery engine for autonomous transient analysis"""
 
-    def __init__(self):
+    def __init__(self, alias_index=None):
         self.transients = pd.DataFrame()
         self.anomalies = []
+        # Shared with a catalog store so aliases it has seen merge here too
+        self.alias_index = alias_index
 
-    def scrape_rochester_page(self):
-        """Scrape the Rochester Supernova page for recent transients"""
-        print("🌐 Scraping Rochester Astronomy Supernova page...")
+    def _rochester_parser(self):
+        return RochesterStreamParser(ENTRY_PATTERN, DEC_PATTERN)
 
-        url = "http://www.rochesterastronomy.org/supernova.html"
-        response = requests.get(url, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find all tables
-        tables = soup.find_all("table")
-        print(f"   Found {len(tables)} tables")
-
-        transients = []
-
-        # Look for tables with transient data
-        for i, table in enumerate(tables):
-            rows = table.find_all("tr")
-            if len(rows) < 2:
-                continue
-
-            # Check if this looks like a transient table
-            first_row = rows[0].get_text()
-            if "Name" in first_row and "Mag" in first_row:
-                print(f"   ✓ Table {i} looks like transient data ({len(rows)} rows)")
-
-                # Parse data rows
-                for row in rows[1:]:
-                    cols = row.find_all(["td", "th"])
-                    if len(cols) < 3:
-                        continue
-
-                    try:
-                        # Extract data
-                        name = cols[0].get_text(strip=True) if len(cols) > 0 else ""
-                        mag_str = cols[1].get_text(strip=True) if len(cols) > 1 else ""
-                        obj_type = cols[2].get_text(strip=True) if len(cols) > 2 else ""
-
-                        # Clean magnitude
-                        mag = None
-                        if mag_str and mag_str != "-":
-                            mag_match = re.search(r"([\d\.]+)", mag_str)
-                            if mag_match:
-                                mag = float(mag_match.group(1))
-
-                        # Only keep if it looks like a transient
-                        if name and name.startswith(("AT", "SN")):
-                            transients.append(
-                                {
-                                    "id": name,
-                                    "mag": mag,
-                                    "type": obj_type,
-                                    "source": f"Rochester_Table_{i}",
-                                }
-                            )
-                    except Exception as exc:
-                        print(f"   ✗ Failed to parse Rochester row: {exc}")
-
-        # Also try to find individual transient entries in the page
-        text = soup.get_text()
-
-        # Pattern for individual transient entries
-        pattern = r"(AT\d{4}[\w]+)\s*=.*?\s+discovered\s+(\d{4}/\d{2}/\d{2})"
-        matches = re.findall(pattern, text)
-
-        if matches:
-            print(f"   ✓ Found {len(matches)} individual transient entries")
-
-            for match in matches[:100]:  # Limit to first 100 to avoid duplicates
-                transient_id, date = match
-
-                # Find more details around this match
-                idx = text.find(transient_id)
-                context = text[idx - 200 : idx + 400]
-
-                # Extract magnitude
-                mag_match = re.search(r"Mag\s+([\d\.]+)", context)
-                mag = float(mag_match.group(1)) if mag_match else None
-
-                # Extract type
-                type_match = re.search(r"Type\s+([\w\?]+)", context)
-                obj_type = type_match.group(1) if type_match else "unknown"
-
-                # Extract RA/Dec
-                ra_match = re.search(r"R\.A\.\s*=\s*([\dhms\.]+)", context)
-                dec_match = re.search(r"Decl\.\s*=\s*([\+\-\d\s\.]+)", context)
-                ra = ra_match.group(1) if ra_match else None
-                dec = dec_match.group(1) if dec_match else None
-
-                transients.append(
-                    {
-                        "id": transient_id,
-                        "date": date,
-                        "mag": mag,
-                        "type": obj_type,
-                        "ra": ra,
-                        "dec": dec,
-                        "source": "Rochester_Entries",
-                    }
-                )
+    def _parse_rochester_html(self, html):
+        """Extract transient records from the Rochester page markup"""
+        return list(iter_rochester_records(text_chunks(html), self._rochester_parser()))
+
+    def scrape_rochester_page(self, html=None):
+        """Scrape the Rochester Supernova page for recent transients
+
+        ``html`` skips the download and parses an already fetched page.
+        """
+        print("🌐 Scraping Rochester Astronomy Supernova page...")
 
-        df = pd.DataFrame(transients)
+        # The body is streamed into the parser, so a download and its parsing are
+        # one stage; an already fetched page (watch mode) is only parsed
+        with stage("parse" if html is not None else "fetch+parse"):
+            if html is None:
+                response = requests.get(ROCHESTER_URL, timeout=30, stream=True)
+                chunks = iter_body(response, ROCHESTER_URL)
+            else:
+                chunks = text_chunks(html)
+            parser = self._rochester_parser()
+            df = transient_frame(iter_rochester_records(chunks, parser))
+        print(f"   Found {parser.tables} tables")
+        for index, rows in parser.transient_tables.items():
+            print(f"   ✓ Table {index} looks like transient data ({rows + 1} rows)")
+        if parser.entries:
+            print(f"   ✓ Found {parser.entries} individual transient entries")
+
+        record_rows(df)
         print(f"   📊 Total transients collected: {len(df)}")
 
         if not df.empty:
-            # Remove duplicates, keeping the one with most info
-            df = df.sort_values(
-                "source",
-                key=lambda x: x.map({"Rochester_Entries": 1, "Rochester_Table_1": 0}),
-            )
-            df = df.drop_duplicates("id", keep="first")
+            # One row per object, filling each field from the best source that has it
+            with stage("dedup"):
+                df = merge_transients(df, self.alias_index)
 
             print(f"   📊 After deduplication: {len(df)} transients")
 
@@ -148,6 +99,7 @@ class AstraDiscoveryEngine:
 
         return df
 
+    @stage("cross-match")
     def cross_match_with_gaia(self, transients, radius=5.0):
         """Cross-match transients with Gaia DR3 for proper motion/distance"""
         # Only cross-match if we have coordinates
@@ -163,7 +115,11 @@ class AstraDiscoveryEngine:
 
         print(f"🔭 Cross-matching {len(has_coords)} objects with Gaia DR3...")
 
-        from astroquery.gaia import Gaia
+        # Heavy imports are deferred so the CLI starts quickly
+        import astropy.units as u
+        from astropy.coordinates import SkyCoord
+
+        Gaia = _gaia_client()
 
         results = []
 
@@ -173,8 +129,15 @@ class AstraDiscoveryEngine:
                 coord = SkyCoord(row["ra"], row["dec"], unit=(u.hourangle, u.deg))
 
                 # Query Gaia
-                job = Gaia.cone_search_async(coord, radius * u.arcsec)
-                gaia_results = job.get_results()
+                REMOTE_QUERIES.inc(service="gaia")
+                with span("gaia.cone_search", "remote", id=row["id"]):
+                    gaia_results = recorded_table(
+                        "gaia",
+                        f"{coord.ra.deg:.6f} {coord.dec.deg:+.6f} {radius}",
+                        lambda: Gaia.cone_search_async(
+                            coord, radius=radius * u.arcsec
+                        ).get_results(),
+                    )
 
                 if len(gaia_results) > 0:
                     # Found Gaia match
@@ -205,6 +168,7 @@ class AstraDiscoveryEngine:
                     results.append({"id": row["id"], "gaia_match": False})
 
             except Exception as e:
+                ERRORS.inc(component="gaia")
                 print(f"   ✗ {row['id']}: Error - {e}")
                 results.append({"id": row["id"], "gaia_match": False, "error": str(e)})
 
@@ -250,6 +214,7 @@ class AstraDiscoveryEngine:
 
         return score, reasons
 
+    @stage("score")
     def find_anomalies(self, transients):
         """Identify anomalous transients"""
         print("🔍 Finding anomalies...")
@@ -282,6 +247,7 @@ class AstraDiscoveryEngine:
 
         return anomalies
 
+    @stage("report")
     def generate_discovery_report(self, anomalies):
         """Generate formatted discovery report"""
         report = []
@@ -311,9 +277,12 @@ class AstraDiscoveryEngine:
             if "ra" in obj and obj["ra"]:
                 report.append(f"   Position: {obj['ra']} {obj.get('dec', '')}")
 
-            if "gaia_match" in obj:
+            # Objects without coordinates were never cross-matched (NaN after the merge)
+            if "gaia_match" in obj and pd.notna(obj["gaia_match"]):
                 if obj["gaia_match"]:
-                    report.append(f"   Gaia: Match found (G={obj.get('g_mag', 'N/A'):.1f})")
+                    g_mag = obj.get("g_mag")
+                    g_text = f"{g_mag:.1f}" if pd.notna(g_mag) else "N/A"
+                    report.append(f"   Gaia: Match found (G={g_text})")
                     if pd.notna(obj.get("parallax")):
                         dist = 1.0 / obj["parallax"] * 1000 if obj["parallax"] > 0 else None
                         if dist:
@@ -325,13 +294,13 @@ class AstraDiscoveryEngine:
 
         return "\n".join(report)
 
-    def run_discovery_pipeline(self, days=7):
-        """Run the complete discovery pipeline"""
+    def run_discovery_pipeline(self, days=7, html=None):
+        """Run the complete discovery pipeline (on ``html`` if already fetched)"""
         print("🚀 ASTRA Discovery Pipeline Starting...")
         print("=" * 60)
 
         # Phase 1: Collect data
-        transients = self.scrape_rochester_page()
+        transients = self.scrape_rochester_page(html)
 
         if transients.empty:
             print("❌ No transients found. Aborting.")
@@ -10,6 +10,9 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+from .identity import merge_transients
+from .transient_schema import normalize_transients
+
 
 def scrape_bright_transient_survey():
     """Scrape Bright Transient Survey data from public sources"""
@@ -108,7 +111,7 @@ def get_all_bright_transients():
 
     df = pd.DataFrame(all_data)
     if not df.empty:
-        df = df.drop_duplicates("id")
+        df = merge_transients(normalize_transients(df))
         print(f"   ✓ Found {len(df)} bright transients (m < 17)")
 
     return df
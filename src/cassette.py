@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+ASTRA: HTTP Cassettes
+Record upstream responses once, then replay them for deterministic offline runs
+"""
+
+import hashlib
+import io
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .metrics import record_cache
+
+CASSETTE_FORMAT_VERSION = 1
+INDEX_FILENAME = "cassette.json"
+MODES = ("record", "replay")
+LATENCIES = ("zero", "recorded")
+
+# Bodies are stored decoded, so transfer headers would no longer be true
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection"}
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Replay found no recorded response for a request"""
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _body_bytes(body) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    # Streamed uploads cannot be read twice; key them by type only
+    return type(body).__name__.encode("utf-8")
+
+
+def request_key(method: str, url: str, body=None) -> str:
+    """Stable key for a request: method, URL with sorted query, body digest"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    normalized = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+    return f"{method.upper()} {normalized} {_digest(_body_bytes(body))[:16]}"
+
+
+_active: Optional["Cassette"] = None
+
+
+class Cassette:
+    """A directory of recorded upstream responses
+
+    In ``record`` mode every response that goes through ``requests`` (the
+    shared session, plain ``requests.get`` calls and astroquery's SIMBAD,
+    NED and VizieR clients) is saved, along with any query registered via
+    :func:`recorded_table` (Gaia TAP). In ``replay`` mode the same requests
+    are answered from disk, instantly or after the recorded latency, and a
+    request that was never recorded raises :class:`CassetteMiss`.
+
+    Repeated identical requests replay their recorded responses in order and
+    then keep returning the last one, so polling loops replay faithfully.
+    """
+
+    def __init__(self, directory, mode: str = "replay", latency: str = "zero"):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+        if latency not in LATENCIES:
+            raise ValueError(f"latency must be one of {LATENCIES}, not {latency!r}")
+        self.directory = Path(directory).expanduser()
+        self.mode = mode
+        self.latency = latency
+        self.interactions: List[Dict] = []
+        self._by_key: Dict[str, List[Dict]] = {}
+        self._played: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._original_send = None
+
+        if mode == "replay":
+            self._load()
+
+    def __enter__(self) -> "Cassette":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _load(self) -> None:
+        index_path = self.directory / INDEX_FILENAME
+        if not index_path.exists():
+            raise FileNotFoundError(f"No cassette at {self.directory} ({INDEX_FILENAME} missing)")
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        if index.get("format") != CASSETTE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported cassette format: {index.get('format')!r}")
+        for interaction in index["interactions"]:
+            self._add(interaction)
+
+    def _add(self, interaction: Dict) -> None:
+        self.interactions.append(interaction)
+        self._by_key.setdefault(interaction["key"], []).append(interaction)
+
+    def start(self) -> None:
+        """Route HTTP traffic through this cassette"""
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another cassette is already active")
+        original = HTTPAdapter.send
+        cassette = self
+
+        def send(adapter, request, **kwargs):
+            return cassette._send(original, adapter, request, **kwargs)
+
+        self._original_send = original
+        HTTPAdapter.send = send
+        _active = self
+
+    def stop(self) -> None:
+        """Restore direct HTTP access; a recording cassette writes its index"""
+        global _active
+        if self._original_send is not None:
+            HTTPAdapter.send = self._original_send
+            self._original_send = None
+        if _active is self:
+            _active = None
+        if self.mode == "record":
+            self.save()
+
+    def save(self) -> Path:
+        """Write the interaction index next to the stored bodies"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index = {
+            "format": CASSETTE_FORMAT_VERSION,
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "interactions": self.interactions,
+        }
+        path = self.directory / INDEX_FILENAME
+        path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        return path
+
+    def _store_body(self, data: bytes) -> str:
+        name = f"bodies/{_digest(data)}"
+        path = self.directory / name
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        return name
+
+    def _record(self, interaction: Dict, body: bytes) -> None:
+        with self._lock:
+            interaction["body"] = self._store_body(body)
+            self._add(interaction)
+
+    def _next(self, key: str, description: str) -> Dict:
+        with self._lock:
+            recorded = self._by_key.get(key)
+            if not recorded:
+                record_cache("cassette", False)
+                raise CassetteMiss(f"No recorded response for {description} in {self.directory}")
+            played = self._played.get(key, 0)
+            self._played[key] = played + 1
+        record_cache("cassette", True)
+        interaction = recorded[min(played, len(recorded) - 1)]
+        if self.latency == "recorded":
+            time.sleep(interaction.get("elapsed", 0.0))
+        return interaction
+
+    def _body(self, interaction: Dict) -> bytes:
+        return (self.directory / interaction["body"]).read_bytes()
+
+    def _send(self, original, adapter, request, **kwargs) -> requests.Response:
+        key = request_key(request.method, request.url, request.body)
+        if self.mode == "replay":
+            return self._replay_response(
+                self._next(key, f"{request.method} {request.url}"), request
+            )
+
+        started = time.perf_counter()
+        response = original(adapter, request, **kwargs)
+        body = response.content
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+        self._record(
+            {
+                "key": key,
+                "kind": "http",
+                "method": request.method,
+                "url": request.url,
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": headers,
+                "elapsed": time.perf_counter() - started,
+            },
+            body,
+        )
+        return response
+
+    def _replay_response(self, interaction: Dict, request) -> requests.Response:
+        body = self._body(interaction)
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason")
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=interaction.get("elapsed", 0.0))
+        response.raw = io.BytesIO(body)
+        response._content = body
+        return response
+
+    def call(self, service: str, key: str, fetch: Callable[[], bytes]) -> bytes:
+        """Record or replay a non-HTTP query whose result serializes to bytes"""
+        key = f"{service.upper()} {key}"
+        if self.mode == "replay":
+            return self._body(self._next(key, key))
+
+        started = time.perf_counter()
+        data = fetch()
+        self._record({"key": key, "kind": "call", "elapsed": time.perf_counter() - started}, data)
+        return data
+
+
+def active_cassette() -> Optional[Cassette]:
+    """The cassette currently routing traffic, if any"""
+    return _active
+
+
+def recorded_table(service: str, key: str, query: Callable):
+    """Run an astroquery query returning an astropy Table, through the active cassette
+
+    Gaia TAP queries bypass ``requests``, so their result tables are stored
+    as VOTables under ``service`` and ``key`` instead.
+    """
+    cassette = _active
+    if cassette is None:
+        return query()
+
+    from astropy.table import Table
+
+    def fetch() -> bytes:
+        buffer = io.BytesIO()
+        query().write(buffer, format="votable")
+        return buffer.getvalue()
+
+    return Table.read(io.BytesIO(cassette.call(service, key, fetch)), format="votable")
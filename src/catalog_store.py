@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Catalog Store
+Date-partitioned Parquet catalogs with typed columns and pruned reads
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .coordinates import parse_ra_dec
+from .identity import ALIAS_INDEX_NAME, AliasIndex
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+PARTITION_COLUMN = "discovery_date"
+INSTALL_HINT = "pip install 'astra-discoveries[parquet]'"
+
+# Storage dtypes for every catalog column, in file order
+CATALOG_DTYPES: Dict[str, str] = {
+    "id": "string",
+    "date": "datetime64[s]",
+    "type": "category",
+    "source": "category",
+    "mag": "float32",
+    "mag_corrected": "float32",
+    "ebv": "float32",
+    "score": "float32",
+    "ra": "string",
+    "dec": "string",
+    "ra_deg": "float64",
+    "dec_deg": "float64",
+    "distance_mpc": "float64",
+    "redshift": "float64",
+    "ingested_at": "datetime64[s, UTC]",
+}
+
+DateLike = Union[str, date, datetime]
+
+
+def _require_pyarrow() -> None:
+    if not PYARROW_AVAILABLE:
+        raise ImportError(f"Parquet catalogs need pyarrow ({INSTALL_HINT})")
+
+
+def _arrow_schema() -> "pa.Schema":
+    category = pa.dictionary(pa.int32(), pa.string())
+    types = {
+        "string": pa.string(),
+        "category": category,
+        "float32": pa.float32(),
+        "float64": pa.float64(),
+        "datetime64[s]": pa.timestamp("s"),
+        "datetime64[s, UTC]": pa.timestamp("s", tz="UTC"),
+    }
+    fields = [pa.field(name, types[dtype]) for name, dtype in CATALOG_DTYPES.items()]
+    return pa.schema(fields + [pa.field(PARTITION_COLUMN, pa.string())])
+
+
+def _iso_date(value: DateLike) -> str:
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def typed_catalog(
+    transients: pd.DataFrame,
+    anomalies: Optional[Sequence[Dict]] = None,
+    ingested_at: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """Catalog frame with storage dtypes and a ``discovery_date`` partition column
+
+    Anomaly scores are joined on ``id``; coordinates are also stored in
+    degrees. Rows without a reported discovery date are filed under the
+    ingestion date. Columns outside ``CATALOG_DTYPES`` are dropped.
+    """
+    ingested_at = ingested_at or datetime.now(timezone.utc)
+    df = transients.copy()
+
+    if anomalies and "id" in df.columns:
+        df["score"] = df["id"].map({anomaly["id"]: anomaly["score"] for anomaly in anomalies})
+    if "ra" in df.columns and "dec" in df.columns and "ra_deg" not in df.columns:
+        df["ra_deg"], df["dec_deg"] = parse_ra_dec(df["ra"], df["dec"])
+    if "date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], format="%Y/%m/%d", errors="coerce")
+    df["ingested_at"] = pd.Timestamp(ingested_at).tz_convert("UTC")
+
+    catalog = pd.DataFrame(index=df.index)
+    for column, dtype in CATALOG_DTYPES.items():
+        values = df[column] if column in df.columns else pd.Series(np.nan, index=df.index)
+        if dtype.startswith("float"):
+            values = pd.to_numeric(values, errors="coerce")
+        elif dtype == "datetime64[s]":
+            values = pd.to_datetime(values, errors="coerce")
+        elif dtype == "string":
+            values = values.where(values.notna(), None)
+        catalog[column] = values.astype(dtype)
+
+    dates = catalog["date"].dt.strftime("%Y-%m-%d")
+    catalog[PARTITION_COLUMN] = dates.fillna(_iso_date(ingested_at)).astype("string")
+    return catalog.reset_index(drop=True)
+
+
+def write_catalog(
+    transients: pd.DataFrame,
+    root,
+    anomalies: Optional[Sequence[Dict]] = None,
+    ingested_at: Optional[datetime] = None,
+) -> Path:
+    """Append a run's transients to the Parquet store at ``root``
+
+    The store is a hive-partitioned dataset (``discovery_date=YYYY-MM-DD/``);
+    each run adds its own files, so nothing already stored is rewritten.
+    Designations listed in an ``aliases`` column are added to the store's
+    alias index.
+    """
+    _require_pyarrow()
+    ingested_at = ingested_at or datetime.now(timezone.utc)
+    catalog = typed_catalog(transients, anomalies, ingested_at)
+    root = Path(root).expanduser()
+    root.mkdir(parents=True, exist_ok=True)
+    aliases = AliasIndex(root / ALIAS_INDEX_NAME)
+    if aliases.update(transients):
+        aliases.save()
+    if catalog.empty:
+        return root
+
+    table = pa.Table.from_pandas(catalog, schema=_arrow_schema(), preserve_index=False)
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=[PARTITION_COLUMN],
+        partitioning_flavor="hive",
+        basename_template=f"run-{ingested_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return root
+
+
+def load_catalog(
+    root,
+    columns: Optional[List[str]] = None,
+    start: Optional[DateLike] = None,
+    end: Optional[DateLike] = None,
+    types: Optional[Sequence[str]] = None,
+    max_mag: Optional[float] = None,
+    latest: bool = True,
+) -> pd.DataFrame:
+    """Read the Parquet store, touching only the partitions and columns needed
+
+    Parameters
+    ----------
+    root : str or Path
+        Store directory written by :func:`write_catalog`.
+    columns : list of str, optional
+        Columns to read; all catalog columns when omitted.
+    start, end : str, date or datetime, optional
+        Inclusive discovery-date range. Partitions outside it are never opened.
+    types : sequence of str, optional
+        Keep only these exact object types.
+    max_mag : float, optional
+        Keep only objects at least this bright. Row groups whose magnitude
+        statistics rule them out are skipped.
+    latest : bool, default True
+        Keep only the most recently ingested matching row per object. Runs
+        overlap, so the store holds one row per sighting; designations of
+        the same object (see the store's alias index) count as one.
+
+    Returns
+    -------
+    catalog : pandas.DataFrame
+    """
+    _require_pyarrow()
+    schema = _arrow_schema()
+    dataset = ds.dataset(
+        Path(root).expanduser(),
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([schema.field(PARTITION_COLUMN)]), flavor="hive"),
+    )
+
+    conditions = []
+    if start is not None:
+        conditions.append(ds.field(PARTITION_COLUMN) >= _iso_date(start))
+    if end is not None:
+        conditions.append(ds.field(PARTITION_COLUMN) <= _iso_date(end))
+    if types is not None:
+        conditions.append(ds.field("type").cast(pa.string()).isin(list(types)))
+    if max_mag is not None:
+        conditions.append(ds.field("mag") <= max_mag)
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    wanted = list(columns) if columns is not None else schema.names
+    read = wanted + [name for name in ("id", "ingested_at") if latest and name not in wanted]
+    frame = dataset.to_table(columns=read, filter=expression).to_pandas()
+
+    if latest and not frame.empty:
+        keys = AliasIndex(Path(root).expanduser() / ALIAS_INDEX_NAME).keys_for(frame["id"])
+        frame = frame.assign(_key=keys).sort_values("ingested_at", kind="stable")
+        frame = frame.drop_duplicates("_key", keep="last").sort_index()
+    return frame[wanted].reset_index(drop=True)
@@ -11,6 +11,11 @@ from typing import Dict, List, Optional
 import pandas as pd
 import requests
 
+from .http_client import endpoint
+from .metrics import ERRORS, REMOTE_QUERIES
+from .telemetry import stage
+from .tracing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +50,7 @@ class ClassificationEngine:
             "active_galaxy": ["agn", "quasar", "blazar"],
         }
 
+    @stage("classify")
     def classify_transient(self, transient_id: str, transient_data: Dict) -> Dict:
         """
         Comprehensive classification of a single transient.
@@ -182,7 +188,7 @@ class ClassificationEngine:
 
         try:
             # Query NED for objects at this position
-            ned_url = "https://ned.ipac.caltech.edu/cgi-bin/objsearch"
+            ned_url = endpoint("ned")
             params = {
                 "search_type": "Near Position Search",
                 "lon": ra,
@@ -194,7 +200,9 @@ class ClassificationEngine:
                 "of": "json",
             }
 
-            response = requests.get(ned_url, params=params, timeout=60)
+            REMOTE_QUERIES.inc(service="ned")
+            with span("ned.objsearch", "remote"):
+                response = requests.get(ned_url, params=params, timeout=60)
 
             if response.status_code == 200:
                 ned_data = response.json()
@@ -228,6 +236,7 @@ class ClassificationEngine:
                     result["evidence"].append("No host detected - could be distant SN")
 
         except Exception as e:
+            ERRORS.inc(component="ned")
             logger.error(f"Error in host galaxy analysis: {e}")
             result["evidence"].append("Host galaxy analysis failed (network error)")
 
@@ -243,7 +252,7 @@ class ClassificationEngine:
 
         try:
             # Use VSX (AAVSO) catalog via VizieR
-            vizier_url = "http://vizier.u-strasbg.fr/viz-bin/votable"
+            vizier_url = endpoint("vizier")
 
             # This is a simplified query - would need proper coordinates
             if "ra" in transient_data and "dec" in transient_data:
@@ -254,7 +263,9 @@ class ClassificationEngine:
                     "-out.max": 1,
                 }
 
-                response = requests.get(vizier_url, params=params, timeout=30)
+                REMOTE_QUERIES.inc(service="vizier")
+                with span("vizier.vsx", "remote"):
+                    response = requests.get(vizier_url, params=params, timeout=30)
 
                 if response.status_code == 200 and "TABLE" in response.text:
                     result["type"] = "known_variable"
@@ -266,6 +277,7 @@ class ClassificationEngine:
                     result["confidence"] = 0.3
 
         except Exception as e:
+            ERRORS.inc(component="vizier")
             logger.error(f"Error in variable star matching: {e}")
 
         return result
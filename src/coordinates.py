@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Coordinates
+Vectorized parsing of sexagesimal coordinates and frame conversion
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# "22h28m51.54s", "+53d17m43.1s", "+41 12 11", "-05:23:28", "83.633"
+SEXAGESIMAL_PATTERN = (
+    r"^\s*(?P<sign>[+-]?)\s*(?P<first>\d+(?:\.\d*)?)"
+    r"(?:\s*[hd:°\s]\s*(?P<second>\d+(?:\.\d*)?))?"
+    r"(?:\s*[m:'\s]\s*(?P<third>\d+(?:\.\d*)?))?"
+    r"\s*[s\"']?\s*$"
+)
+
+# ICRS (J2000) to Galactic rotation matrix
+ICRS_TO_GALACTIC = np.array(
+    [
+        [-0.0548755604162154, -0.8734370902348850, -0.4838350155487132],
+        [0.4941094278755837, -0.4448296299600112, 0.7469822444972189],
+        [-0.8676661490190047, -0.1980763734312015, 0.4559837761750669],
+    ]
+)
+
+
+def parse_sexagesimal(values, hours: bool = False) -> np.ndarray:
+    """Parse an array of sexagesimal strings to decimal degrees
+
+    Single numbers without separators are taken as decimal degrees. With
+    ``hours`` set, sexagesimal values are hours of right ascension. Strings
+    that cannot be parsed (and missing values) become NaN.
+    """
+    strings = pd.Series(values, dtype=object).astype("string")
+    parts = strings.str.extract(SEXAGESIMAL_PATTERN)
+    first = pd.to_numeric(parts["first"], errors="coerce").to_numpy(dtype=np.float64)
+    second = pd.to_numeric(parts["second"], errors="coerce").to_numpy(dtype=np.float64)
+    third = pd.to_numeric(parts["third"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+
+    sexagesimal = ~np.isnan(second)
+    value = np.where(sexagesimal, first + np.nan_to_num(second) / 60.0 + third / 3600.0, first)
+    if hours:
+        value = np.where(sexagesimal, value * 15.0, value)
+    sign = np.where(parts["sign"].fillna("").to_numpy(dtype=object) == "-", -1.0, 1.0)
+    return sign * value
+
+
+def parse_ra_dec(ra, dec) -> Tuple[np.ndarray, np.ndarray]:
+    """Right ascension (hours) and declination strings to degree arrays"""
+    return parse_sexagesimal(ra, hours=True), parse_sexagesimal(dec)
+
+
+def icrs_to_galactic(ra_deg, dec_deg) -> Tuple[np.ndarray, np.ndarray]:
+    """Galactic longitude and latitude (degrees) for arrays of ICRS coordinates"""
+    ra = np.radians(np.asarray(ra_deg, dtype=np.float64))
+    dec = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    cos_dec = np.cos(dec)
+    xyz = np.stack([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)])
+
+    x, y, z = np.tensordot(ICRS_TO_GALACTIC, xyz, axes=1)
+    gal_l = np.degrees(np.arctan2(y, x)) % 360.0
+    gal_b = np.degrees(np.arcsin(np.clip(z, -1.0, 1.0)))
+    return gal_l, gal_b
@@ -5,9 +5,13 @@ Discovery Framework v2.0 - Operational without direct API access
 """
 
 import json
-import math
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .distances import estimate_distances
+from .magnitude_stats import MagnitudeStats
 
 
 class AstraDiscoveryEngine:
@@ -97,53 +101,53 @@ class AstraDiscoveryEngine:
 
     def calculate_distance_estimate(self, magnitude: float, obj_type: str) -> Dict:
         """Estimate distance based on absolute magnitude assumptions"""
-        # Simplified distance modulus: m - M = 5*log10(d/10pc)
-
-        abs_mags = {
-            "CV": 7.5,  # Typical CV absolute magnitude
-            "SN": -19.0,  # Typical supernova
-            "GRB": -25.0,  # GRB afterglow (highly variable)
-            "unknown": -15.0,  # Conservative estimate
-        }
-
-        m_abs = abs_mags.get(obj_type.replace("?", ""), abs_mags["unknown"])
-        distance_pc = 10 * math.pow(10, (magnitude - m_abs) / 5)
-        distance_kpc = distance_pc / 1000
-        distance_mpc = distance_kpc / 1000
+        # Distance modulus m - M, inverted through a cosmology lookup table
+        estimate = estimate_distances([magnitude], [obj_type])
+        m_abs = float(estimate.absolute_magnitude[0])
+        distance_mpc = float(estimate.luminosity_distance_mpc[0])
 
         return {
-            "distance_pc": distance_pc,
-            "distance_kpc": distance_kpc,
+            "distance_pc": distance_mpc * 1e6,
+            "distance_kpc": distance_mpc * 1e3,
             "distance_mpc": distance_mpc,
+            "redshift": float(estimate.redshift[0]),
             "method": f"Assumed M={m_abs} for {obj_type}",
         }
 
-    def analyze_brightness_distribution(self) -> Dict:
-        """Statistical analysis of transient magnitudes"""
-        mags = [t["mag"] for t in self.transient_data]
-
-        if not mags:
+    def analyze_brightness_distribution(self, chunks: Optional[Iterable] = None) -> Dict:
+        """Statistical analysis of transient magnitudes
+
+        By default the loaded ``transient_data`` is analysed. Larger catalogs can
+        be streamed instead: ``chunks`` is an iterable of DataFrames (or lists
+        of transient dicts) with ``mag`` and ``type``, read in one pass. Each
+        chunk keeps its rows brighter than the running mean as outlier
+        candidates, which are filtered with the final mean and sigma.
+        """
+        if chunks is None:
+            chunks = [self.transient_data] if self.transient_data else []
+
+        stats = MagnitudeStats()
+        candidates = []
+        for chunk in chunks:
+            frame = pd.DataFrame(chunk)
+            if not len(frame):
+                continue
+            stats.update(frame)
+            mags = pd.to_numeric(frame["mag"], errors="coerce")
+            candidates.append(frame[(mags < stats.moments.mean).to_numpy()])
+
+        if stats.moments.count == 0:
             return {}
 
-        mean_mag = sum(mags) / len(mags)
-        variance = sum((x - mean_mag) ** 2 for x in mags) / len(mags)
-        std_mag = math.sqrt(variance)
-
-        # Identify bright outliers (>2 sigma brighter than mean)
-        bright_outliers = [
-            t
-            for t in self.transient_data
-            if (mean_mag - t["mag"]) > (self.anomaly_threshold * std_mag)
-        ]
+        # Identify bright outliers (>2.5 sigma brighter than mean)
+        bright_outliers = []
+        for frame in candidates:
+            mask = stats.bright_outlier_mask(frame["mag"], self.anomaly_threshold)
+            bright_outliers.extend(frame[mask].to_dict("records"))
 
-        return {
-            "mean_magnitude": mean_mag,
-            "std_magnitude": std_mag,
-            "min_magnitude": min(mags),
-            "max_magnitude": max(mags),
-            "bright_outliers": bright_outliers,
-            "total_objects": len(mags),
-        }
+        result = stats.summary()
+        result["bright_outliers"] = bright_outliers
+        return result
 
     def generate_discovery_report(self) -> str:
         """Generate formatted discovery report"""
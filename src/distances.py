@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Distance Estimates
+Vectorized luminosity distances and redshifts from apparent magnitudes
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Typical peak absolute magnitudes by transient type
+ABSOLUTE_MAGNITUDES = {
+    "CV": 7.5,  # Typical CV absolute magnitude
+    "SN": -19.0,  # Typical supernova
+    "GRB": -25.0,  # GRB afterglow (highly variable)
+    "Ia": -19.3,
+    "Ib": -17.5,
+    "Ic": -17.5,
+    "II": -17.0,
+    "IIP": -16.8,
+    "IIn": -18.5,
+    "Ibn": -19.0,
+    "LRN": -13.0,
+    "unknown": -15.0,  # Conservative estimate
+}
+
+SPEED_OF_LIGHT_KMS = 299792.458
+# Redshift range of the lookup table; nearer objects use the Euclidean limit
+LUT_MIN_REDSHIFT = 1e-5
+LUT_MAX_REDSHIFT = 20.0
+LUT_SIZE = 4096
+
+
+@dataclass
+class DistanceEstimates:
+    """Per-object distance estimates (arrays aligned with the input magnitudes)"""
+
+    absolute_magnitude: np.ndarray
+    distance_modulus: np.ndarray
+    luminosity_distance_mpc: np.ndarray
+    redshift: np.ndarray
+
+
+def absolute_magnitudes(types) -> np.ndarray:
+    """Assumed absolute magnitude for each type (uncertain types like "CV?" count)"""
+    if isinstance(getattr(types, "dtype", None), pd.CategoricalDtype):
+        # Look up each category once and broadcast through the codes
+        per_category = absolute_magnitudes(types.cat.categories.astype(str))
+        per_category = np.append(per_category, ABSOLUTE_MAGNITUDES["unknown"])
+        return per_category[types.cat.codes.to_numpy()]
+    labels = pd.Series(types, dtype=object).fillna("unknown").astype(str).str.replace("?", "")
+    return (
+        labels.map(ABSOLUTE_MAGNITUDES)
+        .fillna(ABSOLUTE_MAGNITUDES["unknown"])
+        .to_numpy(dtype=np.float64)
+    )
+
+
+@lru_cache(maxsize=None)
+def distance_modulus_table(cosmology: str = "Planck18") -> Tuple[np.ndarray, np.ndarray, float]:
+    """Distance modulus sampled on a log-redshift grid, computed once per cosmology
+
+    Returns ``(distance_modulus, log10_redshift, H0)``. Without astropy the
+    table is empty and only the Euclidean (Hubble-law) limit is available.
+    """
+    try:
+        from astropy import cosmology as astropy_cosmology
+    except ImportError:
+        print("   ⚠️ astropy not available, using Euclidean distances only")
+        return np.empty(0), np.empty(0), 70.0
+
+    model = getattr(astropy_cosmology, cosmology)
+    log_z = np.linspace(np.log10(LUT_MIN_REDSHIFT), np.log10(LUT_MAX_REDSHIFT), LUT_SIZE)
+    mu = model.distmod(10**log_z).value
+    return mu, log_z, float(model.H0.value)
+
+
+def redshift_from_distance_modulus(mu, cosmology: str = "Planck18") -> np.ndarray:
+    """Invert the distance modulus by interpolating the cosmology lookup table"""
+    mu = np.asarray(mu, dtype=np.float64)
+    table_mu, table_log_z, h0 = distance_modulus_table(cosmology)
+
+    # Hubble law below the table (and everywhere if astropy is missing)
+    distance_mpc = 10 ** (mu / 5.0 + 1.0) / 1e6
+    redshift = h0 * distance_mpc / SPEED_OF_LIGHT_KMS
+    if table_mu.size:
+        in_table = mu >= table_mu[0]
+        redshift = np.where(in_table, 10 ** np.interp(mu, table_mu, table_log_z), redshift)
+        redshift = np.where(mu > table_mu[-1], np.nan, redshift)
+    return redshift
+
+
+def estimate_distances(mags, types, cosmology: str = "Planck18") -> DistanceEstimates:
+    """Distance modulus, luminosity distance and redshift for arrays of objects
+
+    Parameters
+    ----------
+    mags : array-like
+        Apparent magnitudes; NaN propagates to every output.
+    types : array-like or None
+        Transient types used to look up ``ABSOLUTE_MAGNITUDES``.
+    cosmology : str
+        Name of an ``astropy.cosmology`` realization.
+    """
+    mags = np.asarray(mags, dtype=np.float64)
+    if types is None:
+        types = ["unknown"] * mags.size
+    m_abs = absolute_magnitudes(types)
+    mu = mags - m_abs
+    return DistanceEstimates(
+        absolute_magnitude=m_abs,
+        distance_modulus=mu,
+        luminosity_distance_mpc=10 ** (mu / 5.0 + 1.0) / 1e6,
+        redshift=redshift_from_distance_modulus(mu, cosmology),
+    )
+
+
+def add_distance_columns(transients: pd.DataFrame, cosmology: str = "Planck18") -> pd.DataFrame:
+    """Return a copy of a transients frame with ``distance_mpc`` and ``redshift`` columns
+
+    Extinction-corrected magnitudes (``mag_corrected``) are used when present.
+    """
+    transients = transients.copy()
+    if transients.empty or "mag" not in transients.columns:
+        return transients
+    mags = transients["mag"]
+    if "mag_corrected" in transients.columns:
+        mags = transients["mag_corrected"].fillna(mags)
+    types = transients["type"] if "type" in transients.columns else None
+    estimates = estimate_distances(mags, types, cosmology)
+    transients["distance_mpc"] = estimates.luminosity_distance_mpc
+    transients["redshift"] = estimates.redshift
+    return transients
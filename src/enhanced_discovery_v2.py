@@ -4,143 +4,75 @@ ASTRA: Enhanced Discovery Pipeline v2
 Works with available data (no coordinates required for basic scoring)
 """
 
-import re
+import importlib.util
 from datetime import datetime
 
 import numpy as np
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 
-try:
-    import astropy.units as u
-    from astropy.coordinates import SkyCoord
-    from astroquery.gaia import Gaia
-    from astroquery.simbad import Simbad
+from .distances import add_distance_columns
+from .extinction import add_extinction_columns, load_dust_map
+from .http_client import ROCHESTER_URL, iter_body
+from .identity import merge_transients
+from .metrics import record_rows
+from .rochester_stream import RochesterStreamParser, iter_rochester_records, text_chunks
+from .telemetry import stage
+from .transient_schema import transient_frame
 
-    ASTROPY_AVAILABLE = True
-except Exception as exc:
-    ASTROPY_AVAILABLE = False
-    print(f"⚠️  Astroquery not available, using basic mode ({exc})")
+# Only check that astroquery is installed; importing it slows down startup
+ASTROPY_AVAILABLE = importlib.util.find_spec("astroquery") is not None
+if not ASTROPY_AVAILABLE:
+    print("⚠️  Astroquery not available, using basic mode")
 
 
 class EnhancedDiscoveryEngineV2:
     """Enhanced discovery that works with available data"""
 
-    def __init__(self):
+    def __init__(self, alias_index=None):
         self.transients = pd.DataFrame()
         self.anomalies = []
+        self.dust_map = load_dust_map()
+        # Shared with a catalog store so aliases it has seen merge here too
+        self.alias_index = alias_index
 
-    def scrape_rochester_enhanced(self):
-        """Enhanced scraping with better pattern matching"""
+    def _rochester_parser(self):
+        return RochesterStreamParser()
+
+    def _parse_rochester_html(self, html):
+        """Extract transient records from the Rochester page markup"""
+        return list(iter_rochester_records(text_chunks(html), self._rochester_parser()))
+
+    def scrape_rochester_enhanced(self, html=None):
+        """Enhanced scraping with better pattern matching
+
+        ``html`` skips the download and parses an already fetched page.
+        """
         print("🌐 Scraping Rochester Astronomy Supernova page...")
 
-        url = "http://www.rochesterastronomy.org/supernova.html"
-        response = requests.get(url, timeout=30)
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Find all tables
-        tables = soup.find_all("table")
-        print(f"   Found {len(tables)} tables")
-
-        transients = []
-
-        # Look for tables with transient data
-        for i, table in enumerate(tables):
-            rows = table.find_all("tr")
-            if len(rows) < 2:
-                continue
-
-            # Check if this looks like a transient table
-            first_row = rows[0].get_text()
-            if "Name" in first_row and "Mag" in first_row:
-                print(f"   ✓ Table {i} looks like transient data ({len(rows)} rows)")
-
-                # Parse data rows
-                for row in rows[1:]:
-                    cols = row.find_all(["td", "th"])
-                    if len(cols) < 3:
-                        continue
-
-                    try:
-                        # Extract data
-                        name = cols[0].get_text(strip=True) if len(cols) > 0 else ""
-                        mag_str = cols[1].get_text(strip=True) if len(cols) > 1 else ""
-                        obj_type = cols[2].get_text(strip=True) if len(cols) > 2 else ""
-
-                        # Clean magnitude
-                        mag = None
-                        if mag_str and mag_str != "-":
-                            mag_match = re.search(r"([\d\.]+)", mag_str)
-                            if mag_match:
-                                mag = float(mag_match.group(1))
-
-                        # Only keep if it looks like a transient
-                        if name and name.startswith(("AT", "SN")):
-                            transients.append(
-                                {
-                                    "id": name,
-                                    "mag": mag,
-                                    "type": obj_type,
-                                    "source": f"Rochester_Table_{i}",
-                                }
-                            )
-                    except Exception as exc:
-                        print(f"   ✗ Failed to parse enhanced row: {exc}")
-
-        # Also try to find individual transient entries in the page
-        text = soup.get_text()
-
-        # Pattern for individual transient entries (more flexible)
-        pattern = r"(AT\d{4}[\w]+).*?discovered\s+(\d{4}/\d{2}/\d{2})"
-        matches = re.findall(pattern, text)
-
-        if matches:
-            print(f"   ✓ Found {len(matches)} individual transient entries")
-
-            for match in matches[:100]:  # Limit to first 100 to avoid duplicates
-                transient_id, date = match
-
-                # Find more details around this match
-                idx = text.find(transient_id)
-                context = text[idx - 200 : idx + 400]
-
-                # Extract magnitude
-                mag_match = re.search(r"Mag\s+([\d\.]+)", context)
-                mag = float(mag_match.group(1)) if mag_match else None
-
-                # Extract type
-                type_match = re.search(r"Type\s+([\w\?]+)", context)
-                obj_type = type_match.group(1) if type_match else "unknown"
-
-                # Extract RA/Dec if present
-                ra_match = re.search(r"R\.A\.\s*=\s*([\dhms\.]+)", context)
-                dec_match = re.search(r"Decl\.\s*=\s*([\+\-\d\s\.\']+)", context)
-                ra = ra_match.group(1) if ra_match else None
-                dec = dec_match.group(1) if dec_match else None
-
-                transients.append(
-                    {
-                        "id": transient_id,
-                        "date": date,
-                        "mag": mag,
-                        "type": obj_type,
-                        "ra": ra,
-                        "dec": dec,
-                        "source": "Rochester_Entries",
-                    }
-                )
-
-        df = pd.DataFrame(transients)
+        # The body is streamed into the parser, so a download and its parsing are
+        # one stage; an already fetched page (watch mode) is only parsed
+        with stage("parse" if html is not None else "fetch+parse"):
+            if html is None:
+                response = requests.get(ROCHESTER_URL, timeout=30, stream=True)
+                chunks = iter_body(response, ROCHESTER_URL)
+            else:
+                chunks = text_chunks(html)
+            parser = self._rochester_parser()
+            df = transient_frame(iter_rochester_records(chunks, parser))
+        print(f"   Found {parser.tables} tables")
+        for index, rows in parser.transient_tables.items():
+            print(f"   ✓ Table {index} looks like transient data ({rows + 1} rows)")
+        if parser.entries:
+            print(f"   ✓ Found {parser.entries} individual transient entries")
+
+        record_rows(df)
         print(f"   📊 Total transients collected: {len(df)}")
 
         if not df.empty:
-            # Remove duplicates, keeping the one with most info
-            df = df.sort_values(
-                "source",
-                key=lambda x: x.map({"Rochester_Entries": 1, "Rochester_Table_1": 0}),
-            )
-            df = df.drop_duplicates("id", keep="first")
+            # One row per object, filling each field from the best source that has it
+            with stage("dedup"):
+                df = merge_transients(df, self.alias_index)
 
             print(f"   📊 After deduplication: {len(df)} transients")
 
@@ -163,23 +95,26 @@ class EnhancedDiscoveryEngineV2:
         score = 0.0
         reasons = []
 
-        # Brightness scoring (more granular)
-        if pd.notna(row["mag"]):
-            if row["mag"] < 14.0:
+        # Brightness scoring (more granular), on extinction-corrected magnitudes if known
+        mag = row.get("mag_corrected")
+        if mag is None or pd.isna(mag):
+            mag = row["mag"]
+        if pd.notna(mag):
+            if mag < 14.0:
                 score += 5.0
-                reasons.append(f"Exceptionally bright (m={row['mag']:.1f})")
-            elif row["mag"] < 15.0:
+                reasons.append(f"Exceptionally bright (m={mag:.1f})")
+            elif mag < 15.0:
                 score += 4.0
-                reasons.append(f"Extremely bright (m={row['mag']:.1f})")
-            elif row["mag"] < 16.0:
+                reasons.append(f"Extremely bright (m={mag:.1f})")
+            elif mag < 16.0:
                 score += 3.0
-                reasons.append(f"Very bright (m={row['mag']:.1f})")
-            elif row["mag"] < 17.0:
+                reasons.append(f"Very bright (m={mag:.1f})")
+            elif mag < 17.0:
                 score += 2.0
-                reasons.append(f"Bright (m={row['mag']:.1f})")
-            elif row["mag"] > 21.0:
+                reasons.append(f"Bright (m={mag:.1f})")
+            elif mag > 21.0:
                 score += 2.0
-                reasons.append(f"Extremely faint (m={row['mag']:.1f})")
+                reasons.append(f"Extremely faint (m={mag:.1f})")
 
         # Type scoring
         type_scores = {
@@ -208,6 +143,7 @@ class EnhancedDiscoveryEngineV2:
 
         return score, reasons
 
+    @stage("score")
     def find_advanced_anomalies(self, transients):
         """Find anomalies using advanced scoring"""
         print("🔍 Finding advanced anomalies...")
@@ -232,6 +168,10 @@ class EnhancedDiscoveryEngineV2:
                     anomaly["ra"] = row["ra"]
                     anomaly["dec"] = row["dec"]
 
+                if "mag_corrected" in row and pd.notna(row["mag_corrected"]):
+                    anomaly["ebv"] = row["ebv"]
+                    anomaly["mag_corrected"] = row["mag_corrected"]
+
                 anomalies.append(anomaly)
 
         # Sort by score
@@ -240,6 +180,7 @@ class EnhancedDiscoveryEngineV2:
         print(f"   🎯 Found {len(anomalies)} advanced anomalies")
         return anomalies
 
+    @stage("report")
     def generate_advanced_report(self, anomalies):
         """Generate advanced discovery report"""
         report = []
@@ -322,18 +263,22 @@ class EnhancedDiscoveryEngineV2:
 
         return "\n".join(report)
 
-    def run_advanced_pipeline(self):
-        """Run the complete advanced discovery pipeline"""
+    def run_advanced_pipeline(self, html=None):
+        """Run the complete advanced discovery pipeline (on ``html`` if already fetched)"""
         print("🚀 ASTRA Advanced Discovery Pipeline Starting...")
         print("=" * 60)
 
         # Phase 1: Scrape data
-        transients = self.scrape_rochester_enhanced()
+        transients = self.scrape_rochester_enhanced(html)
 
         if transients.empty:
             print("❌ No transients found. Aborting.")
             return None
 
+        with stage("enrich"):
+            transients = add_extinction_columns(transients, self.dust_map)
+            transients = add_distance_columns(transients)
+
         # Phase 2: Find advanced anomalies
         anomalies = self.find_advanced_anomalies(transients)
 
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Galactic Extinction
+E(B-V) lookups from a locally stored, memory-mapped all-sky dust map
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .coordinates import icrs_to_galactic, parse_ra_dec
+
+DUST_MAP_ENV = "ASTRA_DUST_MAP"
+# A_V / E(B-V) for the diffuse interstellar medium
+R_V = 3.1
+
+
+def healpix_ring_index(nside: int, l_deg, b_deg) -> np.ndarray:
+    """HEALPix RING-scheme pixel index for arrays of Galactic coordinates"""
+    z = np.sin(np.radians(np.asarray(b_deg, dtype=np.float64)))
+    tt = (np.asarray(l_deg, dtype=np.float64) % 360.0) / 90.0  # in [0, 4)
+    za = np.abs(z)
+    npix = 12 * nside * nside
+    ncap = 2 * nside * (nside - 1)
+
+    # Equatorial belt
+    temp1 = nside * (0.5 + tt)
+    temp2 = nside * z * 0.75
+    jp = np.floor(temp1 - temp2).astype(np.int64)
+    jm = np.floor(temp1 + temp2).astype(np.int64)
+    ir = nside + 1 + jp - jm
+    kshift = 1 - (ir & 1)
+    ip = ((jp + jm - nside + kshift + 1) // 2) % (4 * nside)
+    equatorial = ncap + (ir - 1) * 4 * nside + ip
+
+    # Polar caps
+    tp = tt - np.floor(tt)
+    tmp = nside * np.sqrt(3.0 * (1.0 - za))
+    jp = np.floor(tp * tmp).astype(np.int64)
+    jm = np.floor((1.0 - tp) * tmp).astype(np.int64)
+    ir = jp + jm + 1
+    ip = np.floor(tt * ir).astype(np.int64) % (4 * ir)
+    polar = np.where(z > 0, 2 * ir * (ir - 1) + ip, npix - 2 * ir * (ir + 1) + ip)
+
+    return np.where(za <= 2.0 / 3.0, equatorial, polar)
+
+
+class DustMap:
+    """All-sky E(B-V) map read through a memory map
+
+    The map is a ``.npy`` file in Galactic coordinates, either
+
+    * a 1-D HEALPix array in RING ordering (length ``12 * nside**2``), or
+    * a 2-D plate-carrée image of shape ``(n_lat, n_lon)`` whose rows run from
+      b = -90° to +90° and whose columns run from l = 0° to 360°.
+
+    Only the pages touched by a lookup are read from disk.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.data = np.load(self.path, mmap_mode="r")
+
+        if self.data.ndim == 1:
+            nside = int(round(np.sqrt(self.data.size / 12)))
+            if 12 * nside * nside != self.data.size:
+                raise ValueError(f"{self.path}: {self.data.size} is not a HEALPix map size")
+            self.nside = nside
+        elif self.data.ndim == 2:
+            self.nside = None
+        else:
+            raise ValueError(f"{self.path}: dust map must be 1-D (HEALPix) or 2-D")
+
+    def ebv_galactic(self, l_deg, b_deg) -> np.ndarray:
+        """E(B-V) at arrays of Galactic coordinates (NaN where coordinates are NaN)"""
+        l_deg = np.asarray(l_deg, dtype=np.float64)
+        b_deg = np.asarray(b_deg, dtype=np.float64)
+        valid = np.isfinite(l_deg) & np.isfinite(b_deg)
+        l_safe = np.where(valid, l_deg, 0.0)
+        b_safe = np.where(valid, b_deg, 0.0)
+
+        if self.nside is not None:
+            values = self.data[healpix_ring_index(self.nside, l_safe, b_safe)]
+        else:
+            n_lat, n_lon = self.data.shape
+            row = np.clip(((b_safe + 90.0) / 180.0 * n_lat).astype(np.int64), 0, n_lat - 1)
+            col = ((l_safe % 360.0) / 360.0 * n_lon).astype(np.int64) % n_lon
+            values = self.data[row, col]
+
+        return np.where(valid, values.astype(np.float64), np.nan)
+
+    def ebv(self, ra_deg, dec_deg) -> np.ndarray:
+        """E(B-V) at arrays of ICRS coordinates in degrees"""
+        return self.ebv_galactic(*icrs_to_galactic(ra_deg, dec_deg))
+
+
+def load_dust_map(path=None) -> Optional[DustMap]:
+    """Open the dust map at ``path`` or ``$ASTRA_DUST_MAP``; None if not configured"""
+    path = path or os.environ.get(DUST_MAP_ENV)
+    if not path:
+        return None
+    try:
+        return DustMap(path)
+    except (OSError, ValueError) as exc:
+        print(f"   ⚠️ Dust map unavailable ({exc}), skipping extinction correction")
+        return None
+
+
+def add_extinction_columns(
+    transients: pd.DataFrame, dust_map: Optional[DustMap], r_v: float = R_V
+) -> pd.DataFrame:
+    """Return a copy of a transients frame with ``ebv`` and ``mag_corrected`` columns
+
+    Rows without parseable coordinates keep their observed magnitude. Degree
+    coordinates from :func:`normalize_transients` are used when present.
+    """
+    transients = transients.copy()
+    if dust_map is None or transients.empty or "ra" not in transients.columns:
+        return transients
+
+    if "ra_deg" in transients.columns:
+        ra_deg, dec_deg = transients["ra_deg"].to_numpy(), transients["dec_deg"].to_numpy()
+    else:
+        ra_deg, dec_deg = parse_ra_dec(transients["ra"], transients["dec"])
+    ebv = dust_map.ebv(ra_deg, dec_deg)
+    mags = transients["mag"].to_numpy(dtype=np.float64)
+    transients["ebv"] = ebv.astype(np.float32)
+    transients["mag_corrected"] = np.where(np.isnan(ebv), mags, mags - r_v * ebv).astype(np.float32)
+    return transients
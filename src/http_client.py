@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+ASTRA: HTTP Client
+Shared keep-alive session and conditional (ETag/Last-Modified) polling
+"""
+
+import codecs
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .metrics import record_bytes, record_cache, record_download
+from .tracing import span
+
+ROCHESTER_URL = "http://www.rochesterastronomy.org/supernova.html"
+BODY_CHUNK_SIZE = 64 * 1024
+USER_AGENT = "ASTRA/2.0 (+https://github.com/Shannon-Labs/astra)"
+
+# Remote services and the environment variables that point them elsewhere
+# (a mirror, or a local stand-in for load testing)
+ENDPOINTS: Dict[str, Tuple[str, str]] = {
+    "simbad": ("ASTRA_SIMBAD_URL", "https://simbad.cds.unistra.fr/simbad/sim-tap"),
+    "gaia": ("ASTRA_GAIA_URL", "https://gea.esac.esa.int/"),
+    "ned": ("ASTRA_NED_URL", "https://ned.ipac.caltech.edu/cgi-bin/objsearch"),
+    "vizier": ("ASTRA_VIZIER_URL", "http://vizier.u-strasbg.fr/viz-bin/votable"),
+    "rochester_archive": (
+        "ASTRA_ROCHESTER_ARCHIVE_URL",
+        "http://www.rochesterastronomy.org/snimages/",
+    ),
+}
+
+_session: Optional[requests.Session] = None
+
+
+def endpoint(service: str) -> str:
+    """Base URL for ``service``, honouring its environment override"""
+    variable, default = ENDPOINTS[service]
+    return os.environ.get(variable) or default
+
+
+def endpoint_overridden(service: str) -> bool:
+    """Whether ``service`` is pointed away from its public endpoint"""
+    return endpoint(service) != ENDPOINTS[service][1]
+
+
+def get_session() -> requests.Session:
+    """Process-wide session so repeated polls reuse pooled connections"""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
+
+def iter_body(response, url: str, chunk_size: int = BODY_CHUNK_SIZE) -> Iterator[str]:
+    """Decoded body of a ``stream=True`` response, chunk by chunk
+
+    Bytes are counted towards the download metrics as they arrive. Responses
+    that were already read (or stand-ins exposing only ``text``) are split
+    into chunks of the same size.
+    """
+    if not hasattr(response, "iter_content"):
+        record_download(url, response)
+        text = response.text
+        for start in range(0, len(text), chunk_size):
+            yield text[start : start + chunk_size]
+        return
+
+    # Same charset as ``response.text`` when the server names one
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    for chunk in response.iter_content(chunk_size):
+        record_bytes(url, len(chunk))
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+@dataclass
+class FetchResult:
+    """Body of a polled URL and whether it differs from the previous poll"""
+
+    url: str
+    text: str
+    changed: bool
+    status_code: int
+
+
+class ConditionalFetcher:
+    """Poll URLs with conditional requests and report whether content changed
+
+    ETag and Last-Modified validators from the previous response are sent
+    back, so an unchanged page costs a ``304 Not Modified``. Servers that
+    ignore validators are handled by comparing a digest of the body.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session or get_session()
+        self._state: Dict[str, Dict] = {}
+
+    def fetch(self, url: str, timeout: float = 30) -> FetchResult:
+        """GET ``url``; raises ``requests.RequestException`` on network or HTTP errors"""
+        state = self._state.get(url, {})
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+
+        with span("http.get", "remote", url=url):
+            response = self.session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and "text" in state:
+            record_cache("http", True)
+            return FetchResult(url, state["text"], False, 304)
+        response.raise_for_status()
+        record_cache("http", False)
+        record_download(url, response)
+
+        text = response.text
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        changed = digest != state.get("digest")
+        self._state[url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "digest": digest,
+            "text": text,
+        }
+        return FetchResult(url, text, changed, response.status_code)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Identity Resolution
+Canonical designations, a persistent alias index and cross-source merging
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+ALIAS_INDEX_NAME = ".alias_index.json"
+ALIAS_SEPARATOR = ";"
+
+# Merged fields come from the first of these source families that has a
+# value; other sources follow in page order. A numbered source such as
+# "Rochester_Table_3" belongs to the family without the number and ranks
+# within it by number. Table rows keep their magnitude and type, entries add
+# the discovery date and position.
+SOURCE_PRIORITY: Sequence[str] = ("Rochester_Table", "Rochester_Entries")
+_NUMBERED_SOURCE = re.compile(r"(.+?)_(\d+)")
+
+# "AT2025abao", "AT 2025abao", "SN 2025abao", "sn1987A", "2025abao"
+IAU_PATTERN = re.compile(r"(?:(AT|SN)\s*)?(\d{4})\s*([A-Za-z]+)", re.IGNORECASE)
+_IAU_KEY = re.compile(r"\d{4}[A-Za-z]+")
+# Names already in canonical form, which is nearly all of them
+_CANONICAL_IAU = re.compile(r"(?:AT|SN)\d{4}[a-z]{2,}")
+
+
+def _designation(name) -> Tuple[Optional[str], Optional[str]]:
+    """Canonical name and object key of one designation"""
+    if isinstance(name, str) and _CANONICAL_IAU.fullmatch(name):
+        return name, name[2:]
+    if name is None or (not isinstance(name, str) and pd.isna(name)):
+        return None, None
+    text = " ".join(str(name).split())
+    if not text:
+        return None, None
+    match = IAU_PATTERN.fullmatch(text)
+    if not match:
+        return text, text.replace(" ", "").upper()
+    prefix, year, letters = match.groups()
+    if len(letters) == 1:
+        suffix, key_suffix = letters, letters.upper()
+    else:
+        suffix = key_suffix = letters.lower()
+    return f"{(prefix or 'AT').upper()}{year}{suffix}", f"{year}{key_suffix}"
+
+
+def canonical_name(name) -> Optional[str]:
+    """Compact display form of a designation; None for missing names
+
+    IAU names lose their inner space and get an upper-case prefix
+    ("AT 2025abao" -> "AT2025abao"); longer suffixes are lower case,
+    single letters keep their case. Survey names (ZTF, ATLAS, TCP J...) only have their
+    whitespace collapsed.
+    """
+    return _designation(name)[0]
+
+
+def object_key(name) -> Optional[str]:
+    """Key shared by every spelling of one designation
+
+    AT and SN names of the same object share the IAU key ("2025abao",
+    "1987A"); other designations are keyed without whitespace or case.
+    """
+    return _designation(name)[1]
+
+
+def _parse_column(names: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Factorize a column of names, parsing each distinct spelling once
+
+    Returns the codes and, per code, the canonical name and object key.
+    Both arrays end with None, so missing names (code -1) index to None.
+    """
+    codes, distinct = pd.factorize(names)
+    parsed = [_designation(name) for name in np.asarray(distinct, dtype=object)]
+    canonical = np.array([name for name, _ in parsed] + [None], dtype=object)
+    keys = np.array([key for _, key in parsed] + [None], dtype=object)
+    return codes, canonical, keys
+
+
+class AliasIndex:
+    """Hash table from every known alias to the key of its object
+
+    Only objects with more than one designation are stored; plain spelling
+    differences are left to :func:`object_key`. Linking names that already
+    belong to different objects merges those objects, preferring an IAU key
+    and then a key that already has aliases.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self.keys: Dict[str, str] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                self.keys = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                print(f"   ⚠️ Ignoring unreadable alias index {self.path}: {exc}")
+                self.keys = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def key(self, name) -> Optional[str]:
+        """Object key for ``name``, following any recorded alias"""
+        alias = object_key(name)
+        if alias is None:
+            return None
+        return self.keys.get(alias, alias)
+
+    def resolve(self, keys: np.ndarray) -> np.ndarray:
+        """Follow recorded aliases for an array of object keys"""
+        if not self.keys:
+            return keys
+        return np.array([self.keys.get(key, key) for key in keys], dtype=object)
+
+    def keys_for(self, names: pd.Series) -> pd.Series:
+        """Object keys for a column of names, resolving each distinct name once"""
+        codes, _, keys = _parse_column(names)
+        return pd.Series(self.resolve(keys)[codes], index=names.index, dtype=object)
+
+    def link(self, names: Iterable) -> Optional[str]:
+        """Record that ``names`` designate one object; returns its key"""
+        aliases = list(dict.fromkeys(filter(None, map(object_key, names))))
+        if not aliases:
+            return None
+        known = list(dict.fromkeys(self.keys.get(alias, alias) for alias in aliases))
+        grouped = {self.keys[alias] for alias in aliases if alias in self.keys}
+        key = min(
+            known,
+            key=lambda candidate: (
+                not _IAU_KEY.fullmatch(candidate),
+                candidate not in grouped,
+                candidate,
+            ),
+        )
+
+        # Objects linked before now share the new key
+        for other in grouped - {key}:
+            for alias, target in list(self.keys.items()):
+                if target == other:
+                    self.keys[alias] = key
+        for alias in aliases + [key]:
+            self.keys[alias] = key
+        return key
+
+    def update(self, transients: pd.DataFrame) -> int:
+        """Link each row's ``id`` with its ``aliases``; returns how many entries changed"""
+        if "aliases" not in transients.columns or "id" not in transients.columns:
+            return 0
+        before = dict(self.keys)
+        rows = transients.loc[transients["aliases"].notna(), ["id", "aliases"]]
+        for name, aliases in rows.itertuples(index=False):
+            self.link([name, *str(aliases).split(ALIAS_SEPARATOR)])
+        return sum(before.get(alias) != key for alias, key in self.keys.items())
+
+    def save(self) -> None:
+        """Write the index atomically"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.keys, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def source_family(source) -> Tuple[str, int]:
+    """Family and number of a source name, e.g. ("Rochester_Table", 3)"""
+    source = str(source)
+    match = _NUMBERED_SOURCE.fullmatch(source)
+    return (match.group(1), int(match.group(2))) if match else (source, 0)
+
+
+def source_rank(sources: pd.Series, priority: Sequence[str] = SOURCE_PRIORITY) -> pd.Series:
+    """Rank of each row's source by family in ``priority``, then by number
+
+    Unlisted families rank last, in order of first appearance.
+    """
+    ranks = {family: rank for rank, family in enumerate(priority)}
+    codes, distinct = pd.factorize(sources)
+
+    def order(code: int) -> Tuple[int, int]:
+        family, number = source_family(distinct[code])
+        rank = ranks.get(family, len(priority))
+        return (rank, number if rank < len(priority) else 0)
+
+    lookup = np.empty(len(distinct) + 1, dtype="int64")
+    lookup[sorted(range(len(distinct)), key=order)] = np.arange(len(distinct))
+    lookup[-1] = len(distinct)
+    return pd.Series(lookup[codes], index=sources.index)
+
+
+def merge_transients(
+    transients: pd.DataFrame,
+    index: Optional[AliasIndex] = None,
+    priority: Sequence[str] = SOURCE_PRIORITY,
+) -> pd.DataFrame:
+    """One row per object, coalescing fields across sources by priority
+
+    Rows are keyed through ``index`` (which learns the frame's own
+    ``aliases`` first), ordered by source priority, and grouped on that key
+    in a single hash pass. Each field takes the first non-missing value in
+    priority order, so a table row's magnitude and an entry's position end
+    up in the same record. ``id`` becomes the canonical form of the
+    highest-priority designation; rows without an ``id`` are dropped.
+    """
+    if transients.empty or "id" not in transients.columns:
+        return transients
+    index = index if index is not None else AliasIndex()
+    index.update(transients)
+
+    codes, canonical, keys = _parse_column(transients["id"])
+    groups = np.append(pd.factorize(index.resolve(keys[:-1]))[0], -1)[codes]
+    df = transients.assign(id=canonical[codes], _key=groups)[groups >= 0]
+    if "source" in df.columns:
+        df = df.assign(_rank=source_rank(df["source"], priority))
+        df = df.sort_values("_rank", kind="stable").drop(columns="_rank")
+
+    merged = df.groupby("_key", sort=False).first()
+    return merged.reset_index(drop=True).astype(transients.dtypes.to_dict())
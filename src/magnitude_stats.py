@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Magnitude Statistics
+Streaming, numerically stable summary statistics for transient catalogs
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Histogram sketch covering every magnitude a transient catalog can plausibly hold
+SKETCH_MIN_MAG = -35.0
+SKETCH_MAX_MAG = 40.0
+SKETCH_BIN_WIDTH = 0.005
+
+
+@dataclass
+class RunningMoments:
+    """Count, mean, sum of squared deviations and range, merged chunk by chunk
+
+    Chunks are reduced with NumPy and combined with the parallel form of
+    Welford's update (Chan et al.), so the variance stays accurate for long
+    streams of nearly equal magnitudes.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = np.inf
+    maximum: float = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """Fold a chunk of finite values into the running moments"""
+        n = values.size
+        if n == 0:
+            return
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(np.square(values - chunk_mean).sum())
+
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+    def merge(self, other: "RunningMoments") -> None:
+        """Combine with moments accumulated elsewhere (e.g. another worker)"""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self) -> float:
+        """Population variance (ddof=0)"""
+        return self.m2 / self.count if self.count else float("nan")
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+
+class QuantileSketch:
+    """Fixed-width histogram for approximate quantiles in constant memory
+
+    Quantiles are accurate to half a bin (``SKETCH_BIN_WIDTH`` magnitudes).
+    Values outside the sketch range are clipped into the edge bins.
+    """
+
+    def __init__(
+        self,
+        lo: float = SKETCH_MIN_MAG,
+        hi: float = SKETCH_MAX_MAG,
+        bin_width: float = SKETCH_BIN_WIDTH,
+    ):
+        self.lo = lo
+        self.bin_width = bin_width
+        n_bins = int(np.ceil((hi - lo) / bin_width))
+        self.counts = np.zeros(n_bins, dtype=np.int64)
+        self.centers = lo + (np.arange(n_bins) + 0.5) * bin_width
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a chunk of finite values"""
+        if values.size == 0:
+            return
+        bins = np.clip(
+            ((values - self.lo) / self.bin_width).astype(np.int64), 0, len(self.counts) - 1
+        )
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.counts += other.counts
+
+    @staticmethod
+    def _weighted_quantile(centers: np.ndarray, counts: np.ndarray, q: float) -> float:
+        cumulative = np.cumsum(counts)
+        if cumulative[-1] == 0:
+            return float("nan")
+        # Linear interpolation between order statistics, as numpy.quantile does
+        position = q * (cumulative[-1] - 1)
+        ranks = np.array([np.floor(position), np.ceil(position)]) + 1
+        lower, upper = centers[np.searchsorted(cumulative, ranks)]
+        return float(lower + (upper - lower) * (position - np.floor(position)))
+
+    def quantile(self, q: float) -> float:
+        return self._weighted_quantile(self.centers, self.counts, q)
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def mad(self) -> float:
+        """Median absolute deviation from the median"""
+        median = self.median()
+        if np.isnan(median):
+            return median
+        deviations = np.abs(self.centers - median)
+        order = np.argsort(deviations, kind="stable")
+        return self._weighted_quantile(deviations[order], self.counts[order], 0.5)
+
+
+class MagnitudeStats:
+    """Streaming magnitude statistics with per-type breakdowns
+
+    Feed it chunks with ``update`` (arrays, lists or DataFrames with ``mag``
+    and optional ``type`` columns), then read ``summary()`` or flag outliers
+    in further chunks with ``bright_outlier_mask``.
+    """
+
+    def __init__(self):
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch()
+        self.by_type: Dict[str, RunningMoments] = {}
+
+    def update(self, mags, types: Optional[Iterable] = None) -> None:
+        """Fold one chunk of magnitudes (and their types) into the statistics"""
+        if types is None and hasattr(mags, "columns"):
+            types = mags["type"] if "type" in mags.columns else None
+            mags = mags["mag"]
+
+        values = np.asarray(mags, dtype=np.float64)
+        finite = np.isfinite(values)
+        values = values[finite]
+        self.moments.update(values)
+        self.sketch.update(values)
+
+        if types is None:
+            return
+        if isinstance(getattr(types, "dtype", None), pd.CategoricalDtype):
+            # Group on the category codes; code -1 (missing) indexes "unknown"
+            names = np.append(types.cat.categories.astype(str).to_numpy(dtype=object), "unknown")
+            codes = types.cat.codes.to_numpy()[finite]
+            for code in np.unique(codes):
+                self.by_type.setdefault(names[code], RunningMoments()).update(values[codes == code])
+            return
+        labels = np.asarray(types, dtype=object)[finite]
+        labels = np.where(pd.isna(labels), "unknown", labels).astype(str)
+        unique, inverse = np.unique(labels, return_inverse=True)
+        for i, label in enumerate(unique):
+            self.by_type.setdefault(label, RunningMoments()).update(values[inverse == i])
+
+    def bright_outlier_mask(self, mags, threshold: float) -> np.ndarray:
+        """True where a magnitude is more than ``threshold`` sigma brighter than the mean"""
+        values = np.asarray(mags, dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            return (self.moments.mean - values) > threshold * self.moments.std
+
+    def summary(self) -> Dict:
+        """Plain-dict summary of the stream so far"""
+        moments = self.moments
+        return {
+            "total_objects": moments.count,
+            "mean_magnitude": moments.mean,
+            "std_magnitude": moments.std,
+            "min_magnitude": moments.minimum,
+            "max_magnitude": moments.maximum,
+            "median_magnitude": self.sketch.median(),
+            "mad_magnitude": self.sketch.mad(),
+            "by_type": {
+                label: {
+                    "count": stats.count,
+                    "mean_magnitude": stats.mean,
+                    "std_magnitude": stats.std,
+                    "min_magnitude": stats.minimum,
+                    "max_magnitude": stats.maximum,
+                }
+                for label, stats in sorted(self.by_type.items())
+            },
+        }
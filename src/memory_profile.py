@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Memory Profiling
+Per-stage tracemalloc and RSS snapshots to find the stages worth streaming first
+"""
+
+import json
+import linecache
+import os
+import sys
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .telemetry import add_listener, remove_listener
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Allocations made by the profiler itself are not attributed to stages
+_IGNORED_FILES = (tracemalloc.__file__, linecache.__file__, __file__)
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where it cannot be read cheaply"""
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    # Without /proc only the high-water mark is available
+    return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Process-lifetime RSS high-water mark"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _format_bytes(value: Optional[float]) -> str:
+    if value is None:
+        return "n/a"
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{sign}{value:.0f} {unit}" if unit == "B" else f"{sign}{value:.1f} {unit}"
+        value /= 1024
+    return f"{sign}{value:.2f} GiB"
+
+
+@dataclass
+class StageMemory:
+    """Accumulated memory figures for one stage"""
+
+    calls: int = 0
+    peak_bytes: int = 0
+    peak_above_low_bytes: int = 0
+    retained_bytes: int = 0
+    rss_delta_bytes: Optional[int] = None
+    peak_rss_bytes: Optional[int] = None
+    top_sites: List[Dict] = field(default_factory=list)
+
+
+@dataclass
+class _Frame:
+    start_current: int
+    low: int
+    peak: int
+    snapshot: tracemalloc.Snapshot
+    rss: Optional[int]
+
+
+class MemoryProfiler:
+    """Snapshot tracemalloc and RSS at every stage boundary
+
+    Use as a context manager around a run. For each stage it records the
+    peak traced memory above the stage's starting level (nested stages
+    included), the same peak measured from the lowest level seen during the
+    stage, the memory still held when the stage ends (retained) and the
+    allocation sites that grew the most.
+    Tracing slows Python allocations down considerably, so this is opt-in.
+    """
+
+    def __init__(self, top: int = 10, frames: int = 1):
+        self.top = top
+        self.frames = frames
+        self.stats: Dict[str, StageMemory] = {}
+        self._sites: Dict[str, Counter] = {}
+        self._stack: List[_Frame] = []
+        self._started_tracing = False
+
+    def __enter__(self) -> "MemoryProfiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        add_listener(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_listener(self)
+        self._stack.clear()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def enter(self, name: str) -> Optional[_Frame]:
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot()
+        rss = rss_bytes()
+        # The baseline is read last, so the profiler's own work before it
+        # does not count toward this stage. Resetting the peak would lose the
+        # enclosing stages' high-water mark, so fold it into them first
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame.peak = max(frame.peak, peak)
+            frame.low = min(frame.low, current)
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        frame = _Frame(current, current, current, snapshot, rss)
+        self._stack.append(frame)
+        return frame
+
+    def exit(self, name: str, token, error: Optional[BaseException]) -> None:
+        if token is None or not self._stack or self._stack[-1] is not token:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        frame = self._stack.pop()
+        frame.peak = max(frame.peak, peak)
+        # Memory freed during the stage (by the stage or by anything else)
+        # lowers the low-water mark, which is reported separately from the peak
+        frame.low = min(frame.low, current)
+        if self._stack:
+            self._stack[-1].peak = max(self._stack[-1].peak, frame.peak)
+            self._stack[-1].low = min(self._stack[-1].low, frame.low)
+
+        stats = self.stats.setdefault(name, StageMemory())
+        stats.calls += 1
+        stats.peak_bytes = max(stats.peak_bytes, frame.peak - frame.start_current, 0)
+        stats.peak_above_low_bytes = max(stats.peak_above_low_bytes, frame.peak - frame.low)
+        stats.retained_bytes += current - frame.start_current
+
+        rss = rss_bytes()
+        if rss is not None and frame.rss is not None:
+            stats.rss_delta_bytes = (stats.rss_delta_bytes or 0) + rss - frame.rss
+        stats.peak_rss_bytes = peak_rss_bytes()
+
+        sites = self._sites.setdefault(name, Counter())
+        for diff in tracemalloc.take_snapshot().compare_to(frame.snapshot, "lineno"):
+            location = diff.traceback[0]
+            # Filtering grouped statistics is far cheaper than filter_traces()
+            if diff.size_diff and location.filename not in _IGNORED_FILES:
+                sites[f"{location.filename}:{location.lineno}"] += diff.size_diff
+        stats.top_sites = [
+            {"site": site, "size_diff_bytes": size}
+            for site, size in sorted(sites.items(), key=lambda item: -item[1])[: self.top]
+        ]
+
+    def summary_table(self) -> str:
+        """Plain-text table of peak and retained memory per stage"""
+        lines = [
+            f"{'Stage':<14} {'Calls':>6} {'Peak':>12} {'Above low':>12} {'Retained':>12} "
+            f"{'RSS delta':>12} {'Peak RSS':>12}"
+        ]
+        lines.append("-" * len(lines[0]))
+        for name, stats in self.stats.items():
+            lines.append(
+                f"{name:<14} {stats.calls:>6} {_format_bytes(stats.peak_bytes):>12} "
+                f"{_format_bytes(stats.peak_above_low_bytes):>12} "
+                f"{_format_bytes(stats.retained_bytes):>12} "
+                f"{_format_bytes(stats.rss_delta_bytes):>12} "
+                f"{_format_bytes(stats.peak_rss_bytes):>12}"
+            )
+        return "\n".join(lines)
+
+    def top_sites_report(self, limit: int = 5) -> str:
+        """Largest allocation sites per stage"""
+        lines = []
+        for name, stats in self.stats.items():
+            if not stats.top_sites:
+                continue
+            lines.append(f"[{name}]")
+            for site in stats.top_sites[:limit]:
+                lines.append(f"  {_format_bytes(site['size_diff_bytes']):>12}  {site['site']}")
+        return "\n".join(lines)
+
+    def write(self, output_dir) -> Path:
+        """Write memory.json and memory.txt; returns memory.txt"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "memory.json").write_text(
+            json.dumps({name: asdict(s) for name, s in self.stats.items()}, indent=2),
+            encoding="utf-8",
+        )
+        report_path = output_dir / "memory.txt"
+        report_path.write_text(
+            self.summary_table() + "\n\nTop allocation sites\n" + self.top_sites_report() + "\n",
+            encoding="utf-8",
+        )
+        return report_path
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Metrics
+Prometheus text-format counters, gauges and histograms for unattended runs
+"""
+
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        super().__init__(name, help_text, labelnames)
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, value in sorted(self.values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.series: Dict[Tuple, Dict] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self.series.setdefault(
+                key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, series in sorted(self.series.items()):
+            for bound, count in zip(self.buckets, series["buckets"]):
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+
+    def _register(self, cls, name, help_text, labelnames, **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, help_text, labelnames, **kwargs)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        lines = []
+        for name in sorted(self.metrics):
+            lines.extend(self.metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path) -> Path:
+        """Write atomically, as node_exporter's textfile collector expects"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "astra_stage_duration_seconds", "Wall time spent in each pipeline stage", ("stage",)
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "astra_stage_errors_total", "Pipeline stages that raised an exception", ("stage",)
+)
+ROWS_SCRAPED = REGISTRY.counter(
+    "astra_rows_scraped_total", "Transient rows parsed before deduplication", ("source",)
+)
+BYTES_DOWNLOADED = REGISTRY.counter(
+    "astra_downloaded_bytes_total", "Bytes of page content downloaded", ("host",)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "astra_cache_requests_total", "Cache lookups by cache and result", ("cache", "result")
+)
+REMOTE_QUERIES = REGISTRY.counter(
+    "astra_remote_queries_total", "Queries sent to remote services", ("service",)
+)
+ERRORS = REGISTRY.counter("astra_errors_total", "Handled errors by component", ("component",))
+ANOMALIES = REGISTRY.gauge(
+    "astra_anomalies", "Anomalies in the latest run by score band", ("band",)
+)
+RUNS = REGISTRY.counter(
+    "astra_runs_total", "Discovery runs by mode and outcome", ("mode", "status")
+)
+LAST_RUN = REGISTRY.gauge(
+    "astra_last_run_timestamp_seconds", "Unix time of the latest completed run", ("mode",)
+)
+
+
+class StageMetrics:
+    """Telemetry listener feeding stage latencies and failures into the registry"""
+
+    def enter(self, name: str) -> float:
+        return time.perf_counter()
+
+    def exit(self, name: str, token: float, error: Optional[BaseException]) -> None:
+        STAGE_SECONDS.observe(time.perf_counter() - token, stage=name)
+        if error is not None:
+            STAGE_ERRORS.inc(stage=name)
+
+
+def record_download(url: str, response) -> None:
+    """Count the size of a response body downloaded from ``url``"""
+    content = getattr(response, "content", None)
+    if not isinstance(content, (bytes, bytearray)):
+        content = (getattr(response, "text", None) or "").encode("utf-8")
+    record_bytes(url, len(content))
+
+
+def record_bytes(url: str, n_bytes: int) -> None:
+    """Count ``n_bytes`` of a body streamed from ``url``"""
+    BYTES_DOWNLOADED.inc(n_bytes, host=urlparse(url).netloc or url)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_rows(transients) -> None:
+    """Count scraped rows per source column value"""
+    if transients is None or transients.empty or "source" not in transients.columns:
+        return
+    for source, count in transients["source"].value_counts().items():
+        ROWS_SCRAPED.inc(int(count), source=source)
+
+
+def record_anomalies(anomalies: Sequence[Dict]) -> None:
+    """Set the anomaly gauge using the report's priority bands"""
+    bands = {"high": 0, "medium": 0, "low": 0}
+    for anomaly in anomalies:
+        score = anomaly.get("score", 0)
+        band = "high" if score >= 7.0 else "medium" if score >= 5.0 else "low"
+        bands[band] += 1
+    for band, count in bands.items():
+        ANOMALIES.set(count, band=band)
+
+
+def serve_metrics(
+    port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY
+) -> "ThreadingHTTPServer":
+    """Serve ``/metrics`` from a daemon thread; call ``shutdown()`` to stop"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 - http.server naming
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # noqa: A002 - silence access logs
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, name="astra-metrics", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Night Scheduler
+Packs ranked candidates into telescope time for each observatory
+"""
+
+import heapq
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .observation_planner import ObservabilityGrid
+
+
+@dataclass
+class ScheduledObservation:
+    """A single target assigned to a block of telescope time"""
+
+    target_id: str
+    observatory: str
+    start: datetime
+    end: datetime
+    score: float
+    exposure_s: float
+
+
+class NightScheduler:
+    """Assign ranked anomalies to observing slots across several observatories
+
+    The night is split into fixed-length slots. Each target needs enough
+    consecutive slots to cover its exposure plus acquisition overhead, and it
+    may only be placed where it stays observable for the whole block. The
+    objective is the score-weighted number of completed observations.
+    """
+
+    def __init__(
+        self,
+        slot_minutes: float = 30.0,
+        overhead_seconds: float = 300.0,
+        exact_threshold: int = 8,
+    ):
+        self.slot_minutes = slot_minutes
+        self.overhead_seconds = overhead_seconds
+        self.exact_threshold = exact_threshold
+
+    def _slot_observability(self, grid: ObservabilityGrid) -> Tuple[np.ndarray, int, float]:
+        """Collapse the grid's time steps into slots; a slot is usable only if all steps are
+
+        ``slot_minutes`` is rounded to whole grid steps. Returns the slot mask,
+        the steps per slot and the effective slot length in seconds.
+        """
+        times = grid.times_utc
+        if times.shape[1] < 2:
+            raise ValueError("Observability grid needs at least two time steps")
+
+        step_s = float((times[0, 1] - times[0, 0]) / np.timedelta64(1, "s"))
+        steps_per_slot = int(round(self.slot_minutes * 60.0 / step_s))
+        if steps_per_slot < 1:
+            raise ValueError(
+                f"Slot length ({self.slot_minutes} min) is shorter than the grid step "
+                f"({step_s / 60:.1f} min)"
+            )
+
+        n_slots = times.shape[1] // steps_per_slot
+        usable = grid.observable[..., : n_slots * steps_per_slot]
+        slots = usable.reshape(usable.shape[:2] + (n_slots, steps_per_slot)).all(axis=-1)
+        return slots, steps_per_slot, steps_per_slot * step_s
+
+    def _slots_needed(self, exposure_s, n_targets: int, n_sites: int, slot_s: float) -> np.ndarray:
+        """Number of consecutive slots each (target, site) pair needs"""
+        exposure = np.asarray(exposure_s, dtype=np.float64)
+        if exposure.ndim == 1:
+            exposure = exposure[:, None]
+        exposure = np.broadcast_to(exposure, (n_targets, n_sites))
+
+        with np.errstate(invalid="ignore"):
+            needed = np.ceil((exposure + self.overhead_seconds) / slot_s)
+        # Pairs without a finite exposure estimate can never be scheduled
+        return np.where(np.isfinite(needed) & (needed > 0), needed, 0).astype(np.int64)
+
+    @staticmethod
+    def _feasible_starts(slots: np.ndarray, needed: np.ndarray) -> np.ndarray:
+        """Boolean (N, M, S) mask of slot indices where a full block fits"""
+        n_targets, n_sites, n_slots = slots.shape
+        cumulative = np.zeros((n_targets, n_sites, n_slots + 1), dtype=np.int64)
+        np.cumsum(slots, axis=-1, out=cumulative[..., 1:])
+
+        starts = np.arange(n_slots)[None, None, :]
+        ends = starts + needed[..., None]
+        in_range = (ends <= n_slots) & (needed[..., None] > 0)
+        ends = np.minimum(ends, n_slots)
+
+        covered = np.take_along_axis(cumulative, ends, axis=-1) - cumulative[..., :n_slots]
+        return in_range & (covered == needed[..., None])
+
+    def _greedy(
+        self, scores: np.ndarray, feasible: np.ndarray, needed: np.ndarray
+    ) -> List[Tuple[int, int, int]]:
+        """Priority-queue heuristic: best score first, earliest finishing placement"""
+        _, n_sites, n_slots = feasible.shape
+        busy = np.zeros((n_sites, n_slots + 1), dtype=np.int64)
+        queue = [(-scores[n], n) for n in range(len(scores))]
+        heapq.heapify(queue)
+
+        assignments = []
+        while queue:
+            _, n = heapq.heappop(queue)
+            best = None
+            for m in range(n_sites):
+                d = needed[n, m]
+                if d == 0 or not feasible[n, m].any():
+                    continue
+                # A block is free when no busy slot falls inside it
+                cumulative_busy = np.concatenate(([0], np.cumsum(busy[m, :n_slots])))
+                starts = np.arange(n_slots)
+                ends = np.minimum(starts + d, n_slots)
+                free = (cumulative_busy[ends] - cumulative_busy[starts]) == 0
+                candidates = np.flatnonzero(feasible[n, m] & free)
+                if candidates.size == 0:
+                    continue
+                s = int(candidates[0])
+                if best is None or s + d < best[2] + needed[n, best[1]]:
+                    best = (n, m, s)
+            if best is not None:
+                _, m, s = best
+                busy[m, s : s + needed[n, m]] = 1
+                assignments.append(best)
+        return assignments
+
+    def _exact(
+        self, scores: np.ndarray, feasible: np.ndarray, needed: np.ndarray
+    ) -> Optional[List[Tuple[int, int, int]]]:
+        """Solve the slot assignment exactly as a small integer program"""
+        try:
+            from scipy.optimize import Bounds, LinearConstraint, milp
+        except ImportError:
+            print("   ⚠️ scipy.optimize.milp not available, using greedy scheduler")
+            return None
+
+        n_targets, n_sites, n_slots = feasible.shape
+        variables = np.argwhere(feasible)
+        if len(variables) == 0:
+            return []
+
+        # One row per target (at most once) and one per (site, slot) (no overlap)
+        rows = np.zeros((n_targets + n_sites * n_slots, len(variables)))
+        for j, (n, m, s) in enumerate(variables):
+            rows[n, j] = 1
+            first = n_targets + m * n_slots + s
+            rows[first : first + needed[n, m], j] = 1
+
+        result = milp(
+            c=-scores[variables[:, 0]],
+            constraints=LinearConstraint(rows, 0, 1),
+            integrality=np.ones(len(variables)),
+            bounds=Bounds(0, 1),
+        )
+        if not result.success:
+            print(f"   ⚠️ Exact scheduler failed ({result.message}), using greedy scheduler")
+            return None
+
+        chosen = variables[np.round(result.x).astype(bool)]
+        return [tuple(int(v) for v in row) for row in chosen]
+
+    def schedule(
+        self,
+        anomalies: Sequence[Dict],
+        grid: ObservabilityGrid,
+        exposure_s=900.0,
+        method: str = "auto",
+    ) -> Dict[str, List[ScheduledObservation]]:
+        """Build an ordered night plan per observatory
+
+        Parameters
+        ----------
+        anomalies : sequence of dict
+            Ranked anomalies with at least ``id`` and ``score``. Targets absent
+            from the observability grid are ignored.
+        grid : ObservabilityGrid
+            Output of ``ObservationPlanner.compute_observability``.
+        exposure_s : float or array-like
+            Exposure time in seconds: a scalar, one value per anomaly, or an
+            (anomaly, observatory) array aligned with ``grid.observatories``.
+        method : {"auto", "greedy", "exact"}
+            ``auto`` uses the exact solver for at most ``exact_threshold`` targets.
+
+        Returns
+        -------
+        dict
+            Observatory name -> list of ScheduledObservation ordered by start time.
+        """
+        if method not in ("auto", "greedy", "exact"):
+            raise ValueError(f"Unknown scheduling method: {method}")
+
+        index = {target_id: i for i, target_id in enumerate(grid.target_ids)}
+        keep = [i for i, a in enumerate(anomalies) if a["id"] in index]
+        plan: Dict[str, List[ScheduledObservation]] = {site: [] for site in grid.observatories}
+        if not keep:
+            return plan
+
+        exposure = np.asarray(exposure_s, dtype=np.float64)
+        if exposure.ndim >= 1:
+            exposure = exposure[keep]
+
+        rows = [index[anomalies[i]["id"]] for i in keep]
+        scores = np.array([float(anomalies[i].get("score", 0.0)) for i in keep])
+        slots, steps_per_slot, slot_s = self._slot_observability(grid)
+        slots = slots[rows]
+        needed = self._slots_needed(exposure, len(rows), len(grid.observatories), slot_s)
+        feasible = self._feasible_starts(slots, needed)
+
+        assignments = None
+        if method == "exact" or (method == "auto" and len(rows) <= self.exact_threshold):
+            assignments = self._exact(scores, feasible, needed)
+        if assignments is None:
+            assignments = self._greedy(scores, feasible, needed)
+
+        exposure_pairs = np.broadcast_to(
+            exposure[:, None] if exposure.ndim == 1 else exposure, needed.shape
+        )
+        # Blocks are whole grid steps long, so they tile without overlapping
+        slot_length = timedelta(seconds=slot_s)
+        for n, m, s in assignments:
+            site = grid.observatories[m]
+            start = grid.times_utc[m, s * steps_per_slot].astype(datetime)
+            plan[site].append(
+                ScheduledObservation(
+                    target_id=grid.target_ids[rows[n]],
+                    observatory=site,
+                    start=start,
+                    end=start + needed[n, m] * slot_length,
+                    score=float(scores[n]),
+                    exposure_s=float(exposure_pairs[n, m]),
+                )
+            )
+
+        for site in plan:
+            plan[site].sort(key=lambda obs: obs.start)
+        return plan
+
+
+def format_night_plan(plan: Dict[str, List[ScheduledObservation]]) -> str:
+    """Render a night plan as plain text"""
+    lines = []
+    lines.append("=" * 80)
+    lines.append("ASTRA NIGHT PLAN")
+    lines.append("=" * 80)
+
+    for site, observations in plan.items():
+        lines.append("")
+        total = sum(obs.score for obs in observations)
+        lines.append(f"--- {site} ({len(observations)} targets, score {total:.1f}) ---")
+        if not observations:
+            lines.append("No targets scheduled.")
+            continue
+        for obs in observations:
+            minutes = math.ceil(obs.exposure_s / 60.0)
+            lines.append(
+                f"{obs.start.strftime('%H:%M')}-{obs.end.strftime('%H:%M')} UTC  "
+                f"{obs.target_id:<14} score {obs.score:4.1f}  exposure ~{minutes} min"
+            )
+
+    return "\n".join(lines)
@@ -4,9 +4,215 @@ ASTRA: Observation Planner for High-Priority Transients
 Generates detailed observation plans for follow-up studies
 """
 
-import math
-from datetime import datetime
-from typing import Dict, Tuple
+import json
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .metrics import CACHE_REQUESTS, record_cache
+from .render_cache import RenderManifest, input_digest
+
+# Julian date of the J2000.0 epoch and of the Unix epoch
+JD_J2000 = 2451545.0
+JD_UNIX_EPOCH = 2440587.5
+
+# Bump when the plan text changes so cached renders are invalidated
+PLAN_FORMAT_VERSION = 2
+PLAN_MANIFEST_NAME = ".plan_manifest.json"
+
+# Half-width of the time grid around local midnight
+NIGHT_HALF_WIDTH_HOURS = 6.0
+
+# Sun altitudes (degrees) defining the end of twilight
+NAUTICAL_TWILIGHT_DEG = -12.0
+ASTRONOMICAL_TWILIGHT_DEG = -18.0
+
+# Default observability limits
+MAX_AIRMASS = 2.0
+MIN_MOON_SEPARATION_DEG = 30.0
+
+
+# Photons s^-1 m^-2 from a V=0 source across the V band above the atmosphere
+V_ZERO_POINT_PHOTONS = 8.8e9
+V_BANDWIDTH_ANGSTROM = 880.0
+V_CENTRAL_WAVELENGTH_ANGSTROM = 5500.0
+V_EXTINCTION_MAG_PER_AIRMASS = 0.15
+
+# Approximate end-to-end throughput and resolving power (None for imaging)
+INSTRUMENTS = {
+    "XSHOOTER": {"mode": "spectroscopy", "throughput": 0.20, "resolution": 5000},
+    "FORS2": {"mode": "spectroscopy", "throughput": 0.25, "resolution": 600},
+    "MUSE": {"mode": "spectroscopy", "throughput": 0.30, "resolution": 3000},
+    "LRIS": {"mode": "spectroscopy", "throughput": 0.30, "resolution": 1000},
+    "DEIMOS": {"mode": "spectroscopy", "throughput": 0.25, "resolution": 5000},
+    "ESI": {"mode": "spectroscopy", "throughput": 0.20, "resolution": 8000},
+    "MODS": {"mode": "spectroscopy", "throughput": 0.30, "resolution": 2000},
+    "LUCI": {"mode": "imaging", "throughput": 0.30, "resolution": None},
+    "GMOS": {"mode": "spectroscopy", "throughput": 0.25, "resolution": 1500},
+    "NIRI": {"mode": "imaging", "throughput": 0.30, "resolution": None},
+    "FLAMINGOS": {"mode": "imaging", "throughput": 0.30, "resolution": None},
+}
+
+
+@dataclass
+class NightEphemeris:
+    """Sun and Moon positions for one observatory over one night's time grid"""
+
+    observatory: str
+    night: date
+    times_utc: np.ndarray  # (T,) datetime64[s]
+    sun_altitude_deg: np.ndarray  # (T,)
+    moon_ra_deg: np.ndarray  # (T,)
+    moon_dec_deg: np.ndarray  # (T,)
+    moon_altitude_deg: np.ndarray  # (T,)
+    moon_illumination: np.ndarray  # (T,) illuminated fraction, 0-1
+    twilight: Dict[str, Optional[datetime]] = field(default_factory=dict)
+
+
+@dataclass
+class ObservabilityGrid:
+    """Hour angle, altitude and airmass for N targets x M sites x T time steps"""
+
+    target_ids: List[str]
+    observatories: List[str]
+    times_utc: np.ndarray  # (M, T) datetime64[s]
+    hour_angle_deg: np.ndarray  # (N, M, T)
+    altitude_deg: np.ndarray  # (N, M, T)
+    airmass: np.ndarray  # (N, M, T), inf below the horizon
+    observable: np.ndarray  # (N, M, T) bool
+    sun_altitude_deg: Optional[np.ndarray] = None  # (M, T)
+    moon_separation_deg: Optional[np.ndarray] = None  # (N, M, T)
+    moon_illumination: Optional[np.ndarray] = None  # (M, T)
+    windows: Dict[Tuple[str, str], List[Tuple[datetime, datetime]]] = field(default_factory=dict)
+
+
+def _datetime64_to_jd(times: np.ndarray) -> np.ndarray:
+    """Convert datetime64 values to Julian dates"""
+    seconds = times.astype("datetime64[s]").astype(np.float64)
+    return JD_UNIX_EPOCH + seconds / 86400.0
+
+
+def _gmst_hours(jd: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal time (hours) for an array of Julian dates"""
+    return np.mod(18.697374558 + 24.06570982441908 * (jd - JD_J2000), 24.0)
+
+
+def altitude_from_hour_angle(
+    hour_angle_deg: np.ndarray, dec_deg: np.ndarray, latitude_deg: np.ndarray
+) -> np.ndarray:
+    """Altitude (degrees) from hour angle, declination and site latitude"""
+    ha = np.radians(hour_angle_deg)
+    dec = np.radians(dec_deg)
+    lat = np.radians(latitude_deg)
+    sin_alt = np.sin(dec) * np.sin(lat) + np.cos(dec) * np.cos(lat) * np.cos(ha)
+    return np.degrees(np.arcsin(np.clip(sin_alt, -1.0, 1.0)))
+
+
+def airmass_from_altitude(altitude_deg: np.ndarray) -> np.ndarray:
+    """Kasten & Young (1989) airmass; infinite for targets below the horizon"""
+    alt = np.asarray(altitude_deg, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        airmass = 1.0 / (
+            np.sin(np.radians(alt)) + 0.50572 * np.power(np.maximum(alt, 0.0) + 6.07995, -1.6364)
+        )
+    return np.where(alt > 0.0, airmass, np.inf)
+
+
+def angular_separation_deg(
+    ra1_deg: np.ndarray, dec1_deg: np.ndarray, ra2_deg: np.ndarray, dec2_deg: np.ndarray
+) -> np.ndarray:
+    """Great-circle separation (degrees) between broadcastable coordinate arrays"""
+    ra1, dec1, ra2, dec2 = (np.radians(x) for x in (ra1_deg, dec1_deg, ra2_deg, dec2_deg))
+    # Vincenty formula: well conditioned at both small and large separations
+    delta = ra2 - ra1
+    num = np.hypot(
+        np.cos(dec2) * np.sin(delta),
+        np.cos(dec1) * np.sin(dec2) - np.sin(dec1) * np.cos(dec2) * np.cos(delta),
+    )
+    den = np.sin(dec1) * np.sin(dec2) + np.cos(dec1) * np.cos(dec2) * np.cos(delta)
+    return np.degrees(np.arctan2(num, den))
+
+
+def _crossing_time(
+    times: np.ndarray, values: np.ndarray, level: float, rising: bool
+) -> Optional[datetime]:
+    """Linearly interpolated time at which ``values`` crosses ``level``"""
+    above = values > level
+    crossings = np.flatnonzero(above[1:] != above[:-1])
+    for i in crossings:
+        if above[i + 1] == rising:
+            frac = (level - values[i]) / (values[i + 1] - values[i])
+            offset = (times[i + 1] - times[i]) * frac
+            return (times[i] + offset.astype("timedelta64[s]")).astype(datetime)
+    return None
+
+
+def exposure_time(
+    mag,
+    aperture_m,
+    sky_mag=21.0,
+    airmass=1.2,
+    snr=20.0,
+    throughput=0.25,
+    resolution=None,
+    seeing_arcsec=1.0,
+    read_noise=4.0,
+    pixel_scale_arcsec=0.2,
+) -> np.ndarray:
+    """Exposure time (s) reaching ``snr`` from the CCD equation; all inputs broadcast
+
+    ``resolution`` is the resolving power for spectroscopy (S/N per resolution
+    element) or ``None``/``nan`` for broadband imaging. The source is measured
+    in an aperture of radius ``seeing_arcsec`` (imaging) or a slit one seeing
+    wide and two long (spectroscopy). Sky brightness is in mag/arcsec^2.
+    """
+    mag = np.asarray(mag, dtype=np.float64)
+    aperture_m = np.asarray(aperture_m, dtype=np.float64)
+    snr = np.asarray(snr, dtype=np.float64)
+    seeing = np.asarray(seeing_arcsec, dtype=np.float64)
+    resolution = np.asarray(np.nan if resolution is None else resolution, dtype=np.float64)
+
+    spectroscopy = np.isfinite(resolution)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        band_fraction = np.where(
+            spectroscopy,
+            (V_CENTRAL_WAVELENGTH_ANGSTROM / resolution) / V_BANDWIDTH_ANGSTROM,
+            1.0,
+        )
+    sky_area = np.where(spectroscopy, 2.0 * seeing**2, np.pi * seeing**2)
+    n_pix = sky_area / pixel_scale_arcsec**2
+
+    collecting_area = np.pi * (aperture_m / 2.0) ** 2
+    photons = V_ZERO_POINT_PHOTONS * collecting_area * throughput * band_fraction
+    source_rate = photons * 10 ** (-0.4 * (mag + V_EXTINCTION_MAG_PER_AIRMASS * airmass))
+    sky_rate = photons * 10 ** (-0.4 * np.asarray(sky_mag, dtype=np.float64)) * sky_area
+
+    # (S t)^2 = snr^2 (S t + B t + n_pix R^2) -> a t^2 - b t - c = 0
+    a = source_rate**2
+    b = snr**2 * (source_rate + sky_rate)
+    c = snr**2 * n_pix * read_noise**2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (b + np.sqrt(b**2 + 4.0 * a * c)) / (2.0 * a)
+
+
+def _contiguous_windows(mask: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Start/end indices of runs of True along the last axis of ``mask``
+
+    Returns the leading indices of every run plus its (inclusive) start and
+    (exclusive) end position on the last axis.
+    """
+    padded = np.zeros(mask.shape[:-1] + (mask.shape[-1] + 2,), dtype=np.int8)
+    padded[..., 1:-1] = mask
+    edges = np.diff(padded, axis=-1)
+    *lead_start, starts = np.nonzero(edges == 1)
+    *_, ends = np.nonzero(edges == -1)
+    return (*lead_start, starts, ends)
 
 
 class ObservationPlanner:
@@ -16,48 +222,48 @@ class ObservationPlanner:
         self.observatories = {
             "VLT": {
                 "location": "Chile",
+                "latitude": -24.6272,
+                "longitude": -70.4042,
+                "elevation": 2635.0,
                 "aperture": 8.2,
                 "instruments": ["XSHOOTER", "FORS2", "MUSE"],
             },
             "Keck": {
                 "location": "Hawaii",
+                "latitude": 19.8263,
+                "longitude": -155.4747,
+                "elevation": 4145.0,
                 "aperture": 10.0,
                 "instruments": ["LRIS", "DEIMOS", "ESI"],
             },
             "LBT": {
                 "location": "Arizona",
+                "latitude": 32.7013,
+                "longitude": -109.8891,
+                "elevation": 3221.0,
                 "aperture": 8.4,
                 "instruments": ["MODS", "LUCI"],
             },
             "Gemini-N": {
                 "location": "Hawaii",
+                "latitude": 19.8238,
+                "longitude": -155.4690,
+                "elevation": 4213.0,
                 "aperture": 8.1,
                 "instruments": ["GMOS", "NIRI"],
             },
             "Gemini-S": {
                 "location": "Chile",
+                "latitude": -30.2407,
+                "longitude": -70.7367,
+                "elevation": 2722.0,
                 "aperture": 8.1,
                 "instruments": ["GMOS", "FLAMINGOS"],
             },
         }
 
-    def calculate_airmass(
-        self, declination: float, latitude: float = 19.8, lst: float = None
-    ) -> Dict:
-        """Calculate approximate airmass for a target"""
-        # Simplified airmass calculation
-        # Simplified: best airmass at transit
-        zenith_distance = abs(declination - latitude)
-        zenith_distance_rad = math.radians(zenith_distance)
-
-        # Airmass approximation
-        airmass = 1 / math.cos(zenith_distance_rad)
-
-        return {
-            "airmass": min(airmass, 3.0),  # Cap at 3
-            "zenith_distance_deg": zenith_distance,
-            "optimal": airmass < 1.5,
-        }
+        # Sun/Moon ephemerides keyed by (observatory, night, grid step in minutes)
+        self._ephemeris_cache: Dict[Tuple[str, date, float], NightEphemeris] = {}
 
     def parse_coordinates(self, ra_str: str, dec_str: str) -> Tuple[float, float]:
         """Parse RA/Dec strings to degrees"""
@@ -68,34 +274,318 @@ class ObservationPlanner:
 
         # Parse Dec
         dec_parts = dec_str.replace("d", " ").replace("m", " ").replace("s", "").split()
-        dec_deg = float(dec_parts[0]) + float(dec_parts[1]) / 60 + float(dec_parts[2]) / 3600
-        if dec_str.startswith("-"):
+        dec_deg = abs(float(dec_parts[0])) + float(dec_parts[1]) / 60 + float(dec_parts[2]) / 3600
+        if dec_str.strip().startswith("-"):
             dec_deg = -dec_deg
 
         return ra_deg, dec_deg
 
-    def generate_observation_plan(self, target: Dict) -> str:
-        """Generate detailed observation plan for a target"""
+    def night_time_grid(
+        self, night: date, observatories: Sequence[str], step_minutes: float = 10.0
+    ) -> np.ndarray:
+        """UTC time grid (M, T) centred on local midnight for each observatory
+
+        ``night`` is the calendar date on which the night starts (local evening).
+        """
+        step = np.timedelta64(int(round(step_minutes * 60)), "s")
+        n_steps = int(round(2 * NIGHT_HALF_WIDTH_HOURS * 60 / step_minutes)) + 1
+        offsets = np.arange(n_steps) * step - np.timedelta64(
+            int(NIGHT_HALF_WIDTH_HOURS * 3600), "s"
+        )
+
+        # Local mean midnight at longitude L (east positive) is 24h - L/15 after 0h UTC
+        start_of_day = np.datetime64(night.isoformat(), "s")
+        longitudes = np.array([self.observatories[name]["longitude"] for name in observatories])
+        midnight = start_of_day + (np.round((24.0 - longitudes / 15.0) * 3600)).astype(
+            "timedelta64[s]"
+        )
+        return midnight[:, None] + offsets[None, :]
+
+    def compute_observability(
+        self,
+        ra_deg: Sequence[float],
+        dec_deg: Sequence[float],
+        night: date,
+        target_ids: Optional[Sequence[str]] = None,
+        observatories: Optional[Sequence[str]] = None,
+        step_minutes: float = 10.0,
+        max_airmass: float = MAX_AIRMASS,
+        max_sun_altitude: Optional[float] = NAUTICAL_TWILIGHT_DEG,
+        min_moon_separation: Optional[float] = MIN_MOON_SEPARATION_DEG,
+    ) -> ObservabilityGrid:
+        """Vectorized observability for many targets at many sites over one night
+
+        Hour angle, altitude and airmass are computed for every combination of
+        target (N), observatory (M) and time step (T) with NumPy broadcasting.
+        Observable windows are the contiguous stretches where the airmass stays
+        at or below ``max_airmass``, the Sun is below ``max_sun_altitude`` and
+        the Moon is at least ``min_moon_separation`` degrees away. Pass ``None``
+        for either limit to skip the (cached) ephemeris lookup.
+        """
+        ra = np.atleast_1d(np.asarray(ra_deg, dtype=np.float64))
+        dec = np.atleast_1d(np.asarray(dec_deg, dtype=np.float64))
+        if ra.shape != dec.shape:
+            raise ValueError("ra_deg and dec_deg must have the same length")
+
+        if target_ids is None:
+            target_ids = [str(i) for i in range(len(ra))]
+        target_ids = list(target_ids)
+        observatories = list(observatories or self.observatories.keys())
+
+        times = self.night_time_grid(night, observatories, step_minutes)
+        latitudes = np.array([self.observatories[name]["latitude"] for name in observatories])
+        longitudes = np.array([self.observatories[name]["longitude"] for name in observatories])
+
+        # Local sidereal time (M, T) in degrees
+        lst_deg = _gmst_hours(_datetime64_to_jd(times)) * 15.0 + longitudes[:, None]
+
+        # Broadcast to (N, M, T)
+        hour_angle = np.mod(lst_deg[None, :, :] - ra[:, None, None] + 180.0, 360.0) - 180.0
+        altitude = altitude_from_hour_angle(
+            hour_angle, dec[:, None, None], latitudes[None, :, None]
+        )
+        airmass = airmass_from_altitude(altitude)
+        observable = airmass <= max_airmass
+
+        grid = ObservabilityGrid(
+            target_ids=target_ids,
+            observatories=observatories,
+            times_utc=times,
+            hour_angle_deg=hour_angle,
+            altitude_deg=altitude,
+            airmass=airmass,
+            observable=observable,
+        )
+
+        if max_sun_altitude is not None or min_moon_separation is not None:
+            ephemerides = [
+                self.get_night_ephemeris(name, night, step_minutes) for name in observatories
+            ]
+            grid.sun_altitude_deg = np.stack([eph.sun_altitude_deg for eph in ephemerides])
+            grid.moon_illumination = np.stack([eph.moon_illumination for eph in ephemerides])
+            moon_ra = np.stack([eph.moon_ra_deg for eph in ephemerides])
+            moon_dec = np.stack([eph.moon_dec_deg for eph in ephemerides])
+            grid.moon_separation_deg = angular_separation_deg(
+                ra[:, None, None], dec[:, None, None], moon_ra[None], moon_dec[None]
+            )
+
+            if max_sun_altitude is not None:
+                observable &= (grid.sun_altitude_deg <= max_sun_altitude)[None]
+            if min_moon_separation is not None:
+                moon_up = np.stack([eph.moon_altitude_deg for eph in ephemerides]) > 0.0
+                observable &= (grid.moon_separation_deg >= min_moon_separation) | ~moon_up[None]
+
+        grid.windows = self.observable_windows(grid)
+        return grid
+
+    def instrument_table(self, mode: Optional[str] = None) -> pd.DataFrame:
+        """One row per (observatory, instrument) with aperture and ETC parameters"""
+        rows = []
+        for name, site in self.observatories.items():
+            for instrument in site["instruments"]:
+                spec = INSTRUMENTS[instrument]
+                if mode is not None and spec["mode"] != mode:
+                    continue
+                rows.append(
+                    {
+                        "observatory": name,
+                        "instrument": instrument,
+                        "aperture": site["aperture"],
+                        "mode": spec["mode"],
+                        "throughput": spec["throughput"],
+                        "resolution": spec["resolution"],
+                    }
+                )
+        return pd.DataFrame(rows)
+
+    def estimate_exposures(
+        self,
+        mags: Sequence[float],
+        target_ids: Optional[Sequence[str]] = None,
+        snr=20.0,
+        airmass=1.2,
+        sky_mag=21.0,
+        mode: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Required exposure (s) for every (target, instrument) pair in one call
+
+        ``snr``, ``airmass`` and ``sky_mag`` may be scalars, one value per
+        target, or (target, instrument) arrays. Columns are labelled
+        ``"<observatory>/<instrument>"``.
+        """
+        mags = np.atleast_1d(np.asarray(mags, dtype=np.float64))
+        instruments = self.instrument_table(mode)
+
+        def per_target(value):
+            value = np.asarray(value, dtype=np.float64)
+            return value[:, None] if value.ndim == 1 else value
+
+        times = exposure_time(
+            mags[:, None],
+            instruments["aperture"].to_numpy()[None, :],
+            sky_mag=per_target(sky_mag),
+            airmass=per_target(airmass),
+            snr=per_target(snr),
+            throughput=instruments["throughput"].to_numpy()[None, :],
+            resolution=instruments["resolution"].to_numpy(dtype=np.float64)[None, :],
+        )
+        columns = (instruments["observatory"] + "/" + instruments["instrument"]).tolist()
+        index = list(target_ids) if target_ids is not None else None
+        return pd.DataFrame(times, index=index, columns=columns)
+
+    def exposure_per_observatory(
+        self, mags: Sequence[float], mode: str = "spectroscopy", **kwargs
+    ) -> np.ndarray:
+        """Fastest exposure per (target, observatory), aligned with ``self.observatories``
+
+        Observatories without an instrument in ``mode`` get ``inf``, which the
+        night scheduler treats as unschedulable.
+        """
+        table = self.estimate_exposures(mags, mode=mode, **kwargs)
+        best = np.full((len(table), len(self.observatories)), np.inf)
+        for m, name in enumerate(self.observatories):
+            columns = [c for c in table.columns if c.split("/")[0] == name]
+            if columns:
+                best[:, m] = table[columns].to_numpy().min(axis=1)
+        return best
+
+    def _exposure_range(self, mag: float, snr: float) -> str:
+        """Exposure range across the 8-10m spectrographs for a plan's text"""
+        if mag is None or not np.isfinite(mag):
+            return "unknown (no magnitude)"
+        times = self.estimate_exposures([mag], snr=snr, mode="spectroscopy").iloc[0]
+        return f"{times.min():.0f}-{times.max():.0f}s"
+
+    def get_night_ephemeris(
+        self, observatory: str, night: date, step_minutes: float = 10.0
+    ) -> NightEphemeris:
+        """Sun/Moon ephemeris for one site and night, computed once and cached
+
+        The expensive astropy body positions are evaluated once on the shared
+        night grid; every target planned for the same site and night reuses
+        them, so full-catalog planning stays linear in the number of targets.
+        """
+        key = (observatory, night, float(step_minutes))
+        cached = self._ephemeris_cache.get(key)
+        record_cache("ephemeris", cached is not None)
+        if cached is not None:
+            return cached
+
+        from astropy.coordinates import get_body
+        from astropy.time import Time
+
+        site = self.observatories[observatory]
+        times = self.night_time_grid(night, [observatory], step_minutes)[0]
+        jd = _datetime64_to_jd(times)
+        obstime = Time(jd, format="jd", scale="utc")
+
+        # Geocentric positions: lunar parallax (<1 deg) is negligible for these limits
+        sun = get_body("sun", obstime)
+        moon = get_body("moon", obstime)
+        sun_ra, sun_dec = sun.ra.deg, sun.dec.deg
+        moon_ra, moon_dec = moon.ra.deg, moon.dec.deg
+
+        lst_deg = _gmst_hours(jd) * 15.0 + site["longitude"]
+        sun_alt = altitude_from_hour_angle(lst_deg - sun_ra, sun_dec, site["latitude"])
+        moon_alt = altitude_from_hour_angle(lst_deg - moon_ra, moon_dec, site["latitude"])
+        elongation = angular_separation_deg(sun_ra, sun_dec, moon_ra, moon_dec)
+
+        twilight = {}
+        for label, level in (
+            ("nautical", NAUTICAL_TWILIGHT_DEG),
+            ("astronomical", ASTRONOMICAL_TWILIGHT_DEG),
+        ):
+            twilight[f"evening_{label}"] = _crossing_time(times, sun_alt, level, rising=False)
+            twilight[f"morning_{label}"] = _crossing_time(times, sun_alt, level, rising=True)
+
+        ephemeris = NightEphemeris(
+            observatory=observatory,
+            night=night,
+            times_utc=times,
+            sun_altitude_deg=sun_alt,
+            moon_ra_deg=moon_ra,
+            moon_dec_deg=moon_dec,
+            moon_altitude_deg=moon_alt,
+            moon_illumination=(1.0 - np.cos(np.radians(elongation))) / 2.0,
+            twilight=twilight,
+        )
+        self._ephemeris_cache[key] = ephemeris
+        return ephemeris
+
+    def observable_windows(
+        self, grid: ObservabilityGrid
+    ) -> Dict[Tuple[str, str], List[Tuple[datetime, datetime]]]:
+        """Collapse the observable mask into (start, end) UTC windows per target and site"""
+        if grid.times_utc.shape[1] > 1:
+            step = grid.times_utc[:, 1] - grid.times_utc[:, 0]
+        else:
+            step = np.zeros(grid.times_utc.shape[0], dtype="timedelta64[s]")
+        target_idx, site_idx, starts, ends = _contiguous_windows(grid.observable)
+
+        windows: Dict[Tuple[str, str], List[Tuple[datetime, datetime]]] = {
+            (target, site): [] for target in grid.target_ids for site in grid.observatories
+        }
+        for n, m, start, end in zip(target_idx, site_idx, starts, ends):
+            begin = grid.times_utc[m, start]
+            finish = grid.times_utc[m, end - 1] + step[m]
+            windows[(grid.target_ids[n], grid.observatories[m])].append(
+                (begin.astype(datetime), finish.astype(datetime))
+            )
+        return windows
+
+    def _observability_lines(
+        self, target_id: str, ra_deg: float, dec_deg: float, night: date
+    ) -> List[str]:
+        """Per-site observable windows and best airmass for one target and night"""
+        grid = self.compute_observability([ra_deg], [dec_deg], night, target_ids=[target_id])
+        dark = grid.sun_altitude_deg <= NAUTICAL_TWILIGHT_DEG
+
+        lines = [
+            f"Windows (UTC; airmass <= {MAX_AIRMASS:.1f}, Sun below "
+            f"{NAUTICAL_TWILIGHT_DEG:.0f}°, Moon >= {MIN_MOON_SEPARATION_DEG:.0f}° away):"
+        ]
+        for m, site in enumerate(grid.observatories):
+            best = np.where(dark[m], grid.airmass[0, m], np.inf).min()
+            airmass = f"min airmass {best:.2f}" if np.isfinite(best) else "below horizon"
+            windows = grid.windows[(target_id, site)]
+            spans = ", ".join(f"{a:%H:%M}-{b:%H:%M}" for a, b in windows)
+            lines.append(f"  {site:<9} {airmass:<18} {spans or 'not observable'}")
+        return lines
+
+    def generate_observation_plan(self, target: Dict, night: Optional[date] = None) -> str:
+        """Generate detailed observation plan for a target
+
+        Observability is computed for ``night`` (the date the night starts),
+        the target's ``night`` entry, or else tonight (UTC date).
+        """
+        if night is None:
+            night = (
+                date.fromisoformat(str(target["night"]))
+                if target.get("night")
+                else datetime.now(timezone.utc).date()
+            )
 
         ra_deg, dec_deg = self.parse_coordinates(target["ra"], target["dec"])
+        mag = target.get("mag")
+        mag_known = mag is not None and np.isfinite(mag)
+        obj_type = target.get("type") or "unknown"
 
         plan = []
         plan.append("=" * 80)
-        plan.append(f"OBSERVATION PLAN: {target['id']} ({target['name']})")
+        plan.append(f"OBSERVATION PLAN: {target['id']} ({target.get('name') or target['id']})")
         plan.append("=" * 80)
         plan.append("")
 
         # Basic info
         plan.append(f"Target: {target['id']}")
         plan.append(f"Coordinates: RA={ra_deg:.4f}°, Dec={dec_deg:.4f}°")
-        plan.append(f"Current Magnitude: {target['mag']:.1f}")
-        plan.append(f"Classification: {target['type']}")
-        plan.append(f"Discovery Date: {target['date']}")
+        plan.append(f"Current Magnitude: {mag:.1f}" if mag_known else "Current Magnitude: unknown")
+        plan.append(f"Classification: {obj_type}")
+        plan.append(f"Discovery Date: {target.get('date') or 'unknown'}")
         plan.append("")
 
         # Observability
-        airmass_info = self.calculate_airmass(dec_deg)
-        plan.append("--- OBSERVABILITY ---")
+        plan.append(f"--- OBSERVABILITY (night of {night.isoformat()}) ---")
         plan.append(f"Declination: {dec_deg:.1f}°")
 
         if abs(dec_deg) < 30:
@@ -105,18 +595,19 @@ class ObservationPlanner:
         else:
             plan.append("Visibility: Best from Southern hemisphere")
 
-        plan.append(f"Optimal airmass: {airmass_info['airmass']:.2f}")
-        plan.append(f"Airmass status: {'EXCELLENT' if airmass_info['optimal'] else 'ACCEPTABLE'}")
+        plan.extend(self._observability_lines(target["id"], ra_deg, dec_deg, night))
         plan.append("")
 
         # Recommended observations
         plan.append("--- RECOMMENDED OBSERVATIONS ---")
 
-        if "CV" in target["type"]:
+        if "CV" in obj_type:
             plan.append("SPECTROSCOPY (HIGHEST PRIORITY):")
             plan.append("  • Instrument: Low-resolution spectrograph")
             plan.append("  • Wavelength: 4000-7000 Å (cover Hα, Hβ, He lines)")
-            plan.append("  • Exposure: 300-600s for S/N>20 at current mag")
+            plan.append(
+                f"  • Exposure: {self._exposure_range(mag, 20.0)} for S/N>20 at current mag"
+            )
             plan.append("  • Goal: Identify emission lines, measure accretion state")
             plan.append("")
             plan.append("PHOTOMETRY:")
@@ -125,11 +616,14 @@ class ObservationPlanner:
             plan.append("  • Goal: Determine outburst type (dwarf nova vs. nova-like)")
             plan.append("")
 
-        elif "SN" in target["type"] or "unknown" in target["type"]:
+        elif "SN" in obj_type or "unknown" in obj_type:
             plan.append("SPECTROSCOPY:")
             plan.append("  • Instrument: Medium-resolution spectrograph")
             plan.append("  • Wavelength: 3500-9000 Å (full optical range)")
-            plan.append("  • Exposure: 900-1800s depending on telescope aperture")
+            plan.append(
+                f"  • Exposure: {self._exposure_range(mag, 10.0)} "
+                "for S/N>10 depending on telescope and instrument"
+            )
             plan.append("  • Goal: Classification, redshift measurement")
             plan.append("")
             plan.append("PHOTOMETRY:")
@@ -138,7 +632,7 @@ class ObservationPlanner:
             plan.append("  • Goal: Light curve classification, peak magnitude")
             plan.append("")
 
-        elif "GRB" in target["type"]:
+        elif "GRB" in obj_type:
             plan.append("RAPID FOLLOW-UP (URGENT):")
             plan.append("  • Multi-band photometry every 15 minutes for first 2 hours")
             plan.append("  • Spectroscopy ASAP (within 24 hours if possible)")
@@ -148,12 +642,12 @@ class ObservationPlanner:
         # Recommended telescopes
         plan.append("--- RECOMMENDED TELESCOPES ---")
 
-        if target["mag"] < 16:
+        if mag_known and mag < 16:
             # Bright target - smaller telescopes OK
             plan.append("Primary: 2-4m class (e.g., NOT, INT, LCO)")
             plan.append("Secondary: 8m class for spectroscopy")
             plan.append("Amateur: CCD photometry possible with 30cm+")
-        elif target["mag"] < 18:
+        elif mag_known and mag < 18:
             # Medium brightness
             plan.append("Primary: 4-8m class (e.g., VLT, Keck, Gemini)")
             plan.append("Secondary: 10m+ for high-S/N spectroscopy")
@@ -166,9 +660,11 @@ class ObservationPlanner:
 
         # Timeline
         plan.append("--- OBSERVING TIMELINE ---")
-        discovery_date = datetime.strptime(target["date"], "%Y-%m-%d")
-
-        plan.append(f"Day 0 (Discovery): {discovery_date.strftime('%Y-%m-%d')}")
+        if target.get("date"):
+            discovery_date = datetime.strptime(target["date"], "%Y-%m-%d")
+            plan.append(f"Day 0 (Discovery): {discovery_date.strftime('%Y-%m-%d')}")
+        else:
+            plan.append("Day 0 (Discovery): unknown")
         plan.append(f"Day +1-3: Photometric monitoring, initial classification")
         plan.append(f"Day +3-7: Spectroscopic confirmation")
         plan.append(f"Day +7-30: Light curve monitoring, evolution study")
@@ -176,24 +672,85 @@ class ObservationPlanner:
 
         # Expected outcomes
         plan.append("--- EXPECTED OUTCOMES ---")
-        if "CV" in target["type"]:
+        if "CV" in obj_type:
             plan.append("• Distance: 100-500 pc (if typical CV absolute magnitude)")
             plan.append("• Outburst amplitude: 2-5 magnitudes typical")
             plan.append("• Recurrence: Days to weeks if dwarf nova")
             plan.append("• Spectra: Strong Balmer emission, possibly He II")
-        elif "unknown" in target["type"]:
+        elif "unknown" in obj_type:
             plan.append("• Could be supernova at z=0.1-0.5")
             plan.append("• Or nearby Galactic variable (if extinction low)")
             plan.append("• Spectra will distinguish extragalactic vs. Galactic")
-        elif "GRB" in target["type"]:
+        elif "GRB" in obj_type:
             plan.append("• Redshift: z=0.5-3 typical for GRBs")
             plan.append("• Afterglow decay: Power law with index α~1-2")
             plan.append("• Host galaxy: Faint, star-forming")
 
         return "\n".join(plan)
 
-    def generate_all_plans(self):
-        """Generate observation plans for all targets"""
+    def generate_plans(
+        self,
+        targets: Sequence[Dict],
+        output_dir,
+        workers: Optional[int] = None,
+        force: bool = False,
+        night: Optional[date] = None,
+    ) -> Dict[str, Path]:
+        """Render plans for many targets in a process pool
+
+        Observability is computed for ``night`` (default: tonight, UTC date).
+        Targets whose inputs and night are unchanged since the last render into
+        ``output_dir`` are skipped unless ``force`` is set. Returns the plan
+        path for every target that has a plan on disk, rendered now or earlier.
+        """
+        night = night or datetime.now(timezone.utc).date()
+        render = partial(_render_plan, night=night)
+        output_dir = Path(output_dir).expanduser()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = RenderManifest(output_dir / PLAN_MANIFEST_NAME)
+
+        paths: Dict[str, Path] = {}
+        pending = []
+        for target in targets:
+            path = output_dir / f"plan_{target['id']}.txt"
+            paths[target["id"]] = path
+            digest = input_digest(
+                {"format": PLAN_FORMAT_VERSION, "target": target, "night": night.isoformat()}
+            )
+            if not force and manifest.is_current(target["id"], digest):
+                continue
+            pending.append((target, digest, path))
+
+        CACHE_REQUESTS.inc(len(paths) - len(pending), cache="plans", result="hit")
+        CACHE_REQUESTS.inc(len(pending), cache="plans", result="miss")
+        print(
+            f"🗓️  Rendering {len(pending)} observation plans "
+            f"({len(paths) - len(pending)} unchanged) into {output_dir}"
+        )
+
+        if pending:
+            if workers == 1 or len(pending) == 1:
+                rendered = map(render, [target for target, _, _ in pending])
+                self._write_plans(pending, rendered, manifest)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    rendered = pool.map(render, [target for target, _, _ in pending], chunksize=8)
+                    self._write_plans(pending, rendered, manifest)
+            manifest.save()
+
+        return {target_id: path for target_id, path in paths.items() if path.exists()}
+
+    @staticmethod
+    def _write_plans(pending, rendered, manifest: RenderManifest) -> None:
+        """Write rendered plan text and record each target in the manifest"""
+        for (target, digest, path), text in zip(pending, rendered):
+            if text is None:
+                continue
+            path.write_text(text, encoding="utf-8")
+            manifest.record(target["id"], digest, [path])
+
+    def generate_all_plans(self, output_dir=".", workers: Optional[int] = None):
+        """Generate observation plans for the reference targets"""
 
         targets = [
             {
@@ -225,20 +782,76 @@ class ObservationPlanner:
             },
         ]
 
-        for target in targets:
-            print(f"\nGenerating plan for {target['id']}...")
-            plan = self.generate_observation_plan(target)
+        for target_id, path in self.generate_plans(targets, output_dir, workers).items():
+            print(f"Saved {target_id} to: {path}")
 
-            filename = f"/Volumes/VIXinSSD/astra/plan_{target['id']}.txt"
-            with open(filename, "w") as f:
-                f.write(plan)
 
-            print(f"Saved to: {filename}")
+_WORKER_PLANNER: Optional["ObservationPlanner"] = None
+
+
+def _render_plan(target: Dict, night: Optional[date] = None) -> Optional[str]:
+    """Process-pool worker: render one plan with a per-process planner"""
+    global _WORKER_PLANNER
+    if _WORKER_PLANNER is None:
+        _WORKER_PLANNER = ObservationPlanner()
+    try:
+        return _WORKER_PLANNER.generate_observation_plan(target, night)
+    except Exception as exc:
+        print(f"   ✗ Failed to render plan for {target.get('id')}: {exc}")
+        return None
+
+
+def _plain_value(value):
+    """Convert NaN/NaT and NumPy scalars from catalog rows to plain Python values"""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        return value
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def load_plan_targets(catalog) -> List[Dict]:
+    """Plan targets from an anomalies list, DataFrame, or CSV/JSON catalog file
+
+    Rows without both coordinates are skipped; discovery dates are
+    normalised to ``YYYY-MM-DD``.
+    """
+    if isinstance(catalog, (str, Path)):
+        path = Path(catalog).expanduser()
+        if path.suffix == ".json":
+            catalog = pd.DataFrame(json.loads(path.read_text(encoding="utf-8")))
+        else:
+            catalog = pd.read_csv(path)
+    elif not isinstance(catalog, pd.DataFrame):
+        catalog = pd.DataFrame(list(catalog))
+
+    targets = []
+    skipped = 0
+    for record in catalog.to_dict("records"):
+        target = {key: _plain_value(value) for key, value in record.items()}
+        if not target.get("id") or not target.get("ra") or not target.get("dec"):
+            skipped += 1
+            continue
+        if target.get("mag") is not None:
+            target["mag"] = float(target["mag"])
+        if target.get("date") is not None:
+            parsed = pd.to_datetime(str(target["date"]).replace("/", "-"), errors="coerce")
+            target["date"] = None if pd.isna(parsed) else parsed.strftime("%Y-%m-%d")
+        target["ra"] = str(target["ra"])
+        target["dec"] = str(target["dec"])
+        targets.append(target)
+
+    if skipped:
+        print(f"   ⚠️ Skipping {skipped} targets without coordinates")
+    return targets
 
 
 if __name__ == "__main__":
     planner = ObservationPlanner()
-    planner.generate_all_plans()
+    planner.generate_all_plans(output_dir="observation_plans")
 
     print("\n" + "=" * 80)
     print("All observation plans generated successfully!")
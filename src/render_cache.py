@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Render Cache
+Input hashing and manifests for skipping unchanged rendered artifacts
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+
+def input_digest(payload) -> str:
+    """Stable SHA-256 digest of a JSON-serializable payload"""
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RenderManifest:
+    """Digest of the inputs behind every rendered artifact in a directory"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                print(f"   ⚠️ Ignoring unreadable manifest {self.path}: {exc}")
+                self.entries = {}
+
+    def is_current(self, key: str, digest: str) -> bool:
+        """True if ``key`` was rendered from ``digest`` and its outputs still exist"""
+        entry = self.entries.get(key)
+        if not entry or entry.get("digest") != digest:
+            return False
+        return all((self.path.parent / name).exists() for name in entry.get("outputs", []))
+
+    def record(self, key: str, digest: str, outputs: Optional[Iterable] = None) -> None:
+        """Remember the digest and output files (relative to the manifest) for ``key``"""
+        self.entries[key] = {
+            "digest": digest,
+            "outputs": [
+                os.path.relpath(str(output), str(self.path.parent)) for output in outputs or []
+            ],
+        }
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Results I/O
+JSON Lines sidecar of scored anomalies, so tools never re-parse the text report
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+RESULTS_FILENAME = "anomalies.jsonl"
+
+# Catalog columns copied onto each anomaly record when the run has them
+ENRICHMENT_COLUMNS = ("date", "ebv", "mag_corrected", "distance_mpc", "redshift")
+
+
+def priority_band(score: float) -> str:
+    """Follow-up band used by the text report"""
+    if score >= 7.0:
+        return "high"
+    if score >= 5.0:
+        return "medium"
+    return "low"
+
+
+def _jsonable(value):
+    """Plain JSON value for numpy scalars, missing values and timestamps"""
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if pd.isna(value):
+        return None
+    if isinstance(value, np.float32):
+        return float(str(value))  # 13.9, not 13.899999618530273
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp) and value == value.normalize():
+        return value.strftime("%Y-%m-%d")
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def result_records(anomalies: Sequence[Dict], transients=None) -> List[Dict]:
+    """Ranked anomaly records with enrichment columns joined from the catalog"""
+    enrichment: Dict[str, Dict] = {}
+    if transients is not None and not transients.empty and "id" in transients.columns:
+        columns = [column for column in ENRICHMENT_COLUMNS if column in transients.columns]
+        if columns:
+            rows = transients.drop_duplicates("id").set_index("id")[columns]
+            enrichment = rows.to_dict("index")
+
+    records = []
+    for rank, anomaly in enumerate(anomalies, 1):
+        record = {"rank": rank, "priority": priority_band(anomaly.get("score", 0.0))}
+        for column, value in enrichment.get(anomaly.get("id"), {}).items():
+            record[column] = value
+        record.update(anomaly)
+        records.append({key: _jsonable(value) for key, value in record.items()})
+    return records
+
+
+def write_results(anomalies: Sequence[Dict], path, transients=None) -> Path:
+    """Write one JSON object per anomaly, best first"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        for record in result_records(anomalies, transients):
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return path
+
+
+def resolve_results_path(path) -> Path:
+    """Accept a results file, a run directory, or any file inside a run directory"""
+    path = Path(path)
+    if path.is_dir():
+        return path / RESULTS_FILENAME
+    if path.suffix == ".jsonl":
+        return path
+    return path.parent / RESULTS_FILENAME
+
+
+def iter_results(path) -> Iterator[Dict]:
+    """Stream records from a results file (or the run directory holding it)"""
+    with open(resolve_results_path(path), "r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_results(path, limit: Optional[int] = None) -> List[Dict]:
+    """Records from a results file, stopping after ``limit`` when given"""
+    records = []
+    for record in iter_results(path):
+        if limit is not None and len(records) >= limit:
+            break
+        records.append(record)
+    return records
+
+
+def format_result(record: Dict) -> str:
+    """One-line summary in the text report's style"""
+    line = f"{record['rank']}. {record['id']} (Score: {record['score']:.1f}/10.0)"
+    if record.get("type"):
+        line += f" {record['type']}"
+    if record.get("mag") is not None:
+        line += f" m={record['mag']:.1f}"
+    return line
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Print or count records, for shell scripts"""
+    parser = argparse.ArgumentParser(description="Inspect an ASTRA anomalies.jsonl file")
+    parser.add_argument("path", help="Results file or run directory")
+    parser.add_argument("--top", type=int, default=None, help="Only show the best N anomalies")
+    parser.add_argument("--count", action="store_true", help="Print the number of anomalies")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.count:
+            print(sum(1 for _ in iter_results(args.path)))
+        else:
+            for record in read_results(args.path, args.top):
+                print(format_result(record))
+    except FileNotFoundError:
+        print(f"❌ Results file not found: {resolve_results_path(args.path)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
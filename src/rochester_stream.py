@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Streaming Rochester Parser
+Bounded-memory ingestion of Rochester pages with lxml's feed parser
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from lxml import etree
+
+CHUNK_SIZE = 64 * 1024
+
+# Page text is searched for entries once this much has been buffered; the
+# last TEXT_MARGIN characters wait for the next chunk so that entries (and
+# the context after them) are never cut in half.
+TEXT_WINDOW = 256 * 1024
+TEXT_MARGIN = 16 * 1024
+
+# Magnitude, type and position are read from this much text after an entry's
+# name, up to the start of the next entry
+CONTEXT_AFTER = 400
+
+# "AT2025abc = ZTF25... discovered 2025/10/17 ... Mag 15.1 Type LRN R.A. = ... Decl. = ..."
+ENTRY_PATTERN = r"(AT\d{4}[\w]+).*?discovered\s+(\d{4}/\d{2}/\d{2})"
+DEC_PATTERN = r"Decl\.\s*=\s*([\+\-\d\s\.\']+)"
+
+# Other designations listed between an entry's name and "discovered":
+# "AT2025abc = ZTF25aaabcde = TCP J12345678+1234567 discovered ..."
+ALIAS_PATTERN = re.compile(r"=\s*([A-Za-z][\w\-\+\.]*(?:\s+J[\d\+\-\.]+)?)")
+
+Chunk = Union[str, bytes]
+
+
+class _RochesterTarget:
+    """lxml parser target that turns Rochester markup into records
+
+    No tree is built: table cells are collected while their row is open and
+    page text is kept only until it has been searched for entries.
+    """
+
+    def __init__(self, entry_pattern, dec_pattern, max_entries):
+        self.entry_re = re.compile(entry_pattern)
+        self.dec_re = re.compile(dec_pattern)
+        self.max_entries = max_entries
+        self.records: List[Dict] = []
+        self.tables = 0
+        self.transient_tables: Dict[int, int] = {}  # table index -> row count
+        self.entries = 0
+
+        self._table_stack: List[Dict] = []
+        self._row: Optional[Dict] = None
+        self._cell: Optional[List[str]] = None
+        self._node: List[str] = []  # pieces of the current text node
+        self._text: List[str] = []
+        self._text_size = 0
+
+    # Parser target interface
+
+    def start(self, tag, attrib) -> None:
+        self._end_node()
+        if tag == "table":
+            self._table_stack.append({"index": self.tables, "rows": 0, "transient": False})
+            self.tables += 1
+        elif tag == "tr" and self._table_stack:
+            self._row = {"cells": [], "text": []}
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+
+    def end(self, tag) -> None:
+        self._end_node()
+        if tag in ("td", "th") and self._cell is not None and self._row is not None:
+            self._row["cells"].append("".join(self._cell))
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self._end_row()
+        elif tag == "table" and self._table_stack:
+            self._table_stack.pop()
+
+    def data(self, text) -> None:
+        self._node.append(text)
+
+    def close(self) -> None:
+        self._end_node()
+        self.search_entries(final=True)
+
+    # Tables
+
+    def _end_node(self) -> None:
+        if not self._node:
+            return
+        text = "".join(self._node)
+        self._node = []
+        self._text.append(text)
+        self._text_size += len(text)
+        if self._row is not None:
+            self._row["text"].append(text)
+            if self._cell is not None:
+                self._cell.append(text.strip())
+
+    def _end_row(self) -> None:
+        row, self._row = self._row, None
+        table = self._table_stack[-1]
+        table["rows"] += 1
+        if table["rows"] == 1:
+            header = "".join(row["text"])
+            table["transient"] = "Name" in header and "Mag" in header
+            if table["transient"]:
+                self.transient_tables[table["index"]] = 0
+            return
+        if not table["transient"]:
+            return
+        self.transient_tables[table["index"]] += 1
+
+        cells = row["cells"]
+        if len(cells) < 3:
+            return
+        name, mag_str, obj_type = cells[:3]
+
+        # Clean magnitude
+        mag = None
+        if mag_str and mag_str != "-":
+            mag_match = re.search(r"([\d\.]+)", mag_str)
+            if mag_match:
+                try:
+                    mag = float(mag_match.group(1))
+                except ValueError:
+                    return
+
+        # Only keep if it looks like a transient
+        if name and name.startswith(("AT", "SN")):
+            self.records.append(
+                {
+                    "id": name,
+                    "mag": mag,
+                    "type": obj_type,
+                    "source": f"Rochester_Table_{table['index']}",
+                }
+            )
+
+    # Individual entries
+
+    def search_entries(self, final: bool = False) -> None:
+        """Search buffered page text for entries, keeping an unsearched margin"""
+        if not final and self._text_size < TEXT_WINDOW:
+            return
+        if self.max_entries is not None and self.entries >= self.max_entries:
+            self._text, self._text_size = [], 0
+            return
+        text = "".join(self._text)
+        limit = len(text) if final else len(text) - TEXT_MARGIN
+
+        resume = limit
+        for match in self.entry_re.finditer(text):
+            if match.start() >= limit:
+                break
+            if match.end() > limit:
+                # The match might grow (or change) once more text arrives
+                resume = match.start()
+                break
+            if self.max_entries is not None and self.entries >= self.max_entries:
+                break
+            self.entries += 1
+            self.records.append(self._entry(match, text))
+
+        rest = text[resume:]
+        self._text = [rest] if rest else []
+        self._text_size = len(rest)
+
+    def _entry(self, match, text: str) -> Dict:
+        transient_id, date = match.groups()
+        end = match.start() + CONTEXT_AFTER
+        following = self.entry_re.search(text, match.end(), end)
+        context = text[match.start() : following.start() if following else end]
+
+        mag_match = re.search(r"Mag\s+([\d\.]+)", context)
+        type_match = re.search(r"Type\s+([\w\?]+)", context)
+        ra_match = re.search(r"R\.A\.\s*=\s*([\dhms\.]+)", context)
+        dec_match = self.dec_re.search(context)
+        aliases = ALIAS_PATTERN.findall(text, match.end(1), match.start(2))
+        try:
+            mag = float(mag_match.group(1)) if mag_match else None
+        except ValueError:
+            mag = None
+        return {
+            "id": transient_id,
+            "date": date,
+            "mag": mag,
+            "type": type_match.group(1) if type_match else "unknown",
+            "ra": ra_match.group(1) if ra_match else None,
+            "dec": dec_match.group(1).strip() if dec_match else None,
+            "source": "Rochester_Entries",
+            "aliases": ";".join(aliases) or None,
+        }
+
+
+class RochesterStreamParser:
+    """Incremental Rochester parser: feed chunks, collect finished records
+
+    Memory stays bounded by the chunk size, the text window and the rows of
+    a single open table row, whatever the size of the page. Records come out
+    in document order; like the tree-based parsers, at most ``max_entries``
+    individual entries are read (None for all of them).
+    """
+
+    def __init__(
+        self,
+        entry_pattern: str = ENTRY_PATTERN,
+        dec_pattern: str = DEC_PATTERN,
+        max_entries: Optional[int] = 100,
+        encoding: Optional[str] = None,
+    ):
+        self.target = _RochesterTarget(entry_pattern, dec_pattern, max_entries)
+        self._parser = etree.HTMLParser(target=self.target, recover=True, encoding=encoding)
+        self._fed = False
+
+    def feed(self, chunk: Chunk) -> List[Dict]:
+        """Parse one chunk (all ``str`` or all ``bytes``) and return the records it completed"""
+        if chunk:
+            self._parser.feed(chunk)
+            self._fed = True
+            self.target.search_entries()
+        return self._drain()
+
+    def close(self) -> List[Dict]:
+        """Finish the page and return the remaining records"""
+        if self._fed:
+            self._parser.close()
+        else:
+            self.target.close()
+        return self._drain()
+
+    def _drain(self) -> List[Dict]:
+        records, self.target.records = self.target.records, []
+        return records
+
+    @property
+    def tables(self) -> int:
+        return self.target.tables
+
+    @property
+    def transient_tables(self) -> Dict[int, int]:
+        return self.target.transient_tables
+
+    @property
+    def entries(self) -> int:
+        return self.target.entries
+
+
+def text_chunks(html: str, size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Split an already fetched page into parser-sized chunks"""
+    for start in range(0, len(html), size):
+        yield html[start : start + size]
+
+
+def iter_rochester_records(
+    chunks: Iterable[Chunk], parser: Optional[RochesterStreamParser] = None
+) -> Iterator[Dict]:
+    """Records from a Rochester page delivered as an iterable of chunks"""
+    parser = parser or RochesterStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
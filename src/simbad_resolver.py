@@ -7,18 +7,63 @@ Resolves transient IDs to coordinates for Gaia cross-matching
 import time
 
 import astropy.units as u
+import numpy as np
 import pandas as pd
 from astropy.coordinates import SkyCoord
-from astroquery.simbad import Simbad
+from astroquery.simbad import Simbad, SimbadClass
+
+from .http_client import endpoint, endpoint_overridden
+from .metrics import ERRORS, REMOTE_QUERIES
+from .telemetry import stage
+from .tracing import span
+
+
+class _SimbadMirror(SimbadClass):
+    """SIMBAD client for a TAP endpoint outside astroquery's list of mirrors"""
+
+    def __init__(self, tap_url: str):
+        super().__init__()
+        self._tap_url = tap_url
+
+    @property
+    def tap(self):
+        if self._tap is None:
+            from pyvo.dal import TAPService
+
+            self._tap = TAPService(baseurl=self._tap_url, session=self._session)
+        return self._tap
+
+
+def _first(result, column):
+    """First value of ``column`` in either astroquery's old (upper) or new (lower) case"""
+    for name in (column, column.lower(), column.upper()):
+        if name in result.colnames:
+            return result[name][0]
+    return None
+
+
+def _sexagesimal(ra, dec):
+    """TAP SIMBAD returns degrees; the pipelines expect Rochester-style strings"""
+    if not isinstance(ra, (float, np.floating)):
+        return ra, dec
+    coord = SkyCoord(float(ra) * u.deg, float(dec) * u.deg)
+    return (
+        coord.ra.to_string(unit=u.hourangle, sep="hms", precision=2, pad=True),
+        coord.dec.to_string(sep=" ", precision=1, alwayssign=True, pad=True),
+    )
 
 
 class SimbadResolver:
     """Resolve transient names to coordinates using SIMBAD"""
 
     def __init__(self):
-        # Configure SIMBAD query
-        Simbad.add_votable_fields("otype")
-        self.simbad = Simbad()
+        # Configure SIMBAD query (ASTRA_SIMBAD_URL points it at another TAP service)
+        if endpoint_overridden("simbad"):
+            self.simbad = _SimbadMirror(endpoint("simbad"))
+            self.simbad.add_votable_fields("otype")
+        else:
+            Simbad.add_votable_fields("otype")
+            self.simbad = Simbad()
 
     def resolve_name(self, name):
         """Resolve a single name to coordinates"""
@@ -36,12 +81,13 @@ class SimbadResolver:
 
             for test_name in names_to_try:
                 try:
-                    result = self.simbad.query_object(test_name)
+                    REMOTE_QUERIES.inc(service="simbad")
+                    with span("simbad.query_object", "remote", query=test_name):
+                        result = self.simbad.query_object(test_name)
                     if result is not None and len(result) > 0:
                         # Extract coordinates (RA and DEC are always returned)
-                        ra = result["RA"][0]
-                        dec = result["DEC"][0]
-                        obj_type = result["OTYPE"][0] if "OTYPE" in result.keys() else None
+                        ra, dec = _sexagesimal(_first(result, "RA"), _first(result, "DEC"))
+                        obj_type = _first(result, "OTYPE")
 
                         return {
                             "ra": ra,
@@ -51,6 +97,7 @@ class SimbadResolver:
                             "simbad_query": test_name,
                         }
                 except Exception as exc:
+                    ERRORS.inc(component="simbad")
                     print(f"   ⚠️ SIMBAD query error for {test_name}: {exc}")
 
             return None
@@ -59,6 +106,7 @@ class SimbadResolver:
             print(f"   ✗ Failed to resolve {name}: {e}")
             return None
 
+    @stage("resolve")
     def resolve_batch(self, names, batch_size=10, delay=1.0):
         """Resolve multiple names with rate limiting"""
         results = []
@@ -68,7 +116,8 @@ class SimbadResolver:
         for i, name in enumerate(names, 1):
             if i % batch_size == 0:
                 print(f"   Progress: {i}/{len(names)}...")
-                time.sleep(delay)  # Be nice to SIMBAD server
+                with span("simbad.rate_limit", "wait"):
+                    time.sleep(delay)  # Be nice to SIMBAD server
 
             result = self.resolve_name(name)
             if result:
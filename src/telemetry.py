@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Pipeline Telemetry
+Named pipeline stages that pluggable listeners (profilers, metrics) observe
+"""
+
+import cProfile
+import json
+import pstats
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Listeners implement enter(name) -> token and exit(name, token, error)
+_listeners: List = []
+
+
+def add_listener(listener) -> None:
+    """Start notifying ``listener`` of stage boundaries"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener) -> None:
+    """Stop notifying ``listener``"""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+@contextmanager
+def stage(name: str):
+    """Mark a pipeline stage; free when nobody is listening"""
+    if not _listeners:
+        yield
+        return
+
+    active = list(_listeners)
+    tokens = [listener.enter(name) for listener in active]
+    error = None
+    try:
+        yield
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        for listener, token in reversed(list(zip(active, tokens))):
+            listener.exit(name, token, error)
+
+
+@dataclass
+class StageStats:
+    """Accumulated timings for one stage"""
+
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    errors: int = 0
+
+
+class StageProfiler:
+    """Record wall time, CPU time and call counts per stage
+
+    Use as a context manager around a run. With ``cprofile`` set, each
+    outermost stage is also profiled with cProfile and the stats are merged
+    per stage name.
+    """
+
+    def __init__(self, cprofile: bool = False):
+        self.cprofile = cprofile
+        self.stats: Dict[str, StageStats] = {}
+        self.profiles: Dict[str, pstats.Stats] = {}
+        self._depth = 0
+
+    def __enter__(self) -> "StageProfiler":
+        add_listener(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        remove_listener(self)
+
+    def enter(self, name: str):
+        profile = None
+        # Only one cProfile can be active at a time, so nested stages are
+        # attributed to their outermost stage
+        if self.cprofile and self._depth == 0:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler already owns the interpreter
+                profile = None
+        self._depth += 1
+        return time.perf_counter(), time.process_time(), profile
+
+    def exit(self, name: str, token, error: Optional[BaseException]) -> None:
+        wall_start, cpu_start, profile = token
+        self._depth -= 1
+        if profile is not None:
+            profile.disable()
+            if name in self.profiles:
+                self.profiles[name].add(profile)
+            else:
+                self.profiles[name] = pstats.Stats(profile)
+
+        stats = self.stats.setdefault(name, StageStats())
+        stats.calls += 1
+        stats.wall_s += time.perf_counter() - wall_start
+        stats.cpu_s += time.process_time() - cpu_start
+        if error is not None:
+            stats.errors += 1
+
+    def summary_table(self) -> str:
+        """Plain-text table of stage timings"""
+        lines = [f"{'Stage':<14} {'Calls':>6} {'Wall (s)':>10} {'CPU (s)':>10} {'Errors':>7}"]
+        lines.append("-" * len(lines[0]))
+        for name, stats in self.stats.items():
+            lines.append(
+                f"{name:<14} {stats.calls:>6} {stats.wall_s:>10.3f} "
+                f"{stats.cpu_s:>10.3f} {stats.errors:>7}"
+            )
+        return "\n".join(lines)
+
+    def write(self, output_dir) -> Path:
+        """Write profile.json, profile.txt and per-stage .prof files; returns profile.txt"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "profile.json").write_text(
+            json.dumps({name: asdict(s) for name, s in self.stats.items()}, indent=2),
+            encoding="utf-8",
+        )
+        table_path = output_dir / "profile.txt"
+        table_path.write_text(self.summary_table() + "\n", encoding="utf-8")
+
+        for name, profile in self.profiles.items():
+            profile.dump_stats(str(output_dir / f"profile_{name.replace(' ', '_')}.prof"))
+        return table_path
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Tracing
+Span recording in the Chrome trace-event format (chrome://tracing, Perfetto)
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .telemetry import add_listener, remove_listener
+
+
+class _NullSpan:
+    """Shared do-nothing span returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "category", "args", "start_ns")
+
+    def __init__(self, recorder, name, category, args):
+        self.recorder = recorder
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args = dict(self.args, error=exc_type.__name__)
+        self.recorder.add(
+            self.name, self.category, self.start_ns, time.perf_counter_ns(), self.args
+        )
+        return False
+
+
+class TraceRecorder:
+    """Collect complete ("X") events from any thread"""
+
+    def __init__(self):
+        self.origin_ns = time.perf_counter_ns()
+        self.events: List[Dict] = []
+        self._thread_names: Dict[int, str] = {}
+
+    def add(self, name: str, category: str, start_ns: int, end_ns: int, args: Dict) -> None:
+        thread = threading.current_thread()
+        self._thread_names.setdefault(thread.ident, thread.name)
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self.origin_ns) / 1000.0,
+            "dur": (end_ns - start_ns) / 1000.0,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        self.events.append(event)  # list.append is atomic under the GIL
+
+    # Telemetry listener interface, so every pipeline stage is also a span
+    def enter(self, name: str) -> int:
+        return time.perf_counter_ns()
+
+    def exit(self, name: str, token: int, error: Optional[BaseException]) -> None:
+        args = {"error": type(error).__name__} if error is not None else {}
+        self.add(name, "stage", token, time.perf_counter_ns(), args)
+
+    def to_json(self) -> Dict:
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": n}}
+            for tid, n in self._thread_names.items()
+        ]
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_json()), encoding="utf-8")
+        return path
+
+
+_recorder: Optional[TraceRecorder] = None
+
+
+def span(name: str, category: str = "astra", /, **args):
+    """Context manager timing a span; a shared no-op object when tracing is off
+
+    ``name`` and ``category`` are positional-only, so any keyword (even
+    ``name=``) is recorded as span metadata.
+    """
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(recorder, name, category, args)
+
+
+def current_recorder() -> Optional[TraceRecorder]:
+    """The active recorder, or None when tracing is disabled"""
+    return _recorder
+
+
+def start_tracing() -> TraceRecorder:
+    """Begin recording spans (and pipeline stages) into a new recorder"""
+    global _recorder
+    stop_tracing()
+    _recorder = TraceRecorder()
+    add_listener(_recorder)
+    return _recorder
+
+
+def stop_tracing() -> Optional[TraceRecorder]:
+    """Stop recording; returns the recorder that was active, if any"""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        remove_listener(recorder)
+    return recorder
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+ASTRA: Transient Schema
+Compact in-memory dtypes for scraped transient frames
+"""
+
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+from .coordinates import parse_ra_dec
+
+# Rochester entries report discovery dates as 2025/10/17
+DATE_FORMAT = "%Y/%m/%d"
+
+# Records turned into a compact frame at a time by transient_frame
+FRAME_BATCH_SIZE = 50_000
+
+# In-memory dtypes for the scraped columns; ``ra``/``dec`` keep their strings
+TRANSIENT_DTYPES: Dict[str, str] = {
+    "type": "category",
+    "source": "category",
+    "mag": "float32",
+    "ra_deg": "float64",
+    "dec_deg": "float64",
+    "date": "datetime64[s]",
+}
+
+
+def normalize_transients(transients: pd.DataFrame) -> pd.DataFrame:
+    """Return a scraped transients frame with compact dtypes
+
+    ``type`` and ``source`` become categoricals, ``mag`` float32 and
+    ``date`` datetime64 (unparseable dates are NaT). When the frame has
+    ``ra``/``dec`` strings, ``ra_deg``/``dec_deg`` are added in degrees so
+    later stages don't parse them again. Columns already in the target
+    dtype are left alone, so normalizing twice is cheap.
+    """
+    df = transients.copy()
+    if "ra" in df.columns and "dec" in df.columns and "ra_deg" not in df.columns:
+        df["ra_deg"], df["dec_deg"] = parse_ra_dec(df["ra"], df["dec"])
+
+    for column, dtype in TRANSIENT_DTYPES.items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        values = df[column]
+        if dtype == "category":
+            values = values.where(values.notna(), None)
+        elif dtype.startswith("float"):
+            values = pd.to_numeric(values, errors="coerce")
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            pass
+        else:
+            values = pd.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+        df[column] = values.astype(dtype)
+    return df
+
+
+def _concat(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate normalized batches without falling back to object columns"""
+    for column, dtype in TRANSIENT_DTYPES.items():
+        if dtype != "category" or not all(column in frame.columns for frame in frames):
+            continue
+        categories = pd.Index(
+            sorted(set().union(*(frame[column].cat.categories for frame in frames)))
+        )
+        for frame in frames:
+            frame[column] = frame[column].cat.set_categories(categories)
+    return normalize_transients(pd.concat(frames, ignore_index=True))
+
+
+def transient_frame(records: Iterable[Dict], batch_size: int = FRAME_BATCH_SIZE) -> pd.DataFrame:
+    """Normalized transients frame from a stream of record dicts
+
+    Records are converted ``batch_size`` at a time, so only one batch of
+    dicts is alive while a large page is parsed; finished batches are kept
+    in the compact dtypes.
+    """
+    frames: List[pd.DataFrame] = []
+    batch: List[Dict] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            frames.append(normalize_transients(pd.DataFrame(batch)))
+            batch = []
+    if batch or not frames:
+        frames.append(normalize_transients(pd.DataFrame(batch)))
+    return frames[0] if len(frames) == 1 else _concat(frames)
@@ -10,6 +10,9 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+from .identity import merge_transients
+from .transient_schema import normalize_transients
+
 
 class TransientScraper:
     """Scraper for public transient data sources"""
@@ -17,6 +20,7 @@ class TransientScraper:
     def __init__(self):
         self.sources = {
             "rochester": "http://www.rochesterastronomy.org/supernova.html",
+            "rochester_archive": "http://www.rochesterastronomy.org/snimages/",
         }
 
     def scrape_rochester_page(self):
@@ -27,6 +31,12 @@ class TransientScraper:
         """Get recent transients from all sources."""
         return get_recent_transients(days=days)
 
+    def backfill_archive(self, years, store, **options):
+        """Load the Rochester year archives into a Parquet catalog store."""
+        from .archive_backfill import backfill_archive
+
+        return backfill_archive(years, store, **options)
+
 
 def scrape_rochester_sn_page():
     """Scrape Rochester Astronomy Supernova page for recent transients."""
@@ -124,12 +134,8 @@ def scrape_rochester_sn_page():
     df = pd.DataFrame(transients)
 
     if not df.empty:
-        # Remove duplicates, keeping the one with most info
-        df = df.sort_values(
-            "source",
-            key=lambda x: x.map({"Rochester_Entries": 1, "Rochester_Table_1": 0}),
-        )
-        df = df.drop_duplicates("id", keep="first")
+        # One row per object, filling each field from the best source that has it
+        df = merge_transients(normalize_transients(df))
 
     return df
 
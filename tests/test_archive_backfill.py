@@ -0,0 +1,171 @@
+"""Tests for archive_backfill module."""
+
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from astra_discoveries import main
+from src.archive_backfill import (
+    BACKFILL_MANIFEST_NAME,
+    PolitenessLimiter,
+    archive_links,
+    backfill_archive,
+    parse_years,
+    year_urls,
+)
+from src.catalog_store import load_catalog
+
+
+def _entry(name: str, date: str, mag: float) -> str:
+    return (
+        f"<p>{name} = ZTF{name[4:]} discovered {date} Mag {mag} Type Ia "
+        f"R.A. = 12h30m00.00s Decl. = +12 30' 00.0\"</p>"
+    )
+
+
+class _ThreadClock:
+    """Frozen monotonic clock; a thread's sleeps only advance its own view"""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def monotonic(self) -> float:
+        return getattr(self._local, "now", 0.0)
+
+    def sleep(self, seconds: float) -> None:
+        self._local.now = self.monotonic() + seconds
+
+
+PAGES = {
+    "/snimages/sn2024.html": (
+        "<html><body>"
+        + _entry("AT2024aaa", "2024/03/01", 16.5)
+        + '<a href="sn2024/AT2024bbb.html">AT2024bbb</a>'
+        + '<a href="sn2024/AT2024ccc.html#spectra">AT2024ccc</a>'
+        + '<a href="sn2023.html">2023</a>'
+        + '<a href="http://elsewhere.example/page.html">elsewhere</a>'
+        + "</body></html>"
+    ),
+    "/snimages/sn2024/AT2024bbb.html": _entry("AT2024bbb", "2024/05/02", 17.1),
+    "/snimages/sn2024/AT2024ccc.html": _entry("AT2024ccc", "2024/07/03", 18.2),
+    "/snimages/sn2025.html": _entry("AT2025aaa", "2025/01/04", 15.9),
+}
+
+
+class _ArchiveHandler(BaseHTTPRequestHandler):
+    hits: dict = {}
+
+    def do_GET(self) -> None:
+        hits = type(self).hits
+        hits[self.path] = hits.get(self.path, 0) + 1
+        page = PAGES.get(self.path)
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def archive(monkeypatch):
+    pytest.importorskip("pyarrow")
+    _ArchiveHandler.hits = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ArchiveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{httpd.server_address[1]}/snimages/"
+    monkeypatch.setenv("ASTRA_ROCHESTER_ARCHIVE_URL", base_url)
+    yield base_url
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestArchiveHelpers:
+    """Test suite for year parsing, link discovery and the politeness limit."""
+
+    def test_parse_years(self) -> None:
+        assert parse_years("2025") == [2025]
+        assert parse_years("2020-2022, 2018") == [2018, 2020, 2021, 2022]
+        for spec in ("", "2025-2020", "last year"):
+            with pytest.raises(ValueError):
+                parse_years(spec)
+
+    def test_archive_links(self) -> None:
+        """Only per-object pages below the archive root are followed."""
+        base_url = "http://host/snimages/"
+        links = archive_links(PAGES["/snimages/sn2024.html"], base_url + "sn2024.html", base_url)
+        assert links == [base_url + "sn2024/AT2024bbb.html", base_url + "sn2024/AT2024ccc.html"]
+        assert year_urls([2024], base_url) == [base_url + "sn2024.html"]
+
+    def test_limiter_spaces_out_requests(self) -> None:
+        clock = _ThreadClock()
+        limiter = PolitenessLimiter(max_connections=4, delay=0.05)
+        started = []
+
+        def request() -> None:
+            with limiter.slot():
+                started.append(clock.monotonic())
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        with patch("src.archive_backfill.time", clock):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert sorted(started) == pytest.approx([0.0, 0.05, 0.1, 0.15])
+
+
+class TestArchiveBackfill:
+    """Test suite for the concurrent, resumable backfill."""
+
+    def test_backfill_loads_every_page(self, archive, tmp_path) -> None:
+        result = backfill_archive([2024, 2025], tmp_path, workers=2, delay=0)
+
+        assert (result.pages, result.skipped, result.failed) == (4, 0, [])
+        catalog = load_catalog(tmp_path)
+        assert sorted(catalog["id"]) == ["AT2024aaa", "AT2024bbb", "AT2024ccc", "AT2025aaa"]
+        assert set(catalog["discovery_date"]) == {
+            "2024-03-01",
+            "2024-05-02",
+            "2024-07-03",
+            "2025-01-04",
+        }
+        assert (tmp_path / BACKFILL_MANIFEST_NAME).exists()
+        assert _ArchiveHandler.hits["/snimages/sn2024/AT2024ccc.html"] == 1
+
+    def test_backfill_resumes(self, archive, tmp_path) -> None:
+        """Loaded pages are skipped; only the year indexes are fetched again."""
+        backfill_archive([2024], tmp_path, workers=1, delay=0)
+        result = backfill_archive([2024], tmp_path, workers=1, delay=0)
+
+        assert (result.pages, result.skipped, result.rows) == (0, 3, 0)
+        assert _ArchiveHandler.hits["/snimages/sn2024.html"] == 2
+        assert _ArchiveHandler.hits["/snimages/sn2024/AT2024bbb.html"] == 1
+        assert len(load_catalog(tmp_path, latest=False)) == 3
+
+        forced = backfill_archive([2024], tmp_path, workers=1, delay=0, force=True)
+        assert forced.pages == 3
+
+    def test_missing_year_is_reported(self, archive, tmp_path) -> None:
+        result = backfill_archive([2023, 2025], tmp_path, workers=1, delay=0)
+
+        assert result.failed == [archive + "sn2023.html"]
+        assert result.pages == 1
+
+    def test_cli(self, archive, tmp_path, capsys) -> None:
+        assert main(["backfill", str(tmp_path), "--years", "2025", "--delay", "0"]) == 0
+        assert "Loaded 1 rows from 1 archive pages" in capsys.readouterr().out
+        assert main(["backfill", str(tmp_path), "--years", "2023"]) == 1
+        assert main(["backfill", str(tmp_path), "--years", "soon"]) == 1
@@ -0,0 +1,40 @@
+"""Tests for astra_discovery_engine module."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from src.astra_discovery_engine import AstraDiscoveryEngine
+
+
+class TestDiscoveryReport:
+    """Test suite for the basic pipeline's text report."""
+
+    def test_objects_without_cross_match(self) -> None:
+        """Rows that were never cross-matched carry NaN and are not reported as matches."""
+        anomalies = [
+            {
+                "id": "AT2025abc",
+                "mag": 13.9,
+                "type": "LRN",
+                "score": 8.0,
+                "reasons": ["Rare type: LRN"],
+                "gaia_match": np.nan,
+            },
+            {
+                "id": "AT2025abd",
+                "mag": 14.2,
+                "type": "unknown",
+                "score": 6.0,
+                "reasons": ["Bright (m=14.2)"],
+                "ra": "12h00m00.00s",
+                "dec": "+10 00 00",
+                "gaia_match": True,
+                "g_mag": None,
+            },
+        ]
+
+        report = AstraDiscoveryEngine().generate_discovery_report(anomalies)
+
+        assert report.count("Gaia:") == 1
+        assert "Gaia: Match found (G=N/A)" in report
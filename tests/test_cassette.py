@@ -0,0 +1,148 @@
+"""Tests for cassette module."""
+
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from astra_discoveries import main
+from src.cassette import Cassette, CassetteMiss, active_cassette, recorded_table, request_key
+from src.http_client import ConditionalFetcher
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self) -> None:
+        type(self).hits += 1
+        body = f"<html>page {type(self).hits} {self.path}</html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.hits = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestCassette:
+    """Test suite for HTTP record/replay."""
+
+    def test_replay_serves_recorded_responses(self, server, tmp_path) -> None:
+        """Recorded responses come back in order, then the last one repeats."""
+        with Cassette(tmp_path, mode="record"):
+            first = requests.get(f"{server}/supernova.html", timeout=5).text
+            second = requests.get(f"{server}/supernova.html", timeout=5).text
+
+        with Cassette(tmp_path, mode="replay") as cassette:
+            assert active_cassette() is cassette
+            replayed = [requests.get(f"{server}/supernova.html", timeout=5) for _ in range(3)]
+
+        assert _Handler.hits == 2
+        assert [r.text for r in replayed] == [first, second, second]
+        assert replayed[0].status_code == 200
+        assert replayed[0].headers["Content-Type"] == "text/html; charset=utf-8"
+        assert active_cassette() is None
+
+    def test_replay_needs_no_network(self, server, tmp_path) -> None:
+        """Sessions replay without reaching the server, and misses raise."""
+        with Cassette(tmp_path, mode="record"):
+            page = ConditionalFetcher(requests.Session()).fetch(f"{server}/a?y=2&x=1")
+
+        with Cassette(tmp_path, mode="replay"):
+            replayed = ConditionalFetcher(requests.Session()).fetch(f"{server}/a?x=1&y=2")
+            with pytest.raises(CassetteMiss):
+                requests.get(f"{server}/b", timeout=5)
+
+        assert replayed.text == page.text
+        assert _Handler.hits == 1
+
+    def test_recorded_latency(self, server, tmp_path) -> None:
+        """Recorded latency is reproduced on request."""
+        with Cassette(tmp_path, mode="record") as cassette:
+            requests.get(server, timeout=5)
+        elapsed = cassette.interactions[0]["elapsed"]
+
+        with patch("src.cassette.time.sleep") as mock_sleep:
+            with Cassette(tmp_path, mode="replay", latency="recorded"):
+                requests.get(server, timeout=5)
+            with Cassette(tmp_path, mode="replay"):
+                requests.get(server, timeout=5)
+
+        mock_sleep.assert_called_once_with(elapsed)
+
+    def test_missing_cassette(self, tmp_path) -> None:
+        """Replaying a directory that was never recorded fails early."""
+        with pytest.raises(FileNotFoundError):
+            Cassette(tmp_path / "missing", mode="replay")
+
+    def test_request_key_ignores_query_order(self) -> None:
+        """Query parameter order and host case do not change the key."""
+        assert request_key("get", "http://HOST/p?b=2&a=1") == request_key(
+            "GET", "http://host/p?a=1&b=2"
+        )
+        assert request_key("POST", "http://host/p", "q=1") != request_key(
+            "POST", "http://host/p", "q=2"
+        )
+
+    def test_recorded_table(self, tmp_path) -> None:
+        """Astroquery tables are stored as VOTables and read back on replay."""
+        table_module = pytest.importorskip("astropy.table")
+        table = table_module.Table({"source_id": [1, 2], "phot_g_mean_mag": [12.5, 18.25]})
+
+        assert recorded_table("gaia", "10 20 5", lambda: table) is table
+
+        with Cassette(tmp_path, mode="record"):
+            recorded = recorded_table("gaia", "10 20 5", lambda: table)
+        with Cassette(tmp_path, mode="replay"):
+            replayed = recorded_table("gaia", "10 20 5", lambda: pytest.fail("queried"))
+            with pytest.raises(CassetteMiss):
+                recorded_table("gaia", "0 0 5", lambda: table)
+
+        assert list(replayed["phot_g_mean_mag"]) == list(recorded["phot_g_mean_mag"])
+        assert list(replayed["source_id"]) == [1, 2]
+
+
+class TestCassetteCli:
+    """Test suite for --record/--replay."""
+
+    def test_record_then_replay_run(self, server, tmp_path) -> None:
+        """A replayed run sees the recorded page without touching the server."""
+        pages = []
+
+        def pipeline(html=None, alias_index=None):
+            pages.append(requests.get(f"{server}/supernova.html", timeout=5).text)
+            return None
+
+        cassette = tmp_path / "cassette"
+        with patch("astra_discoveries.run_advanced_discovery", side_effect=pipeline):
+            main(["--record", str(cassette), "--no-plans"])
+            main(["--replay", str(cassette), "--no-plans"])
+
+        assert _Handler.hits == 1
+        assert pages[0] == pages[1]
+
+    def test_replay_missing_cassette(self, tmp_path, capsys) -> None:
+        """A missing cassette is reported instead of falling back to the network."""
+        assert main(["--replay", str(tmp_path / "none")]) == 1
+        assert "Unable to open cassette" in capsys.readouterr().out
+
+    def test_record_and_replay_are_exclusive(self, tmp_path) -> None:
+        with pytest.raises(SystemExit):
+            main(["--record", str(tmp_path), "--replay", str(tmp_path)])
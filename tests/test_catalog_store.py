@@ -0,0 +1,161 @@
+"""Tests for catalog_store module."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from astra_discoveries import main
+from src.identity import ALIAS_INDEX_NAME, AliasIndex
+from src.catalog_store import (
+    PARTITION_COLUMN,
+    PYARROW_AVAILABLE,
+    load_catalog,
+    typed_catalog,
+    write_catalog,
+)
+
+INGESTED = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def transients() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": ["AT2025abc", "AT2025xyz", "SN2024aa"],
+            "date": ["2025/07/03", None, "2024/12/30"],
+            "mag": [15.2, None, 18.0],
+            "type": ["LRN", "Ia", "unknown"],
+            "ra": ["12:00:00.0", None, "01:02:03"],
+            "dec": ["+10:00:00", None, "-05:00:00"],
+            "source": ["Rochester_Entries", "Rochester_Table_1", "Rochester_Entries"],
+        }
+    )
+
+
+class TestTypedCatalog:
+    """Test suite for catalog dtypes."""
+
+    def test_dtypes_and_partition(self, transients: pd.DataFrame) -> None:
+        """Columns get storage dtypes; undated rows file under the ingestion date."""
+        catalog = typed_catalog(transients, [{"id": "AT2025abc", "score": 8.0}], INGESTED)
+
+        assert catalog["mag"].dtype == np.float32
+        assert catalog["type"].dtype == "category"
+        assert str(catalog["date"].dtype) == "datetime64[s]"
+        assert catalog["score"].tolist()[0] == 8.0
+        assert np.isnan(catalog["score"].tolist()[1])
+        assert catalog["ra_deg"].iloc[0] == pytest.approx(180.0)
+        assert catalog[PARTITION_COLUMN].tolist() == ["2025-07-03", "2025-09-01", "2024-12-30"]
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow not installed")
+class TestParquetStore:
+    """Test suite for the partitioned Parquet store."""
+
+    def test_round_trip_with_pruning(self, transients: pd.DataFrame, tmp_path: Path) -> None:
+        """Reads filter by partition, type and magnitude, keeping the latest sighting."""
+        write_catalog(transients, tmp_path, [{"id": "AT2025abc", "score": 8.0}], INGESTED)
+        brighter = transients.assign(mag=[14.9, None, 18.0])
+        write_catalog(brighter, tmp_path, ingested_at=datetime(2025, 9, 2, tzinfo=timezone.utc))
+
+        assert (tmp_path / f"{PARTITION_COLUMN}=2025-07-03").is_dir()
+        assert len(load_catalog(tmp_path, latest=False)) == 6
+
+        q3_lrns = load_catalog(
+            tmp_path, columns=["id", "mag"], start="2025-07-01", end="2025-09-30", types=["LRN"]
+        )
+        assert q3_lrns.columns.tolist() == ["id", "mag"]
+        assert q3_lrns["id"].tolist() == ["AT2025abc"]
+        assert q3_lrns["mag"].iloc[0] == pytest.approx(14.9)
+
+        catalog = load_catalog(tmp_path, max_mag=16.0)
+        assert catalog["id"].tolist() == ["AT2025abc"]
+        assert catalog["type"].dtype == "category"
+
+    def test_aliases_count_as_one_object(self, tmp_path: Path) -> None:
+        """A later sighting under a survey name replaces the earlier AT row."""
+        first = pd.DataFrame(
+            {
+                "id": ["AT2025abc"],
+                "mag": [15.2],
+                "type": ["LRN"],
+                "source": ["Rochester_Entries"],
+                "aliases": ["ZTF25aaabcde"],
+            }
+        )
+        write_catalog(first, tmp_path, ingested_at=INGESTED)
+        later = first.drop(columns="aliases").assign(id=["ZTF25aaabcde"], mag=[14.8])
+        write_catalog(later, tmp_path, ingested_at=datetime(2025, 9, 2, tzinfo=timezone.utc))
+
+        assert (tmp_path / ALIAS_INDEX_NAME).exists()
+        catalog = load_catalog(tmp_path, columns=["id", "mag"])
+        assert catalog["id"].tolist() == ["ZTF25aaabcde"]
+        assert len(load_catalog(tmp_path, latest=False)) == 2
+
+    def test_plan_command_reads_store(self, transients: pd.DataFrame, tmp_path: Path) -> None:
+        """`plan` accepts a store directory and plans only the matching objects."""
+        rochester = transients.assign(
+            ra=["12h00m00.00s", None, "01h02m03.00s"], dec=["+10 00 00", None, "-05 00 00"]
+        )
+        write_catalog(rochester, tmp_path / "store", ingested_at=INGESTED)
+        plans_dir = tmp_path / "plans"
+
+        status = main(
+            [
+                "plan",
+                str(tmp_path / "store"),
+                "--type",
+                "LRN",
+                "--since",
+                "2025-01-01",
+                "--output",
+                str(plans_dir),
+                "--workers",
+                "1",
+            ]
+        )
+
+        assert status == 0
+        assert [path.name for path in plans_dir.glob("plan_*.txt")] == ["plan_AT2025abc.txt"]
+
+
+class TestCliStore:
+    """Test suite for --catalog-store."""
+
+    def test_catalog_store_flag(self, transients: pd.DataFrame, tmp_path: Path) -> None:
+        """The run succeeds and writes the store when pyarrow is available."""
+        results = {"transients": transients, "anomalies": [], "report": "report"}
+        with patch("astra_discoveries.run_advanced_discovery", return_value=results), patch(
+            "astra_discoveries.Path.cwd", return_value=tmp_path
+        ):
+            status = main(
+                [
+                    "--no-plans",
+                    "--output",
+                    str(tmp_path / "run"),
+                    "--catalog-store",
+                    str(tmp_path / "store"),
+                ]
+            )
+
+        assert status == 0
+        assert (tmp_path / "store").is_dir() == PYARROW_AVAILABLE
+
+    def test_pipeline_uses_store_alias_index(self, tmp_path: Path) -> None:
+        """Runs merge with the aliases the store has already linked."""
+        index = AliasIndex(tmp_path / "store" / ALIAS_INDEX_NAME)
+        index.link(["AT2025abc", "ZTF25aaabcde"])
+        index.save()
+
+        with patch("astra_discoveries.run_advanced_discovery", return_value=None) as run:
+            main(["--no-plans", "--catalog-store", str(tmp_path / "store")])
+
+        alias_index = run.call_args.kwargs["alias_index"]
+        assert alias_index.path == index.path
+        assert alias_index.key("ZTF25aaabcde") == "2025abc"
@@ -8,6 +8,7 @@ from unittest.mock import Mock, patch
 
 import pandas as pd
 import pytest
+import requests
 
 from astra_discoveries import (
     _prepare_output_dir,
@@ -18,6 +19,7 @@ from astra_discoveries import (
     _write_results,
     main,
 )
+from src.http_client import FetchResult
 
 
 @pytest.fixture
@@ -198,6 +200,88 @@ class TestCLIMain:
         assert result == 0
         assert output_dir.exists()
 
+    def test_main_writes_plans_for_anomalies_with_coordinates(
+        self, sample_results: dict, tmp_path: Path
+    ) -> None:
+        """Test that runs render observation plans for positioned anomalies."""
+        sample_results["anomalies"][0].update(ra="03h12m44.50s", dec="+41 12 11")
+        output_dir = tmp_path / "run"
+        with patch("astra_discoveries.run_advanced_discovery", return_value=sample_results), patch(
+            "astra_discoveries.Path.cwd", return_value=tmp_path
+        ):
+            result = main(["--advanced", "--output", str(output_dir)])
+
+        assert result == 0
+        assert (output_dir / "plans" / "plan_AT2025test1.txt").exists()
+
+    def test_main_plan_command(self, tmp_path: Path) -> None:
+        """Test the plan subcommand renders plans from a catalog file."""
+        catalog = tmp_path / "catalog.csv"
+        pd.DataFrame(
+            [
+                {
+                    "id": "AT2025abao",
+                    "mag": 15.1,
+                    "type": "LRN",
+                    "ra": "03h12m44.50s",
+                    "dec": "+41 12 11",
+                },
+                {"id": "AT2025abne", "mag": 16.0, "type": "unknown", "ra": None, "dec": None},
+            ]
+        ).to_csv(catalog, index=False)
+        plans_dir = tmp_path / "plans"
+
+        result = main(["plan", str(catalog), "--output", str(plans_dir), "--workers", "1"])
+
+        assert result == 0
+        assert (plans_dir / "plan_AT2025abao.txt").exists()
+        assert not (plans_dir / "plan_AT2025abne.txt").exists()
+
+    def test_main_plan_command_store_filters_need_store(self, tmp_path: Path) -> None:
+        """Test that store filters are rejected for catalog files."""
+        catalog = tmp_path / "catalog.csv"
+        catalog.write_text("id,ra,dec\n", encoding="utf-8")
+
+        assert main(["plan", str(catalog), "--type", "LRN"]) == 1
+
+    def test_main_plan_command_missing_catalog(self, tmp_path: Path) -> None:
+        """Test the plan subcommand reports unreadable catalogs."""
+        result = main(["plan", str(tmp_path / "missing.csv")])
+
+        assert result == 1
+
+    def test_main_watch_runs_only_on_change(self, sample_results: dict, tmp_path: Path) -> None:
+        """Test that watch mode re-runs the pipeline only when the page changes."""
+        pages = [
+            FetchResult("http://example.org", "<html>1</html>", True, 200),
+            FetchResult("http://example.org", "<html>1</html>", False, 304),
+            FetchResult("http://example.org", "<html>2</html>", True, 200),
+        ]
+        with patch("src.http_client.ConditionalFetcher.fetch", side_effect=pages), patch(
+            "astra_discoveries.run_advanced_discovery", return_value=sample_results
+        ) as mock_run, patch("astra_discoveries.time.sleep") as mock_sleep, patch(
+            "astra_discoveries.Path.cwd", return_value=tmp_path
+        ):
+            result = main(["--watch", "--max-cycles", "3", "--output", str(tmp_path / "run")])
+
+        assert result == 0
+        assert [c.kwargs["html"] for c in mock_run.call_args_list] == [
+            "<html>1</html>",
+            "<html>2</html>",
+        ]
+        assert mock_sleep.call_count == 2
+
+    def test_main_watch_survives_poll_errors(self, tmp_path: Path) -> None:
+        """Test that failed polls are reported without stopping watch mode."""
+        with patch(
+            "src.http_client.ConditionalFetcher.fetch",
+            side_effect=requests.ConnectionError("offline"),
+        ) as mock_fetch, patch("astra_discoveries.time.sleep"):
+            result = main(["--watch", "--max-cycles", "2", "--interval", "1"])
+
+        assert result == 1
+        assert mock_fetch.call_count == 2
+
     def test_main_verbose_flag(self, sample_results: dict, tmp_path: Path) -> None:
         """Test main with verbose flag."""
         with patch("astra_discoveries.run_advanced_discovery", return_value=sample_results), patch(
@@ -0,0 +1,59 @@
+"""Tests for distances module."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.discovery_framework import AstraDiscoveryEngine
+from src.distances import add_distance_columns, estimate_distances
+
+
+class TestDistances:
+    """Test suite for vectorized distance estimates."""
+
+    def test_lookup_table_inverts_cosmology(self) -> None:
+        """Interpolated redshifts agree with astropy's distance modulus."""
+        cosmology = pytest.importorskip("astropy.cosmology")
+        redshifts = np.array([0.01, 0.1, 0.5, 1.0, 3.0])
+        mags = cosmology.Planck18.distmod(redshifts).value - 19.3
+
+        estimates = estimate_distances(mags, ["Ia"] * len(mags))
+
+        np.testing.assert_allclose(estimates.redshift, redshifts, rtol=1e-4)
+
+    def test_galactic_objects_use_euclidean_distance(self) -> None:
+        """Nearby objects fall back to the Euclidean distance modulus."""
+        estimates = estimate_distances([15.6], ["CV?"])
+
+        assert estimates.absolute_magnitude[0] == 7.5
+        assert estimates.luminosity_distance_mpc[0] * 1e6 == pytest.approx(
+            10 * 10 ** ((15.6 - 7.5) / 5)
+        )
+        assert estimates.redshift[0] < 1e-6
+
+    def test_missing_values(self) -> None:
+        """Unknown types use the default absolute magnitude and NaN magnitudes propagate."""
+        estimates = estimate_distances([np.nan, 18.0], [None, "mystery"])
+
+        assert np.isnan(estimates.redshift[0])
+        assert estimates.absolute_magnitude[1] == -15.0
+
+    def test_add_distance_columns(self) -> None:
+        """Catalog frames gain distance and redshift columns."""
+        frame = pd.DataFrame({"id": ["AT1", "AT2"], "mag": [17.0, None], "type": ["Ia", "LRN"]})
+
+        result = add_distance_columns(frame)
+
+        assert {"distance_mpc", "redshift"} <= set(result.columns)
+        assert "redshift" not in frame.columns
+        assert result["distance_mpc"].isna().tolist() == [False, True]
+
+    def test_engine_estimate_keys(self) -> None:
+        """The discovery framework keeps its distance estimate keys."""
+        estimate = AstraDiscoveryEngine().calculate_distance_estimate(20.4, "unknown")
+
+        assert estimate["distance_kpc"] == pytest.approx(estimate["distance_mpc"] * 1000)
+        assert estimate["method"] == "Assumed M=-15.0 for unknown"
+        assert estimate["redshift"] > 0
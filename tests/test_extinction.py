@@ -0,0 +1,136 @@
+"""Tests for coordinates and extinction modules."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.coordinates import icrs_to_galactic, parse_ra_dec
+from src.enhanced_discovery_v2 import EnhancedDiscoveryEngineV2
+from src.extinction import DustMap, add_extinction_columns, healpix_ring_index, load_dust_map
+
+
+@pytest.fixture
+def plate_carree_map(tmp_path: Path) -> Path:
+    """2-D map whose E(B-V) equals 0.01 per row (180 one-degree latitude rows)."""
+    path = tmp_path / "ebv_car.npy"
+    np.save(path, np.repeat((np.arange(180) * 0.01)[:, None], 360, axis=1).astype(np.float32))
+    return path
+
+
+class TestCoordinates:
+    """Test suite for vectorized coordinate handling."""
+
+    def test_parse_formats(self) -> None:
+        """Rochester, spaced, colon and decimal formats all parse."""
+        ra, dec = parse_ra_dec(
+            ["22h28m51.54s", "03h12m44.50s", "05:35:17.3", "83.633", None, "n/a"],
+            ["+53d17m43.1s", "+41 12 11", "-05:23:28", "-5.39", None, "n/a"],
+        )
+
+        np.testing.assert_allclose(ra[:4], [337.21475, 48.185417, 83.822083, 83.633], atol=1e-5)
+        np.testing.assert_allclose(dec[:4], [53.295306, 41.203056, -5.391111, -5.39], atol=1e-5)
+        assert np.isnan(ra[4:]).all() and np.isnan(dec[4:]).all()
+
+    def test_galactic_matches_astropy(self) -> None:
+        """The rotation matrix agrees with astropy to well under an arcsecond."""
+        coordinates = pytest.importorskip("astropy.coordinates")
+        rng = np.random.default_rng(3)
+        ra = rng.uniform(0, 360, 200)
+        dec = np.degrees(np.arcsin(rng.uniform(-0.99, 0.99, 200)))
+
+        gal_l, gal_b = icrs_to_galactic(ra, dec)
+        galactic = coordinates.SkyCoord(ra, dec, unit="deg").galactic
+
+        dl = (gal_l - galactic.l.deg + 180.0) % 360.0 - 180.0
+        assert np.abs(dl * np.cos(np.radians(gal_b))).max() < 1 / 3600
+        assert np.abs(gal_b - galactic.b.deg).max() < 1 / 3600
+
+
+class TestDustMap:
+    """Test suite for memory-mapped dust maps."""
+
+    def test_plate_carree_lookup(self, plate_carree_map: Path) -> None:
+        """Rows are indexed by Galactic latitude from the south pole."""
+        dust = DustMap(plate_carree_map)
+
+        ebv = dust.ebv_galactic([10.0, 200.0, 0.0, np.nan], [-89.5, 0.5, 89.9, 0.0])
+
+        np.testing.assert_allclose(ebv[:3], [0.0, 0.9, 1.79], atol=1e-6)
+        assert np.isnan(ebv[3])
+        assert isinstance(dust.data, np.memmap)
+
+    def test_healpix_ring_index(self) -> None:
+        """Poles land in the first and last rings and pixels cover the sphere evenly."""
+        nside = 4
+        assert healpix_ring_index(nside, [0.0], [90.0])[0] < 4
+        assert healpix_ring_index(nside, [0.0], [-90.0])[0] >= 12 * nside**2 - 4
+
+        rng = np.random.default_rng(0)
+        gal_l = rng.uniform(0, 360, 100_000)
+        gal_b = np.degrees(np.arcsin(rng.uniform(-1, 1, 100_000)))
+        counts = np.bincount(healpix_ring_index(nside, gal_l, gal_b), minlength=12 * nside**2)
+        assert counts.size == 12 * nside**2
+        assert counts.min() > 0.8 * counts.mean()
+
+    def test_healpix_map(self, tmp_path: Path) -> None:
+        """1-D maps are read as HEALPix RING arrays."""
+        path = tmp_path / "ebv_hpx.npy"
+        np.save(path, np.arange(12 * 2**2, dtype=np.float32))
+
+        dust = DustMap(path)
+
+        assert dust.nside == 2
+        assert dust.ebv_galactic([0.0], [-90.0])[0] >= 44
+
+    def test_invalid_map(self, tmp_path: Path) -> None:
+        """Maps of impossible shape are rejected."""
+        path = tmp_path / "bad.npy"
+        np.save(path, np.zeros(10))
+
+        with pytest.raises(ValueError):
+            DustMap(path)
+        assert load_dust_map(path) is None
+
+    def test_load_from_environment(self, plate_carree_map: Path, monkeypatch) -> None:
+        """The map path can come from ASTRA_DUST_MAP."""
+        monkeypatch.delenv("ASTRA_DUST_MAP", raising=False)
+        assert load_dust_map() is None
+
+        monkeypatch.setenv("ASTRA_DUST_MAP", str(plate_carree_map))
+        assert isinstance(load_dust_map(), DustMap)
+
+    def test_corrected_magnitudes_feed_scoring(self, plate_carree_map: Path) -> None:
+        """Extinction-corrected magnitudes drive the brightness score."""
+        transients = pd.DataFrame(
+            [
+                # Galactic centre: b ~ -0.05, so E(B-V) = 0.89
+                {
+                    "id": "AT2025dust",
+                    "mag": 16.5,
+                    "type": "unknown",
+                    "source": "Rochester",
+                    "ra": "17h45m40s",
+                    "dec": "-29 00 28",
+                },
+                {
+                    "id": "AT2025none",
+                    "mag": 16.5,
+                    "type": "unknown",
+                    "source": "Rochester",
+                    "ra": None,
+                    "dec": None,
+                },
+            ]
+        )
+
+        corrected = add_extinction_columns(transients, DustMap(plate_carree_map))
+        engine = EnhancedDiscoveryEngineV2()
+        dusty, clear = (engine.calculate_advanced_score(row)[0] for _, row in corrected.iterrows())
+
+        assert corrected["mag_corrected"].iloc[0] == pytest.approx(16.5 - 3.1 * 0.89, abs=0.02)
+        assert corrected["mag_corrected"].iloc[1] == 16.5
+        assert dusty > clear
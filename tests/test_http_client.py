@@ -0,0 +1,120 @@
+"""Tests for http_client module."""
+
+from __future__ import annotations
+
+import io
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.classification_engine import ClassificationEngine
+from src.http_client import (
+    ENDPOINTS,
+    ConditionalFetcher,
+    endpoint,
+    endpoint_overridden,
+    iter_body,
+)
+from src.metrics import BYTES_DOWNLOADED
+
+
+def _response(text: str = "", status_code: int = 200, headers: dict | None = None) -> Mock:
+    """Build a fake requests response."""
+    response = Mock()
+    response.text = text
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.raise_for_status = Mock()
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} error")
+    return response
+
+
+class TestConditionalFetcher:
+    """Test suite for ConditionalFetcher."""
+
+    def test_validators_are_sent_back(self) -> None:
+        """A 304 reuses the cached body and reports no change."""
+        session = Mock()
+        session.get.side_effect = [
+            _response("<html>v1</html>", headers={"ETag": '"abc"', "Last-Modified": "Mon"}),
+            _response(status_code=304),
+        ]
+        fetcher = ConditionalFetcher(session)
+
+        first = fetcher.fetch("http://example.org/sn.html")
+        second = fetcher.fetch("http://example.org/sn.html")
+
+        assert first.changed and first.text == "<html>v1</html>"
+        assert not second.changed and second.text == "<html>v1</html>"
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers == {"If-None-Match": '"abc"', "If-Modified-Since": "Mon"}
+
+    def test_body_digest_without_validators(self) -> None:
+        """Servers without validators are compared by content."""
+        session = Mock()
+        session.get.side_effect = [_response("same"), _response("same"), _response("new")]
+        fetcher = ConditionalFetcher(session)
+
+        changes = [fetcher.fetch("http://example.org/").changed for _ in range(3)]
+
+        assert changes == [True, False, True]
+        assert session.get.call_args.kwargs["headers"] == {}
+
+    def test_http_errors_raise(self) -> None:
+        """Error responses surface as requests exceptions."""
+        session = Mock()
+        session.get.return_value = _response(status_code=503)
+
+        with pytest.raises(requests.RequestException):
+            ConditionalFetcher(session).fetch("http://example.org/")
+
+
+class TestEndpoints:
+    """Test suite for the remote service endpoint overrides."""
+
+    def test_defaults(self, monkeypatch) -> None:
+        for variable, _ in ENDPOINTS.values():
+            monkeypatch.delenv(variable, raising=False)
+        assert endpoint("ned") == "https://ned.ipac.caltech.edu/cgi-bin/objsearch"
+        assert not endpoint_overridden("simbad")
+
+    def test_environment_override(self, monkeypatch) -> None:
+        monkeypatch.setenv("ASTRA_GAIA_URL", "http://127.0.0.1:8000/")
+        assert endpoint("gaia") == "http://127.0.0.1:8000/"
+        assert endpoint_overridden("gaia")
+
+    def test_classification_queries_follow_overrides(self, monkeypatch) -> None:
+        """NED and VizieR requests go to the overridden URLs."""
+        monkeypatch.setenv("ASTRA_NED_URL", "http://127.0.0.1:8001/ned")
+        monkeypatch.setenv("ASTRA_VIZIER_URL", "http://127.0.0.1:8002/vizier")
+        with patch(
+            "src.classification_engine.requests.get", return_value=_response('{"Preferred": []}')
+        ) as mock_get:
+            mock_get.return_value.json = Mock(return_value={"Preferred": []})
+            ClassificationEngine().classify_transient("AT2025abc", {"ra": 10.0, "dec": -5.0})
+
+        urls = [call.args[0] for call in mock_get.call_args_list]
+        assert urls == ["http://127.0.0.1:8001/ned", "http://127.0.0.1:8002/vizier"]
+
+
+class TestIterBody:
+    """Test suite for streamed response bodies."""
+
+    def test_decodes_across_chunks(self) -> None:
+        """Multi-byte characters split between chunks decode intact; bytes are counted."""
+        body = "<p>Décl. = +10 00 00 — ★</p>".encode("utf-8")
+        response = requests.Response()
+        response.raw = io.BytesIO(body)
+        response.encoding = "utf-8"
+        before = BYTES_DOWNLOADED.value(host="example.org")
+
+        text = "".join(iter_body(response, "http://example.org/sn.html", chunk_size=3))
+
+        assert text == body.decode("utf-8")
+        assert BYTES_DOWNLOADED.value(host="example.org") - before == len(body)
+
+    def test_text_only_response(self) -> None:
+        response = Mock(spec=["text", "status_code"], text="abcdef")
+        assert list(iter_body(response, "http://example.org/", chunk_size=4)) == ["abcd", "ef"]
@@ -0,0 +1,138 @@
+"""Tests for identity module."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from src.identity import AliasIndex, canonical_name, merge_transients, object_key
+from src.transient_schema import normalize_transients
+
+
+class TestDesignations:
+    """Test suite for canonical names and object keys."""
+
+    @pytest.mark.parametrize(
+        "name, canonical, key",
+        [
+            ("AT2025abao", "AT2025abao", "2025abao"),
+            ("AT 2025abao", "AT2025abao", "2025abao"),
+            (" sn 2025ABAO\xa0", "SN2025abao", "2025abao"),
+            ("SN 1987A", "SN1987A", "1987A"),
+            ("sn1987a", "SN1987a", "1987A"),
+            ("2025abao", "AT2025abao", "2025abao"),
+            ("TCP  J12345678+1234567", "TCP J12345678+1234567", "TCPJ12345678+1234567"),
+            ("ZTF25aaabcde", "ZTF25aaabcde", "ZTF25AAABCDE"),
+        ],
+    )
+    def test_spellings(self, name: str, canonical: str, key: str) -> None:
+        assert canonical_name(name) == canonical
+        assert object_key(name) == key
+
+    @pytest.mark.parametrize("name", [None, float("nan"), "", "  "])
+    def test_missing(self, name) -> None:
+        assert canonical_name(name) is None
+        assert object_key(name) is None
+
+
+class TestAliasIndex:
+    """Test suite for the persistent alias index."""
+
+    def test_link_prefers_iau_key(self) -> None:
+        index = AliasIndex()
+        key = index.link(["ZTF25aaabcde", "TCP J12345678+1234567"])
+        assert index.link(["ATLAS25xyz", "TCP J12345678+1234567"]) == key
+        assert index.key("ZTF25aaabcde") == index.key("atlas25xyz") == key
+        # An IAU name for any of them takes over the whole group
+        assert index.link(["AT 2025abc", "ATLAS25xyz"]) == "2025abc"
+
+        names = pd.Series(["ZTF25aaabcde", "tcp j12345678+1234567", "SN2025abc", None])
+        assert index.keys_for(names).tolist() == ["2025abc", "2025abc", "2025abc", None]
+
+    def test_persisted(self, tmp_path) -> None:
+        path = tmp_path / "aliases.json"
+        index = AliasIndex(path)
+        frame = pd.DataFrame({"id": ["AT2025abc", "AT2025abd"], "aliases": ["ZTF25aa;PS25b", None]})
+        assert index.update(frame) == 3
+        assert index.update(frame) == 0
+        index.save()
+
+        assert AliasIndex(path).key("PS25b") == "2025abc"
+        path.write_text("{not json", encoding="utf-8")
+        assert len(AliasIndex(path)) == 0
+
+
+class TestMergeTransients:
+    """Test suite for cross-source merging."""
+
+    def test_fields_coalesce_by_source_priority(self) -> None:
+        frame = normalize_transients(
+            pd.DataFrame(
+                [
+                    {
+                        "id": "ZTF25aaabcde",
+                        "mag": 14.0,
+                        "type": "LRN",
+                        "source": "Rochester_Table_3",
+                    },
+                    {
+                        "id": "AT 2025abc",
+                        "date": "2025/10/17",
+                        "mag": 13.8,
+                        "type": "LRN",
+                        "ra": "12h00m00.00s",
+                        "dec": "+10 00 00",
+                        "source": "Rochester_Entries",
+                        "aliases": "ZTF25aaabcde",
+                    },
+                    {"id": "SN2025abc", "mag": 13.9, "type": "LRN?", "source": "Rochester_Table_1"},
+                    {"id": "AT2025abd", "mag": None, "type": "Ia", "source": "Rochester_Table_2"},
+                    {"id": None, "mag": 12.0, "type": "Ia", "source": "Rochester_Table_2"},
+                ]
+            )
+        )
+        merged = merge_transients(frame)
+
+        assert merged["id"].tolist() == ["SN2025abc", "AT2025abd"]
+        first = merged.iloc[0]
+        # The table row wins where it has a value; the entry fills in the rest
+        assert (first["mag"], first["type"], first["source"]) == (
+            pytest.approx(13.9),
+            "LRN?",
+            "Rochester_Table_1",
+        )
+        assert first["date"] == pd.Timestamp("2025-10-17")
+        assert first["ra_deg"] == pytest.approx(180.0)
+        assert merged.dtypes.equals(frame.dtypes)
+
+    def test_any_table_outranks_entries(self) -> None:
+        frame = normalize_transients(
+            pd.DataFrame(
+                [
+                    {
+                        "id": "AT2025abc",
+                        "mag": 16.9,
+                        "type": "unknown",
+                        "source": "Rochester_Entries",
+                    },
+                    {"id": "AT2025abc", "mag": 15.1, "type": "Ia", "source": "Rochester_Table_0"},
+                ]
+            )
+        )
+        merged = merge_transients(frame)
+
+        assert len(merged) == 1
+        assert (merged["mag"].iloc[0], merged["type"].iloc[0]) == (pytest.approx(15.1), "Ia")
+        assert merged["source"].iloc[0] == "Rochester_Table_0"
+
+    def test_uses_given_index(self) -> None:
+        index = AliasIndex()
+        index.link(["AT2025abc", "Gaia25xyz"])
+        frame = pd.DataFrame({"id": ["Gaia25xyz", "AT2025abc"], "mag": [15.0, None]})
+
+        merged = merge_transients(frame, index)
+        assert merged.to_dict("records") == [{"id": "Gaia25xyz", "mag": 15.0}]
+
+    def test_empty(self) -> None:
+        empty = pd.DataFrame()
+        assert merge_transients(empty) is empty
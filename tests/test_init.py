@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -132,6 +135,47 @@ class TestModuleAll:
             assert hasattr(src, name), f"{name} not found in module"
 
 
+class TestLazyImports:
+    """Test that the CLI starts without importing the scientific stack."""
+
+    HEAVY_MODULES = (
+        "pandas",
+        "astropy",
+        "astroquery",
+        "bs4",
+        "requests",
+        "src.enhanced_discovery_v2",
+    )
+
+    def test_cli_import_stays_light(self) -> None:
+        """Importing the CLI and building --help loads none of the heavy modules."""
+        code = (
+            "import sys\n"
+            "import astra_discoveries\n"
+            "try:\n"
+            "    astra_discoveries.main(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            f"print('loaded:' + ','.join(m for m in {self.HEAVY_MODULES!r} if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).resolve().parents[1],
+            check=True,
+        )
+        assert result.stdout.splitlines()[-1] == "loaded:"
+
+    def test_unknown_attribute(self) -> None:
+        """Names outside the lazy table still raise AttributeError."""
+        import src
+
+        with pytest.raises(AttributeError):
+            src.NotAnEngine  # noqa: B018
+        assert "EnhancedDiscoveryEngineV2" in dir(src)
+
+
 @pytest.mark.integration
 class TestIntegrationDiscovery:
     """Integration tests for discovery functions."""
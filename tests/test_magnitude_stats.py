@@ -0,0 +1,126 @@
+"""Tests for magnitude_stats module."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.discovery_framework import AstraDiscoveryEngine
+from src.magnitude_stats import MagnitudeStats, RunningMoments
+
+
+class TestMagnitudeStats:
+    """Test suite for streaming magnitude statistics."""
+
+    def test_chunked_moments_match_numpy(self) -> None:
+        """Feeding chunks gives the same moments as a single pass."""
+        rng = np.random.default_rng(1)
+        mags = rng.normal(17.5, 1.3, size=10_000)
+        stats = MagnitudeStats()
+        for chunk in np.array_split(mags, 7):
+            stats.update(chunk)
+
+        summary = stats.summary()
+        assert summary["total_objects"] == mags.size
+        assert summary["mean_magnitude"] == pytest.approx(mags.mean())
+        assert summary["std_magnitude"] == pytest.approx(mags.std())
+        assert summary["median_magnitude"] == pytest.approx(np.median(mags), abs=0.005)
+        mad = np.median(np.abs(mags - np.median(mags)))
+        assert summary["mad_magnitude"] == pytest.approx(mad, abs=0.01)
+
+    def test_variance_is_stable_for_large_offsets(self) -> None:
+        """Nearly constant streams keep their tiny variance."""
+        moments = RunningMoments()
+        values = 1e8 + np.tile([0.0, 0.01], 5000)
+        for chunk in np.array_split(values, 10):
+            moments.update(chunk)
+
+        assert moments.std == pytest.approx(0.005, rel=1e-4)
+
+    def test_merge_matches_update(self) -> None:
+        """Moments accumulated separately merge into the combined result."""
+        a, b, combined = RunningMoments(), RunningMoments(), RunningMoments()
+        a.update(np.array([15.0, 16.0, 17.0]))
+        b.update(np.array([20.0, 21.0]))
+        combined.update(np.array([15.0, 16.0, 17.0, 20.0, 21.0]))
+        a.merge(b)
+
+        assert a.count == combined.count
+        assert a.mean == pytest.approx(combined.mean)
+        assert a.variance == pytest.approx(combined.variance)
+
+    def test_per_type_breakdown_ignores_missing(self) -> None:
+        """Types are tracked separately and NaN magnitudes are skipped."""
+        stats = MagnitudeStats()
+        stats.update(
+            pd.DataFrame({"mag": [15.0, 17.0, np.nan, 19.0], "type": ["CV", "CV", "SN", None]})
+        )
+
+        by_type = stats.summary()["by_type"]
+        assert set(by_type) == {"CV", "unknown"}
+        assert by_type["CV"]["mean_magnitude"] == pytest.approx(16.0)
+
+    def test_engine_streams_chunks(self) -> None:
+        """The discovery framework accepts chunked catalogs."""
+        engine = AstraDiscoveryEngine()
+        chunks = [
+            pd.DataFrame({"id": [f"AT{i}" for i in range(20)], "mag": 18.0, "type": "SN"}),
+            pd.DataFrame({"id": ["AT2025bright"], "mag": [10.0], "type": ["CV"]}),
+        ]
+
+        stats = engine.analyze_brightness_distribution(chunks)
+
+        assert stats["total_objects"] == 21
+        assert [obj["id"] for obj in stats["bright_outliers"]] == ["AT2025bright"]
+
+    def test_engine_accepts_generator(self) -> None:
+        """A one-shot generator of chunks still yields the outliers."""
+        engine = AstraDiscoveryEngine()
+        chunks = (
+            pd.DataFrame({"id": ids, "mag": mags, "type": "SN"})
+            for ids, mags in ((["AT1", "AT2", "AT3"] * 7, 18.0), (["AT2025bright"], 10.0))
+        )
+
+        stats = engine.analyze_brightness_distribution(chunks)
+
+        assert stats["total_objects"] == 22
+        assert [obj["id"] for obj in stats["bright_outliers"]] == ["AT2025bright"]
+
+    def test_engine_reads_chunks_once(self) -> None:
+        """Outliers from early chunks are kept although the stream is read once."""
+
+        class _OneShot:
+            def __init__(self, chunks) -> None:
+                self.chunks = chunks
+                self.reads = 0
+
+            def __iter__(self):
+                self.reads += 1
+                return iter(self.chunks if self.reads == 1 else [])
+
+        engine = AstraDiscoveryEngine()
+        chunks = _OneShot(
+            [
+                pd.DataFrame({"id": ["AT2025bright", "AT1"], "mag": [10.0, 18.0], "type": "CV"}),
+                pd.DataFrame({"id": [f"AT{i}" for i in range(2, 22)], "mag": 18.0, "type": "SN"}),
+            ]
+        )
+
+        stats = engine.analyze_brightness_distribution(chunks)
+
+        assert chunks.reads == 1
+        assert [obj["id"] for obj in stats["bright_outliers"]] == ["AT2025bright"]
+
+    def test_engine_default_keys(self) -> None:
+        """In-memory analysis keeps the original keys."""
+        engine = AstraDiscoveryEngine()
+        engine.load_recent_transients()
+
+        stats = engine.analyze_brightness_distribution()
+
+        mags = np.array([t["mag"] for t in engine.transient_data])
+        assert stats["mean_magnitude"] == pytest.approx(mags.mean())
+        assert stats["std_magnitude"] == pytest.approx(mags.std())
+        assert stats["min_magnitude"] == mags.min()
+        assert stats["bright_outliers"] == []
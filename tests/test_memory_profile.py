@@ -0,0 +1,80 @@
+"""Tests for memory_profile module."""
+
+from __future__ import annotations
+
+import json
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+
+from astra_discoveries import main
+from src.memory_profile import MemoryProfiler
+from src.telemetry import stage
+
+SAMPLE_HTML = (Path(__file__).parent / "data" / "rochester_sample.html").read_text(encoding="utf-8")
+
+# Tracers (coverage) and the interpreter free small objects of their own
+# between a stage's baseline and its first allocation
+SLACK = 16 * 1024
+
+
+class TestMemoryProfiler:
+    """Test suite for per-stage memory snapshots."""
+
+    def test_peak_and_retained(self) -> None:
+        """Temporary buffers count toward peak, kept ones toward retained."""
+        kept = []
+        with MemoryProfiler() as profiler:
+            with stage("parse"):
+                scratch = bytearray(4_000_000)
+                del scratch
+                kept.append(bytearray(1_000_000))
+
+        stats = profiler.stats["parse"]
+        assert stats.calls == 1
+        assert stats.peak_bytes >= 4_000_000 - SLACK
+        assert 900_000 <= stats.retained_bytes < 2_000_000
+        assert stats.top_sites[0]["site"].endswith(f"{Path(__file__).name}:31")
+        assert not tracemalloc.is_tracing()
+
+    def test_nested_peak_propagates(self) -> None:
+        """An inner stage's peak is part of the outer stage's peak."""
+        with MemoryProfiler() as profiler:
+            with stage("outer"):
+                with stage("inner"):
+                    scratch = bytearray(3_000_000)
+                    del scratch
+
+        assert profiler.stats["inner"].peak_bytes >= 3_000_000 - SLACK
+        assert profiler.stats["outer"].peak_bytes >= 3_000_000 - SLACK
+
+    def test_peak_is_growth_above_stage_start(self) -> None:
+        """Freeing older data does not inflate the peak; the low-water figure shows it."""
+        with MemoryProfiler() as profiler:
+            old = bytearray(5_000_000)
+            with stage("parse"):
+                del old
+                scratch = bytearray(2_000_000)
+                del scratch
+
+        stats = profiler.stats["parse"]
+        assert stats.peak_bytes < SLACK
+        assert stats.peak_above_low_bytes >= 2_000_000 - SLACK
+        assert stats.retained_bytes <= -4_000_000
+
+    def test_cli_memory(self, tmp_path: Path) -> None:
+        """--memory writes a per-stage report into the run directory."""
+
+        class _Response:
+            text = SAMPLE_HTML
+
+        output_dir = tmp_path / "run"
+        with patch("src.enhanced_discovery_v2.requests.get", return_value=_Response()), patch(
+            "astra_discoveries.Path.cwd", return_value=tmp_path
+        ):
+            result = main(["--advanced", "--memory", "--no-plans", "--output", str(output_dir)])
+
+        assert result == 0
+        stages = json.loads((output_dir / "memory.json").read_text())
+        assert {"fetch+parse", "dedup", "enrich", "score", "write"} <= set(stages)
+        assert "Top allocation sites" in (output_dir / "memory.txt").read_text()
@@ -0,0 +1,139 @@
+"""Tests for metrics module."""
+
+from __future__ import annotations
+
+import urllib.request
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from astra_discoveries import main
+from src.metrics import (
+    ANOMALIES,
+    BYTES_DOWNLOADED,
+    STAGE_SECONDS,
+    MetricsRegistry,
+    StageMetrics,
+    record_anomalies,
+    record_download,
+    serve_metrics,
+)
+from src.telemetry import add_listener, remove_listener, stage
+
+
+class TestMetricsRegistry:
+    """Test suite for Prometheus rendering."""
+
+    def test_counter_and_gauge_rendering(self) -> None:
+        """Counters and gauges render with HELP/TYPE lines and escaped labels."""
+        registry = MetricsRegistry()
+        queries = registry.counter("astra_test_queries_total", "Queries", ("service",))
+        queries.inc(service="gaia")
+        queries.inc(2, service='ned "v2"')
+        registry.gauge("astra_test_up", "Up").set(1)
+
+        text = registry.render()
+
+        assert "# TYPE astra_test_queries_total counter" in text
+        assert 'astra_test_queries_total{service="gaia"} 1.0' in text
+        assert 'astra_test_queries_total{service="ned \\"v2\\""} 2.0' in text
+        assert "astra_test_up 1.0" in text
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Histogram buckets count every observation at or below the bound."""
+        registry = MetricsRegistry()
+        latency = registry.histogram("astra_test_seconds", "Latency", ("stage",), buckets=(0.1, 1))
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value, stage="parse")
+
+        text = registry.render()
+
+        assert 'astra_test_seconds_bucket{stage="parse",le="0.1"} 1' in text
+        assert 'astra_test_seconds_bucket{stage="parse",le="1.0"} 2' in text
+        assert 'astra_test_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+        assert 'astra_test_seconds_count{stage="parse"} 3' in text
+
+    def test_label_validation(self) -> None:
+        """Metrics reject unknown or missing labels and negative increments."""
+        counter = MetricsRegistry().counter("astra_test_total", "Test", ("service",))
+
+        with pytest.raises(ValueError):
+            counter.inc(host="x")
+        with pytest.raises(ValueError):
+            counter.inc(-1, service="gaia")
+
+    def test_textfile_and_http_endpoint(self, tmp_path: Path) -> None:
+        """The registry is written atomically and served over HTTP."""
+        registry = MetricsRegistry()
+        registry.counter("astra_test_total", "Test").inc()
+
+        path = registry.write_textfile(tmp_path / "astra.prom")
+        server = serve_metrics(0, registry=registry)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as resp:
+                body = resp.read().decode("utf-8")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert path.read_text() == body
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestRecorders:
+    """Test suite for pipeline metric helpers."""
+
+    def test_stage_metrics_listener(self) -> None:
+        """Stage latencies are observed per stage name."""
+        listener = StageMetrics()
+        add_listener(listener)
+        try:
+            with stage("metrics-test"):
+                pass
+        finally:
+            remove_listener(listener)
+
+        assert STAGE_SECONDS.series[("metrics-test",)]["count"] >= 1
+
+    def test_record_anomalies_and_downloads(self) -> None:
+        """Anomalies are banded like the report and bytes are counted per host."""
+        before = BYTES_DOWNLOADED.value(host="example.org")
+
+        class _Response:
+            content = b"x" * 100
+
+        record_download("http://example.org/page.html", _Response())
+        record_anomalies([{"score": 8.0}, {"score": 5.5}, {"score": 6.0}])
+
+        assert BYTES_DOWNLOADED.value(host="example.org") == before + 100
+        assert ANOMALIES.value(band="high") == 1
+        assert ANOMALIES.value(band="medium") == 2
+
+    def test_cli_writes_metrics(self, tmp_path: Path) -> None:
+        """Each run writes metrics.prom into the run directory and the textfile path."""
+        results = {
+            "transients": None,
+            "anomalies": [{"id": "AT2025x", "score": 7.5, "mag": 15.0, "type": "LRN"}],
+            "report": "report",
+        }
+        textfile = tmp_path / "collector" / "astra.prom"
+        with patch("astra_discoveries.run_advanced_discovery", return_value=results), patch(
+            "astra_discoveries.Path.cwd", return_value=tmp_path
+        ):
+            status = main(["--output", str(tmp_path / "run"), "--metrics-file", str(textfile)])
+
+        assert status == 0
+        text = (tmp_path / "run" / "metrics.prom").read_text()
+        assert 'astra_stage_duration_seconds_count{stage="write"}' in text
+        assert 'astra_anomalies{band="high"} 1.0' in text
+        assert 'astra_runs_total{mode="advanced",status="success"}' in textfile.read_text()
+
+    def test_cli_rejects_metrics_port_without_watch(self, capsys) -> None:
+        """A one-shot run has no endpoint to serve, so --metrics-port needs --watch."""
+        with patch("astra_discoveries.run_advanced_discovery") as run, pytest.raises(SystemExit):
+            main(["--metrics-port", "9109"])
+
+        run.assert_not_called()
+        assert "--metrics-port needs --watch" in capsys.readouterr().err
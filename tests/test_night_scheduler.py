@@ -0,0 +1,122 @@
+"""Tests for night_scheduler module."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.night_scheduler import NightScheduler, format_night_plan
+from src.observation_planner import ObservationPlanner
+
+
+@pytest.fixture
+def grid():
+    """Observability grid for a handful of well-placed targets."""
+    planner = ObservationPlanner()
+    return planner.compute_observability(
+        [337.2, 83.7, 10.0, 40.0, 120.0],
+        [53.3, -5.0, -80.0, 20.0, 10.0],
+        date(2025, 10, 20),
+        target_ids=["AT2025aaxb", "AT2025orion", "AT2025south", "AT2025mid", "AT2025late"],
+    )
+
+
+@pytest.fixture
+def anomalies() -> list:
+    """Ranked anomalies matching the grid targets."""
+    return [
+        {"id": "AT2025aaxb", "score": 8.5},
+        {"id": "AT2025orion", "score": 7.0},
+        {"id": "AT2025south", "score": 6.5},
+        {"id": "AT2025mid", "score": 6.0},
+        {"id": "AT2025late", "score": 5.0},
+    ]
+
+
+def _check_plan(plan: dict, scheduler: NightScheduler, grid) -> None:
+    """Assert that a plan has no overlaps and only uses observable time."""
+    seen = set()
+    for site, observations in plan.items():
+        m = grid.observatories.index(site)
+        times = grid.times_utc[m]
+        for previous, current in zip(observations, observations[1:]):
+            assert previous.end <= current.start
+        for obs in observations:
+            assert obs.target_id not in seen
+            seen.add(obs.target_id)
+            n = grid.target_ids.index(obs.target_id)
+            inside = (times >= np.datetime64(obs.start)) & (times < np.datetime64(obs.end))
+            assert grid.observable[n, m, inside].all()
+
+
+class TestNightScheduler:
+    """Test suite for NightScheduler."""
+
+    def test_greedy_plan_is_valid(self, grid, anomalies) -> None:
+        """Greedy plans never overlap and respect observability."""
+        scheduler = NightScheduler(slot_minutes=30)
+        plan = scheduler.schedule(anomalies, grid, exposure_s=1200, method="greedy")
+
+        _check_plan(plan, scheduler, grid)
+        assert sum(len(obs) for obs in plan.values()) == len(anomalies)
+
+    def test_exact_matches_or_beats_greedy(self, grid, anomalies) -> None:
+        """The exact solver is never worse than the heuristic."""
+        scheduler = NightScheduler(slot_minutes=60)
+        greedy = scheduler.schedule(anomalies, grid, exposure_s=3 * 3600, method="greedy")
+        exact = scheduler.schedule(anomalies, grid, exposure_s=3 * 3600, method="exact")
+
+        def total(plan):
+            return sum(obs.score for observations in plan.values() for obs in observations)
+
+        _check_plan(exact, scheduler, grid)
+        assert total(exact) >= total(greedy) - 1e-9
+
+    def test_single_site_capacity(self, grid, anomalies) -> None:
+        """When time is scarce the highest scores win."""
+        scheduler = NightScheduler(slot_minutes=30, overhead_seconds=0)
+        exposure = np.full((len(anomalies), len(grid.observatories)), np.inf)
+        exposure[:, grid.observatories.index("Keck")] = 6.5 * 3600
+
+        plan = scheduler.schedule(anomalies, grid, exposure_s=exposure, method="greedy")
+
+        assert [obs.target_id for obs in plan["Keck"]] == ["AT2025aaxb"]
+        assert all(not plan[site] for site in plan if site != "Keck")
+
+    def test_unknown_targets_ignored(self, grid) -> None:
+        """Anomalies that are not on the grid are skipped."""
+        plan = NightScheduler().schedule([{"id": "AT2025none", "score": 9.0}], grid)
+
+        assert all(observations == [] for observations in plan.values())
+
+    def test_invalid_method(self, grid, anomalies) -> None:
+        """Unknown scheduling methods are rejected."""
+        with pytest.raises(ValueError):
+            NightScheduler().schedule(anomalies, grid, method="annealing")
+
+    def test_slot_not_multiple_of_grid_step(self, grid, anomalies) -> None:
+        """Slot lengths are rounded to whole grid steps, so blocks never overlap."""
+        scheduler = NightScheduler(slot_minutes=25)
+        plan = scheduler.schedule(anomalies, grid, exposure_s=1200, method="greedy")
+
+        _check_plan(plan, scheduler, grid)
+        for observations in plan.values():
+            for obs in observations:
+                assert (obs.end - obs.start).total_seconds() % 600 == 0
+
+    def test_slot_shorter_than_grid_step(self, grid, anomalies) -> None:
+        """Slots cannot be finer than the observability grid."""
+        with pytest.raises(ValueError):
+            NightScheduler(slot_minutes=2).schedule(anomalies, grid)
+
+    def test_format_night_plan(self, grid, anomalies) -> None:
+        """The text plan lists every observatory and scheduled target."""
+        plan = NightScheduler().schedule(anomalies, grid, method="greedy")
+        text = format_night_plan(plan)
+
+        assert "ASTRA NIGHT PLAN" in text
+        for site in grid.observatories:
+            assert site in text
+        assert "AT2025aaxb" in text
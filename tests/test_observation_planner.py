@@ -0,0 +1,331 @@
+"""Tests for observation_planner module."""
+
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.observation_planner import (
+    ObservationPlanner,
+    airmass_from_altitude,
+    altitude_from_hour_angle,
+    exposure_time,
+    load_plan_targets,
+)
+
+
+@pytest.fixture
+def planner() -> ObservationPlanner:
+    """Create an ObservationPlanner instance for testing."""
+    return ObservationPlanner()
+
+
+class TestCoordinateParsing:
+    """Test RA/Dec string parsing."""
+
+    def test_parse_northern_target(self, planner: ObservationPlanner) -> None:
+        """Test parsing of a northern-hemisphere target."""
+        ra, dec = planner.parse_coordinates("22h28m51.54s", "+53d17m43.1s")
+
+        assert ra == pytest.approx(337.21475, abs=1e-4)
+        assert dec == pytest.approx(53.29531, abs=1e-4)
+
+    def test_parse_southern_target(self, planner: ObservationPlanner) -> None:
+        """Test that negative declinations keep their sign."""
+        _, dec = planner.parse_coordinates("10h11m12.11s", "-12 44 55")
+
+        assert dec == pytest.approx(-12.74861, abs=1e-4)
+
+
+class TestObservabilityEngine:
+    """Test the vectorized observability engine."""
+
+    def test_altitude_at_transit(self) -> None:
+        """A target on the meridian culminates at 90 - |dec - lat|."""
+        alt = altitude_from_hour_angle(np.array([0.0]), np.array([10.0]), np.array([30.0]))
+
+        assert alt[0] == pytest.approx(70.0)
+
+    def test_airmass_below_horizon_is_infinite(self) -> None:
+        """Targets below the horizon have infinite airmass."""
+        airmass = airmass_from_altitude(np.array([90.0, 30.0, -5.0]))
+
+        assert airmass[0] == pytest.approx(1.0, abs=1e-3)
+        assert airmass[1] == pytest.approx(2.0, abs=0.01)
+        assert np.isinf(airmass[2])
+
+    def test_grid_shapes(self, planner: ObservationPlanner) -> None:
+        """Results broadcast to N targets x M sites x T steps."""
+        grid = planner.compute_observability(
+            [337.2, 83.7, 10.0],
+            [53.3, -5.0, -80.0],
+            date(2025, 10, 20),
+            target_ids=["north", "equator", "south"],
+            step_minutes=15,
+        )
+
+        n_sites = len(planner.observatories)
+        assert grid.altitude_deg.shape == (3, n_sites, grid.times_utc.shape[1])
+        assert grid.airmass.shape == grid.observable.shape
+        assert set(grid.windows) == {
+            (target, site) for target in grid.target_ids for site in grid.observatories
+        }
+
+    def test_windows_respect_hemisphere(self, planner: ObservationPlanner) -> None:
+        """Far-southern targets are never observable from Hawaii or Arizona."""
+        grid = planner.compute_observability(
+            [10.0], [-80.0], date(2025, 10, 20), target_ids=["south"]
+        )
+
+        assert grid.windows[("south", "Keck")] == []
+        assert grid.windows[("south", "LBT")] == []
+        assert grid.windows[("south", "VLT")]
+
+    def test_windows_match_mask(self, planner: ObservationPlanner) -> None:
+        """Every reported window covers only observable time steps."""
+        grid = planner.compute_observability(
+            [83.7], [-5.0], date(2025, 10, 20), target_ids=["orion"], max_airmass=1.5
+        )
+
+        for (target, site), spans in grid.windows.items():
+            m = grid.observatories.index(site)
+            times = grid.times_utc[m].astype("datetime64[s]")
+            for start, end in spans:
+                inside = (times >= np.datetime64(start)) & (times < np.datetime64(end))
+                assert grid.observable[0, m, inside].all()
+                assert (grid.airmass[0, m, inside] <= 1.5).all()
+
+    def test_mismatched_inputs_raise(self, planner: ObservationPlanner) -> None:
+        """RA and Dec arrays must line up."""
+        with pytest.raises(ValueError):
+            planner.compute_observability([1.0, 2.0], [3.0], date(2025, 10, 20))
+
+
+class TestEphemerisCache:
+    """Test the per-site, per-night Sun/Moon ephemeris cache."""
+
+    def test_ephemeris_is_cached(self, planner: ObservationPlanner) -> None:
+        """Repeated lookups for the same site and night reuse one computation."""
+        first = planner.get_night_ephemeris("Keck", date(2025, 10, 20))
+        second = planner.get_night_ephemeris("Keck", date(2025, 10, 20))
+        other = planner.get_night_ephemeris("VLT", date(2025, 10, 20))
+
+        assert first is second
+        assert other is not first
+        assert len(planner._ephemeris_cache) == 2
+
+    def test_twilight_ordering(self, planner: ObservationPlanner) -> None:
+        """Astronomical twilight nests inside nautical twilight."""
+        twilight = planner.get_night_ephemeris("Keck", date(2025, 10, 20)).twilight
+
+        assert twilight["evening_nautical"] < twilight["evening_astronomical"]
+        assert twilight["evening_astronomical"] < twilight["morning_astronomical"]
+        assert twilight["morning_astronomical"] < twilight["morning_nautical"]
+
+    def test_daytime_is_not_observable(self, planner: ObservationPlanner) -> None:
+        """Observable steps always have the Sun below the twilight limit."""
+        grid = planner.compute_observability(
+            [337.2, 83.7], [53.3, -5.0], date(2025, 10, 20), max_sun_altitude=-12.0
+        )
+
+        sun_up = grid.sun_altitude_deg > -12.0
+        assert sun_up.any()
+        assert not grid.observable[:, sun_up].any()
+
+    def test_moon_separation_limit(self, planner: ObservationPlanner) -> None:
+        """A target next to the Moon is masked while the Moon is up."""
+        eph = planner.get_night_ephemeris("VLT", date(2025, 10, 20))
+        mid = len(eph.times_utc) // 2
+        grid = planner.compute_observability(
+            [eph.moon_ra_deg[mid]],
+            [eph.moon_dec_deg[mid]],
+            date(2025, 10, 20),
+            observatories=["VLT"],
+            max_sun_altitude=None,
+            min_moon_separation=30.0,
+        )
+
+        assert grid.moon_separation_deg[0, 0, mid] < 1.0
+        moon_up = eph.moon_altitude_deg > 0.0
+        assert not grid.observable[0, 0, moon_up & (grid.moon_separation_deg[0, 0] < 30.0)].any()
+
+    def test_limits_can_be_disabled(self, planner: ObservationPlanner) -> None:
+        """Skipping both limits avoids the ephemeris lookup entirely."""
+        grid = planner.compute_observability(
+            [83.7], [-5.0], date(2025, 10, 20), max_sun_altitude=None, min_moon_separation=None
+        )
+
+        assert grid.sun_altitude_deg is None
+        assert planner._ephemeris_cache == {}
+
+
+class TestExposureTimeCalculator:
+    """Test the vectorized exposure-time calculator."""
+
+    def test_fainter_targets_need_longer_exposures(self) -> None:
+        """Exposure grows by more than the flux ratio in the background-limited regime."""
+        times = exposure_time(np.array([16.0, 18.0, 20.0]), 8.2, resolution=1000)
+
+        assert np.all(np.diff(times) > 0)
+        assert times[2] / times[1] > 10 ** (0.4 * 2.0)
+
+    def test_bigger_aperture_is_faster(self) -> None:
+        """A 10m telescope beats a 2m telescope at fixed magnitude."""
+        times = exposure_time(19.0, np.array([2.0, 10.0]), resolution=1000)
+
+        assert times[1] < times[0]
+
+    def test_higher_snr_costs_more(self) -> None:
+        """Without read noise the exposure scales as the square of the S/N."""
+        low, high = exposure_time(22.0, 8.2, snr=np.array([10.0, 20.0]), read_noise=0.0)
+
+        assert high == pytest.approx(4.0 * low)
+
+    def test_every_target_instrument_pair(self, planner: ObservationPlanner) -> None:
+        """The planner returns one column per (observatory, instrument)."""
+        table = planner.estimate_exposures([15.6, 20.4], target_ids=["bright", "faint"])
+        n_instruments = sum(len(site["instruments"]) for site in planner.observatories.values())
+
+        assert table.shape == (2, n_instruments)
+        assert "Keck/LRIS" in table.columns
+        assert (table.loc["faint"] > table.loc["bright"]).all()
+
+    def test_per_target_airmass(self, planner: ObservationPlanner) -> None:
+        """Per-target airmass values broadcast across instruments."""
+        table = planner.estimate_exposures([18.0, 18.0], airmass=[1.0, 2.0], mode="spectroscopy")
+
+        assert (table.iloc[1] > table.iloc[0]).all()
+
+    def test_exposure_per_observatory(self, planner: ObservationPlanner) -> None:
+        """The best exposure per site is aligned with the observatory list."""
+        best = planner.exposure_per_observatory([18.0])
+        table = planner.estimate_exposures([18.0], mode="spectroscopy")
+
+        assert best.shape == (1, len(planner.observatories))
+        keck = list(planner.observatories).index("Keck")
+        assert best[0, keck] == pytest.approx(
+            table[["Keck/LRIS", "Keck/DEIMOS", "Keck/ESI"]].min(axis=1).iloc[0]
+        )
+
+    def test_plan_uses_computed_exposures(self, planner: ObservationPlanner) -> None:
+        """The observation plan no longer prints fixed exposure ranges."""
+        target = {
+            "id": "AT2025aaxb",
+            "name": "TCP J22285154+5317431",
+            "mag": 15.6,
+            "date": "2025-10-17",
+            "type": "CV?",
+            "ra": "22h28m51.54s",
+            "dec": "+53d17m43.1s",
+        }
+        plan = planner.generate_observation_plan(target)
+
+        assert "300-600s" not in plan
+        assert "for S/N>20 at current mag" in plan
+
+    def test_plan_observability_from_engine(self, planner: ObservationPlanner) -> None:
+        """The plan lists each site's windows and best dark-time airmass for the night."""
+        target = {
+            "id": "AT2025aaxb",
+            "ra": "22h28m51.54s",
+            "dec": "+53d17m43.1s",
+            "night": "2025-10-20",
+        }
+        plan = planner.generate_observation_plan(target)
+
+        grid = planner.compute_observability([337.2147], [53.2953], date(2025, 10, 20))
+        keck = grid.observatories.index("Keck")
+        dark = grid.sun_altitude_deg[keck] <= -12.0
+        best = grid.airmass[0, keck][dark].min()
+        start, end = grid.windows[("0", "Keck")][0]
+
+        assert "--- OBSERVABILITY (night of 2025-10-20) ---" in plan
+        assert f"Keck      min airmass {best:.2f}" in plan
+        assert f"{start:%H:%M}-{end:%H:%M}" in plan
+        assert "VLT       min airmass" in plan and "not observable" in plan
+        assert "Optimal airmass" not in plan
+
+
+class TestBatchPlans:
+    """Test batch plan rendering from catalogs."""
+
+    @pytest.fixture
+    def catalog(self) -> pd.DataFrame:
+        """Catalog rows as produced by the scrapers."""
+        return pd.DataFrame(
+            [
+                {
+                    "id": "AT2025abao",
+                    "mag": 15.1,
+                    "type": "LRN",
+                    "date": "2025/11/06",
+                    "ra": "03h12m44.50s",
+                    "dec": "+41 12 11",
+                },
+                {
+                    "id": "AT2025abne",
+                    "mag": None,
+                    "type": "unknown",
+                    "date": None,
+                    "ra": "10h11m12.11s",
+                    "dec": "-12 44 55",
+                },
+                {"id": "SN2025abc", "mag": 17.5, "type": "Ia", "ra": None, "dec": None},
+            ]
+        )
+
+    def test_load_plan_targets(self, catalog: pd.DataFrame) -> None:
+        """Rows without coordinates are skipped and dates normalised."""
+        targets = load_plan_targets(catalog)
+
+        assert [t["id"] for t in targets] == ["AT2025abao", "AT2025abne"]
+        assert targets[0]["date"] == "2025-11-06"
+        assert targets[1]["mag"] is None
+
+    def test_load_plan_targets_from_csv(self, catalog: pd.DataFrame, tmp_path: Path) -> None:
+        """Catalog files are read from disk."""
+        path = tmp_path / "catalog.csv"
+        catalog.to_csv(path, index=False)
+
+        assert len(load_plan_targets(path)) == 2
+
+    def test_generate_plans_in_pool(
+        self, planner: ObservationPlanner, catalog: pd.DataFrame, tmp_path: Path
+    ) -> None:
+        """Plans are rendered for every target into the chosen directory."""
+        paths = planner.generate_plans(load_plan_targets(catalog), tmp_path, workers=2)
+
+        assert set(paths) == {"AT2025abao", "AT2025abne"}
+        text = paths["AT2025abne"].read_text(encoding="utf-8")
+        assert "Current Magnitude: unknown" in text
+        assert "Day 0 (Discovery): unknown" in text
+
+    def test_unchanged_targets_are_skipped(
+        self, planner: ObservationPlanner, catalog: pd.DataFrame, tmp_path: Path, capsys
+    ) -> None:
+        """A second render only touches targets whose inputs changed."""
+        targets = load_plan_targets(catalog)
+        planner.generate_plans(targets, tmp_path, workers=1)
+        capsys.readouterr()
+
+        targets[0]["mag"] = 14.0
+        planner.generate_plans(targets, tmp_path, workers=1)
+
+        assert "Rendering 1 observation plans (1 unchanged)" in capsys.readouterr().out
+        assert "Current Magnitude: 14.0" in (tmp_path / "plan_AT2025abao.txt").read_text()
+
+    def test_force_rerenders(
+        self, planner: ObservationPlanner, catalog: pd.DataFrame, tmp_path: Path, capsys
+    ) -> None:
+        """``force`` ignores the manifest."""
+        targets = load_plan_targets(catalog)
+        planner.generate_plans(targets, tmp_path, workers=1)
+        capsys.readouterr()
+
+        planner.generate_plans(targets, tmp_path, workers=1, force=True)
+
+        assert "Rendering 2 observation plans (0 unchanged)" in capsys.readouterr().out
@@ -0,0 +1,69 @@
+"""Tests for the batch discovery packager script."""
+
+from __future__ import annotations
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+from src.results_io import RESULTS_FILENAME, write_results
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "package_discovery.py"
+
+spec = importlib.util.spec_from_file_location("package_discovery", SCRIPT)
+package_discovery = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(package_discovery)
+
+RECORDS = [
+    {"id": f"AT2026a{i:02d}", "score": 5.0 + i % 5, "mag": 15.0 + i / 10, "type": "LRN"}
+    for i in range(20)
+]
+
+
+class TestPackageAnomalies:
+    """Test suite for incremental batch packaging."""
+
+    def test_skips_unchanged_packages(self, tmp_path: Path) -> None:
+        """Only objects whose inputs changed are re-rendered."""
+        directories = package_discovery.package_anomalies(RECORDS[:3], tmp_path, workers=1)
+        index = directories["AT2026a00"] / "index.md"
+        assert index.exists()
+        assert set(p.name for p in directories["AT2026a00"].iterdir()) == {
+            "index.md",
+            "data.csv",
+            "observation_plan.md",
+            "discovery.log",
+            "README.md",
+        }
+
+        index.write_text("edited")
+        changed = [dict(RECORDS[0]), dict(RECORDS[1], mag=14.0), RECORDS[2]]
+        package_discovery.package_anomalies(changed, tmp_path, workers=1)
+        assert index.read_text() == "edited"
+        assert "14.0" in (directories["AT2026a01"] / "data.csv").read_text()
+
+        package_discovery.package_anomalies(changed, tmp_path, workers=1, force=True)
+        assert index.read_text() != "edited"
+
+    def test_cli_batch_in_process_pool(self, tmp_path: Path) -> None:
+        """--results packages every anomaly, and a re-run renders nothing."""
+        write_results(RECORDS, tmp_path / "run" / RESULTS_FILENAME)
+        command = [
+            sys.executable,
+            str(SCRIPT),
+            "--results",
+            str(tmp_path / "run"),
+            "--output",
+            str(tmp_path / "packages"),
+            "--workers",
+            "2",
+        ]
+
+        first = subprocess.run(command, check=True, capture_output=True, text=True)
+        assert "Packaging 20 discoveries (0 unchanged)" in first.stdout
+        assert len(list((tmp_path / "packages").glob("AT2026a*/index.md"))) == 20
+
+        second = subprocess.run(command, check=True, capture_output=True, text=True)
+        assert "Packaging 0 discoveries (20 unchanged)" in second.stdout
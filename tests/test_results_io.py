@@ -0,0 +1,94 @@
+"""Tests for results_io module."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from astra_discoveries import main
+from src.results_io import RESULTS_FILENAME, main as results_main, read_results, write_results
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ANOMALIES = [
+    {
+        "id": "AT2026aaa",
+        "mag": np.float64(14.2),
+        "type": "LRN",
+        "score": 9.0,
+        "reasons": ["Rare type: LRN"],
+        "source": "Rochester_Entries",
+        "ra": "12:00:00.0",
+        "dec": "+10:00:00",
+    },
+    {"id": "SN2019xyz", "mag": np.nan, "type": "unknown", "score": 5.0, "reasons": []},
+]
+
+
+class TestResultsIO:
+    """Test suite for the anomalies.jsonl sidecar."""
+
+    def test_round_trip_with_enrichment(self, tmp_path: Path) -> None:
+        """Records are ranked, JSON-clean and joined with catalog enrichment."""
+        transients = pd.DataFrame(
+            {"id": ["AT2026aaa", "SN2019xyz"], "distance_mpc": [12.5, np.nan], "mag": [14.2, None]}
+        )
+        path = write_results(ANOMALIES, tmp_path / RESULTS_FILENAME, transients=transients)
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        first, second = (json.loads(line) for line in lines)
+        assert first["rank"] == 1 and first["priority"] == "high"
+        assert first["distance_mpc"] == 12.5
+        assert second["mag"] is None and second["distance_mpc"] is None
+
+        assert [r["id"] for r in read_results(tmp_path)] == ["AT2026aaa", "SN2019xyz"]
+        assert len(read_results(tmp_path / "astra_advanced_report.txt", limit=1)) == 1
+
+    def test_shell_helper(self, tmp_path: Path, capsys) -> None:
+        """The module CLI counts and lists anomalies for shell scripts."""
+        write_results(ANOMALIES, tmp_path / RESULTS_FILENAME)
+
+        assert results_main([str(tmp_path), "--count"]) == 0
+        assert capsys.readouterr().out.strip() == "2"
+        results_main([str(tmp_path), "--top", "1"])
+        assert capsys.readouterr().out.strip() == "1. AT2026aaa (Score: 9.0/10.0) LRN m=14.2"
+        (tmp_path / "empty_run").mkdir()
+        assert results_main([str(tmp_path / "empty_run")]) == 1
+
+    def test_package_top_discoveries_reads_results(self, tmp_path: Path) -> None:
+        """The packaging script works from the sidecar for any object ID."""
+        write_results(ANOMALIES, tmp_path / "run" / RESULTS_FILENAME)
+
+        subprocess.run(
+            [
+                sys.executable,
+                str(ROOT / "scripts" / "package_top_discoveries.py"),
+                str(tmp_path / "run"),
+                "--output",
+                str(tmp_path / "packages"),
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+        summary = json.loads((tmp_path / "packages" / "packaging_summary.json").read_text())
+        assert summary["packages"] == ["AT2026aaa", "SN2019xyz"]
+        atel = (tmp_path / "packages" / "AT2026aaa" / "AT2026aaa_ATel_report.txt").read_text()
+        assert "Coordinates: 12:00:00.0 +10:00:00" in atel
+
+    def test_cli_writes_results(self, tmp_path: Path) -> None:
+        """Every run writes the sidecar next to the report."""
+        results = {"transients": None, "anomalies": ANOMALIES, "report": "report"}
+        with patch("astra_discoveries.run_advanced_discovery", return_value=results), patch(
+            "astra_discoveries.Path.cwd", return_value=tmp_path
+        ):
+            assert main(["--no-plans", "--output", str(tmp_path / "run")]) == 0
+
+        assert [r["id"] for r in read_results(tmp_path / "run")] == ["AT2026aaa", "SN2019xyz"]
@@ -0,0 +1,80 @@
+"""Tests for rochester_stream module."""
+
+from __future__ import annotations
+
+from src.astra_discovery_engine import AstraDiscoveryEngine
+from src.rochester_stream import RochesterStreamParser, iter_rochester_records, text_chunks
+
+PAGE = """<html><head><title>Latest Supernovae</title></head><body>
+<p><b>AT2025abc</b> = ZTF25aaabcde discovered 2025/10/17 in NGC 1 Mag 13.9 Type LRN R.A. = 12h00m00.00s Decl. = +10 00 00</p>
+<p><b>AT2025abd</b> discovered 2025/10/18 in NGC 2 Type Ia</p>
+<table><tr><td>Archive</td></tr><tr><td>AT2024zz</td><td>12.0</td><td>Ia</td></tr></table>
+<table>
+<tr><th>Name</th><th>Mag</th><th>Type</th></tr>
+<tr><td> AT2025abc&nbsp;</td><td>13.9</td><td>LRN?</td></tr>
+<tr><td>SN2025abe</td><td>-</td><td>IIn</td><td>NGC 3</td></tr>
+<tr><td>AT2025abf</td><td>17.1</td></tr>
+<tr><td>Gaia25xyz</td><td>15.0</td><td>CV</td></tr>
+</table>
+</body></html>
+"""
+
+
+def _key(record):
+    return record["source"], record["id"], record.get("date") or ""
+
+
+class TestRochesterStreamParser:
+    """Test suite for the streaming Rochester parser."""
+
+    def test_tables_and_entries(self) -> None:
+        parser = RochesterStreamParser()
+        records = list(iter_rochester_records([PAGE], parser))
+
+        table = [r for r in records if r["source"] == "Rochester_Table_1"]
+        assert table == [
+            {"id": "AT2025abc", "mag": 13.9, "type": "LRN?", "source": "Rochester_Table_1"},
+            {"id": "SN2025abe", "mag": None, "type": "IIn", "source": "Rochester_Table_1"},
+        ]
+        assert parser.tables == 2
+        assert parser.transient_tables == {1: 4}
+        assert parser.entries == 2
+
+    def test_entries_read_their_own_fields(self) -> None:
+        """An entry without a magnitude does not borrow the previous entry's."""
+        records = list(iter_rochester_records([PAGE]))
+        entries = {r["id"]: r for r in records if r["source"] == "Rochester_Entries"}
+
+        assert entries["AT2025abc"]["mag"] == 13.9
+        assert entries["AT2025abc"]["ra"] == "12h00m00.00s"
+        assert entries["AT2025abc"]["dec"] == "+10 00 00"
+        assert entries["AT2025abd"]["mag"] is None
+        assert entries["AT2025abd"]["type"] == "Ia"
+        assert entries["AT2025abd"]["ra"] is None
+        assert entries["AT2025abc"]["aliases"] == "ZTF25aaabcde"
+        assert entries["AT2025abd"]["aliases"] is None
+
+    def test_chunking_does_not_change_records(self, monkeypatch) -> None:
+        """Records are the same for any chunk size, text or bytes."""
+        monkeypatch.setattr("src.rochester_stream.TEXT_WINDOW", 64)
+        monkeypatch.setattr("src.rochester_stream.TEXT_MARGIN", 500)
+        expected = sorted(iter_rochester_records([PAGE]), key=_key)
+
+        for size in (1, 7, 100):
+            chunks = list(text_chunks(PAGE, size))
+            assert sorted(iter_rochester_records(chunks), key=_key) == expected
+            as_bytes = (chunk.encode("utf-8") for chunk in chunks)
+            parser = RochesterStreamParser(encoding="utf-8")
+            assert sorted(iter_rochester_records(as_bytes, parser), key=_key) == expected
+
+    def test_entry_limit(self) -> None:
+        records = list(iter_rochester_records([PAGE], RochesterStreamParser(max_entries=1)))
+        assert [r["id"] for r in records if r["source"] == "Rochester_Entries"] == ["AT2025abc"]
+
+    def test_empty_input(self) -> None:
+        assert list(iter_rochester_records([])) == []
+
+    def test_basic_engine_patterns(self) -> None:
+        """The basic pipeline only takes entries written as "NAME = ... discovered"."""
+        records = AstraDiscoveryEngine()._parse_rochester_html(PAGE)
+        assert [r["id"] for r in records if r["source"] == "Rochester_Entries"] == ["AT2025abc"]
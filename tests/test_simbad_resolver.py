@@ -0,0 +1,38 @@
+"""Tests for simbad_resolver module."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from astropy.table import Table
+
+from src.simbad_resolver import SimbadResolver
+
+
+class TestResolveName:
+    """Test suite for SimbadResolver.resolve_name."""
+
+    def test_tap_columns(self) -> None:
+        """Lower-case TAP columns in degrees come back as sexagesimal strings."""
+        table = Table(
+            {"main_id": ["SN 2025abc"], "ra": [176.428542], "dec": [8.576667], "otype": ["SN"]}
+        )
+        resolver = SimbadResolver.__new__(SimbadResolver)
+        with patch.object(resolver, "simbad", create=True) as simbad:
+            simbad.query_object.return_value = table
+            result = resolver.resolve_name("AT2025abc")
+
+        assert result["ra"] == "11h45m42.85s"
+        assert result["dec"] == "+08 34 36.0"
+        assert result["simbad_type"] == "SN"
+
+    def test_legacy_columns(self) -> None:
+        """Upper-case sexagesimal columns from older astroquery pass through."""
+        table = Table({"MAIN_ID": ["SN 2025abc"], "RA": ["11 45 42.85"], "DEC": ["+08 34 36.0"]})
+        resolver = SimbadResolver.__new__(SimbadResolver)
+        with patch.object(resolver, "simbad", create=True) as simbad:
+            simbad.query_object.return_value = table
+            result = resolver.resolve_name("AT2025abc")
+
+        assert (result["ra"], result["dec"]) == ("11 45 42.85", "+08 34 36.0")
+        assert result["simbad_type"] is None
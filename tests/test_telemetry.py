@@ -0,0 +1,124 @@
+"""Tests for telemetry module."""
+
+from __future__ import annotations
+
+import json
+import pstats
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from astra_discoveries import main
+from src.telemetry import StageProfiler, add_listener, remove_listener, stage
+
+SAMPLE_HTML = (Path(__file__).parent / "data" / "rochester_sample.html").read_text(encoding="utf-8")
+
+
+class _Recorder:
+    """Listener that records stage boundaries."""
+
+    def __init__(self) -> None:
+        self.events: list = []
+
+    def enter(self, name: str) -> str:
+        self.events.append(("enter", name))
+        return name
+
+    def exit(self, name: str, token: str, error) -> None:
+        self.events.append(("exit", token, type(error).__name__ if error else None))
+
+
+class TestStages:
+    """Test suite for stage notifications."""
+
+    def test_listeners_see_nested_stages(self) -> None:
+        """Listeners get matching enter/exit calls, including on errors."""
+        recorder = _Recorder()
+        add_listener(recorder)
+        try:
+            with stage("outer"):
+                with pytest.raises(KeyError):
+                    with stage("inner"):
+                        raise KeyError("boom")
+        finally:
+            remove_listener(recorder)
+
+        assert recorder.events == [
+            ("enter", "outer"),
+            ("enter", "inner"),
+            ("exit", "inner", "KeyError"),
+            ("exit", "outer", None),
+        ]
+
+    def test_stage_as_decorator(self) -> None:
+        """Stages can wrap functions and are re-entrant."""
+
+        @stage("work")
+        def work(x: int) -> int:
+            return x * 2
+
+        with StageProfiler() as profiler:
+            assert [work(1), work(2)] == [2, 4]
+
+        assert profiler.stats["work"].calls == 2
+
+
+class TestStageProfiler:
+    """Test suite for StageProfiler."""
+
+    def test_records_timings_and_errors(self) -> None:
+        """Wall/CPU time and error counts are accumulated per stage."""
+        with StageProfiler() as profiler:
+            with stage("score"):
+                sum(range(10_000))
+            with pytest.raises(ValueError):
+                with stage("score"):
+                    raise ValueError("bad row")
+
+        stats = profiler.stats["score"]
+        assert stats.calls == 2
+        assert stats.errors == 1
+        assert stats.wall_s > 0
+        assert "score" in profiler.summary_table()
+
+    def test_detached_after_exit(self) -> None:
+        """Stages outside the profiler's block are not recorded."""
+        with StageProfiler() as profiler:
+            pass
+        with stage("late"):
+            pass
+
+        assert profiler.stats == {}
+
+    def test_write_with_cprofile(self, tmp_path: Path) -> None:
+        """cProfile stats are dumped per outermost stage."""
+        with StageProfiler(cprofile=True) as profiler:
+            with stage("parse"):
+                with stage("inner"):
+                    sorted(range(1000), reverse=True)
+
+        profiler.write(tmp_path)
+
+        data = json.loads((tmp_path / "profile.json").read_text())
+        assert set(data) == {"parse", "inner"}
+        assert (tmp_path / "profile.txt").exists()
+        if profiler.profiles:
+            assert set(profiler.profiles) == {"parse"}
+            pstats.Stats(str(tmp_path / "profile_parse.prof"))
+
+    def test_cli_profile(self, tmp_path: Path) -> None:
+        """--profile writes stage timings for a full run into the run directory."""
+
+        class _Response:
+            text = SAMPLE_HTML
+
+        output_dir = tmp_path / "run"
+        with patch("src.enhanced_discovery_v2.requests.get", return_value=_Response()), patch(
+            "astra_discoveries.Path.cwd", return_value=tmp_path
+        ):
+            result = main(["--advanced", "--profile", "--no-plans", "--output", str(output_dir)])
+
+        assert result == 0
+        stages = json.loads((output_dir / "profile.json").read_text())
+        assert {"fetch+parse", "dedup", "enrich", "score", "report", "write"} <= set(stages)
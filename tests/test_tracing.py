@@ -0,0 +1,97 @@
+"""Tests for tracing module."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from astra_discoveries import main
+from src.telemetry import stage
+from src.tracing import current_recorder, span, start_tracing, stop_tracing
+
+
+class TestTracing:
+    """Test suite for Chrome trace recording."""
+
+    def test_disabled_spans_are_shared_noops(self) -> None:
+        """Without a recorder, span() allocates nothing and records nothing."""
+        stop_tracing()
+
+        assert span("a") is span("b", "remote", url="x")
+        start = time.perf_counter()
+        for _ in range(100_000):
+            with span("hot"):
+                pass
+        assert time.perf_counter() - start < 1.0
+        assert current_recorder() is None
+
+    def test_metadata_may_use_any_keyword(self) -> None:
+        """``name`` and ``category`` keywords are metadata, not the span's own."""
+        recorder = start_tracing()
+        try:
+            with span("simbad.query_object", "remote", name="AT2025abc", category="x"):
+                pass
+        finally:
+            stop_tracing()
+
+        (event,) = recorder.events
+        assert (event["name"], event["cat"]) == ("simbad.query_object", "remote")
+        assert event["args"] == {"name": "AT2025abc", "category": "x"}
+
+    def test_overlapping_spans_from_threads(self) -> None:
+        """Concurrent spans on different threads overlap in the trace."""
+        recorder = start_tracing()
+        try:
+
+            def query(name: str) -> None:
+                with span("gaia.cone_search", "remote", id=name):
+                    time.sleep(0.05)
+
+            threads = [threading.Thread(target=query, args=(f"AT{i}",)) for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            stop_tracing()
+
+        first, second = sorted(recorder.events, key=lambda e: e["ts"])
+        assert first["tid"] != second["tid"]
+        assert second["ts"] < first["ts"] + first["dur"]
+        assert {first["args"]["id"], second["args"]["id"]} == {"AT0", "AT1"}
+
+    def test_stages_and_errors_become_spans(self, tmp_path: Path) -> None:
+        """Pipeline stages are recorded and failures are annotated."""
+        recorder = start_tracing()
+        try:
+            with stage("parse"):
+                try:
+                    with span("ned.objsearch", "remote"):
+                        raise TimeoutError("slow")
+                except TimeoutError:
+                    pass
+        finally:
+            stop_tracing()
+
+        path = recorder.write(tmp_path / "trace.json")
+        trace = json.loads(path.read_text())
+        events = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+        assert events["parse"]["cat"] == "stage"
+        assert events["ned.objsearch"]["args"]["error"] == "TimeoutError"
+        assert any(e["ph"] == "M" for e in trace["traceEvents"])
+
+    def test_cli_trace(self, tmp_path: Path) -> None:
+        """--trace writes trace.json into the run directory."""
+        results = {"transients": None, "anomalies": [], "report": "report"}
+        with patch("astra_discoveries.run_advanced_discovery", return_value=results), patch(
+            "astra_discoveries.Path.cwd", return_value=tmp_path
+        ):
+            status = main(["--trace", "--output", str(tmp_path / "run")])
+
+        assert status == 0
+        trace = json.loads((tmp_path / "run" / "trace.json").read_text())
+        assert "write" in {e["name"] for e in trace["traceEvents"]}
+        assert current_recorder() is None
@@ -0,0 +1,91 @@
+"""Tests for transient_schema module."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.distances import absolute_magnitudes
+from src.enhanced_discovery_v2 import EnhancedDiscoveryEngineV2
+from src.magnitude_stats import MagnitudeStats
+from src.results_io import result_records
+from src.transient_schema import TRANSIENT_DTYPES, normalize_transients
+
+SCRAPED = [
+    {"id": "AT2025abc", "mag": 13.9, "type": "LRN", "source": "Rochester_Table_1"},
+    {
+        "id": "AT2025abc",
+        "date": "2025/10/17",
+        "mag": 14.0,
+        "type": "unknown",
+        "ra": "12h00m00.00s",
+        "dec": "-10 30 00",
+        "source": "Rochester_Entries",
+    },
+    {
+        "id": "AT2025abd",
+        "date": "2025/13/45",
+        "mag": None,
+        "type": "CV?",
+        "source": "Rochester_Entries",
+    },
+]
+
+
+class TestNormalizeTransients:
+    """Test suite for normalize_transients."""
+
+    def test_dtypes(self) -> None:
+        df = normalize_transients(pd.DataFrame(SCRAPED))
+
+        assert {column: str(df[column].dtype) for column in TRANSIENT_DTYPES} == TRANSIENT_DTYPES
+        assert df["ra_deg"].iloc[1] == pytest.approx(180.0)
+        assert df["dec_deg"].iloc[1] == pytest.approx(-10.5)
+        assert df["date"].iloc[1] == pd.Timestamp("2025-10-17")
+        assert df["date"].isna().tolist() == [True, False, True]
+        assert df["ra"].iloc[1] == "12h00m00.00s"
+
+    def test_idempotent(self) -> None:
+        once = normalize_transients(pd.DataFrame(SCRAPED))
+        pd.testing.assert_frame_equal(normalize_transients(once), once)
+
+    def test_categorical_consumers_match_strings(self) -> None:
+        """Distance and per-type statistics give the same answers on categoricals."""
+        raw = pd.DataFrame(SCRAPED)
+        df = normalize_transients(raw)
+
+        np.testing.assert_array_equal(
+            absolute_magnitudes(df["type"]), absolute_magnitudes(raw["type"])
+        )
+        by_code, by_label = MagnitudeStats(), MagnitudeStats()
+        by_code.update(df)
+        by_label.update(raw)
+        assert by_code.summary()["by_type"].keys() == by_label.summary()["by_type"].keys()
+
+    def test_sidecar_values(self) -> None:
+        """float32 magnitudes and dates serialize without float noise."""
+        df = normalize_transients(pd.DataFrame(SCRAPED)).iloc[[1]]
+        record = result_records([{"id": "AT2025abc", "mag": df["mag"].iloc[0], "score": 6.0}], df)[
+            0
+        ]
+
+        assert record["mag"] == 14.0
+        assert record["date"] == "2025-10-17"
+
+    def test_pipeline_keeps_dtypes(self) -> None:
+        """The advanced pipeline's enriched catalog keeps the compact dtypes."""
+        html = """
+        <html><body><table>
+            <tr><th>Name</th><th>Mag</th><th>Type</th></tr>
+            <tr><td>AT2025abc</td><td>13.9</td><td>LRN</td></tr>
+            <tr><td>AT2025abd</td><td>16.2</td><td>Ia</td></tr>
+        </table></body></html>
+        """
+        results = EnhancedDiscoveryEngineV2().run_advanced_pipeline(html)
+        transients = results["transients"]
+
+        assert transients["type"].dtype == "category"
+        assert transients["source"].dtype == "category"
+        assert transients["mag"].dtype == np.float32
+        assert results["anomalies"][0]["id"] == "AT2025abc"
@@ -93,6 +93,8 @@ class TestScrapeFunctions:
         assert not df.empty
         assert {"id", "mag", "type", "source"}.issubset(df.columns)
         assert len(df) >= 3
+        assert df["mag"].dtype == "float32"
+        assert df["type"].dtype == "category"
 
     @patch("src.transient_scraper.requests.get")
     def test_scrape_rochester_sn_page_empty(self, mock_get: Mock, empty_html: str) -> None:
@@ -151,8 +153,8 @@ class TestScrapeFunctions:
         mock_get.return_value = MockResponse(html_with_mags)
         df = scrape_rochester_sn_page()
 
-        assert df.loc[df["id"] == "AT2025test1", "mag"].values[0] == 15.1
-        assert df.loc[df["id"] == "AT2025test2", "mag"].values[0] == 16.5
+        assert df.loc[df["id"] == "AT2025test1", "mag"].values[0] == pytest.approx(15.1)
+        assert df.loc[df["id"] == "AT2025test2", "mag"].values[0] == pytest.approx(16.5)
         assert pd.isna(df.loc[df["id"] == "AT2025test3", "mag"].values[0])
 
     @patch("src.transient_scraper.requests.get")